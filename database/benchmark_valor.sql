@@ -0,0 +1,262 @@
+/*
+    Benchmark de la carga y el recorrido de la tabla de hechos dbo.Valor
+    con el diseo fsico de la base de datos (ver 'DisenoValor' en create_database.sql).
+
+    Carga datos sintticos en Staging.Datos y ejecuta los SPs de la carga, de modo que
+    se mide el camino de cada diseo en dbo.uspFill_FTValor (MERGE en ROWSTORE,
+    UPDATE + INSERT en COLUMNSTORE y partition switching en PARTICIONADO):
+     - Carga inicial: historia completa de los datos del benchmark.
+     - Carga incremental: lote que se superpone con los datos existentes (ltimos aos,
+       con una parte de los montos revisados) y agrega un ao nuevo.
+     - Recorrido: suma por indicador y periodo de los ltimos aos, filtrando por ao
+       en dbo.Periodo como las consultas, y por rango de IdPeriodo (yyyymm).
+
+    Para comparar los diseos se crea la base de datos con cada valor de 'DisenoValor'
+    y se ejecuta el script en cada una:
+        sqlcmd -S [servidor] -d IndicadoresDW -E -i ./database/benchmark_valor.sql
+
+    Ajustar las variables de volumen al inicio del script.
+    Los datos del benchmark usan orgenes, instituciones e indicadores propios (BENCH)
+    y se eliminan al finalizar. El script vaca Staging.Datos, por lo que no se debe
+    ejecutar durante una carga.
+*/
+
+USE IndicadoresDW
+GO
+
+SET NOCOUNT ON
+GO
+
+/*
+ * Limpieza de los datos del benchmark
+ */
+DROP PROCEDURE IF EXISTS #uspLimpiar_Benchmark
+GO
+
+CREATE PROCEDURE #uspLimpiar_Benchmark
+AS
+    DELETE V
+    FROM dbo.Valor AS V
+    INNER JOIN dbo.Origen AS O
+        ON V.IdOrigen = O.IdOrigen
+    WHERE O.Nombre LIKE 'BENCH%'
+
+    DELETE FROM dbo.Origen WHERE Nombre LIKE 'BENCH%'
+    DELETE FROM dbo.Institucion WHERE Nombre LIKE 'BENCH Institucion %'
+    DELETE FROM dbo.Indicador WHERE Nombre LIKE 'BENCH Indicador %'
+
+    -- Periodos creados por el benchmark (sin valores de otros orgenes)
+    DELETE P
+    FROM dbo.Periodo AS P
+    WHERE NOT EXISTS(SELECT 1 FROM dbo.Valor AS V WHERE V.IdPeriodo = P.IdPeriodo)
+        AND NOT EXISTS(SELECT 1 FROM #PeriodosExistentes AS E WHERE E.IdPeriodo = P.IdPeriodo)
+
+    TRUNCATE TABLE Staging.Datos
+GO
+
+/*
+ * Carga de Staging.Datos en el DW, en el mismo orden que el proceso
+ */
+DROP PROCEDURE IF EXISTS #uspCargar_Benchmark
+GO
+
+CREATE PROCEDURE #uspCargar_Benchmark
+AS
+    EXEC dbo.uspFill_DimOrigen
+    EXEC dbo.uspFill_DimInstitucion
+    EXEC dbo.uspFill_DimIndicador
+    EXEC dbo.uspFill_DimPeriodo
+    EXEC dbo.uspFill_FTValor
+GO
+
+/*
+ * Volumen de datos sintticos
+ */
+DECLARE @Origenes int = 2
+DECLARE @Instituciones int = 50
+DECLARE @Indicadores int = 100
+DECLARE @AnioInicial int = 2001
+DECLARE @Anios int = 20 -- aos de la carga inicial
+
+-- Aos de la carga inicial que se vuelven a cargar y porcentaje de montos revisados
+DECLARE @AniosRevision int = 2
+DECLARE @PorcentajeRevisado int = 10
+
+-- Aos a recorrer (terminando en el ao nuevo de la carga incremental)
+DECLARE @AniosRecorrido int = 5
+
+DECLARE @AnioNuevo int = @AnioInicial + @Anios
+DECLARE @AnioDesde int = @AnioNuevo - @AniosRecorrido + 1
+
+DECLARE @Inicio datetime2
+DECLARE @Registros int
+
+-- Diseo detectado igual que en dbo.uspFill_FTValor
+DECLARE @Diseno varchar(20) = CASE
+    WHEN OBJECT_ID('dbo.ValorCarga') IS NOT NULL THEN 'PARTICIONADO'
+    WHEN EXISTS(
+        SELECT 1
+        FROM sys.indexes
+        WHERE object_id = OBJECT_ID('dbo.Valor')
+            AND type_desc = 'CLUSTERED COLUMNSTORE'
+    ) THEN 'COLUMNSTORE'
+    ELSE 'ROWSTORE'
+END
+
+PRINT CONCAT('Diseo: ', @Diseno)
+
+CREATE TABLE #Resultados(
+    Diseno     varchar(20)    NOT NULL,
+    Prueba     varchar(30)    NOT NULL,
+    Registros  int            NOT NULL,
+    Ms         int            NOT NULL
+)
+
+-- Periodos que existan antes del benchmark (no se eliminan en la limpieza)
+SELECT IdPeriodo
+INTO #PeriodosExistentes
+FROM dbo.Periodo
+
+-- Datos de una ejecucin anterior interrumpida
+EXEC #uspLimpiar_Benchmark
+
+/*
+ * Datos sintticos (producto cartesiano de las dimensiones), incluyendo el ao nuevo
+ */
+PRINT 'Generando datos sintticos'
+
+;WITH Numeros AS (
+    SELECT TOP (SELECT MAX(N) FROM (VALUES (@Origenes), (@Instituciones), (@Indicadores), ((@Anios + 1) * 12)) AS T(N))
+        ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS N
+    FROM sys.all_objects AS A
+    CROSS JOIN sys.all_objects AS B
+)
+SELECT
+    CONCAT('BENCH', O.N) AS Origen,
+    CONCAT('BENCH Institucion ', I.N) AS Institucion,
+    CONCAT('BENCH Indicador ', N.N) AS Indicador,
+    @AnioInicial + (P.N - 1) / 12 AS Anio,
+    (P.N - 1) % 12 + 1 AS Mes,
+    CAST(ABS(CHECKSUM(NEWID())) % 100000000 AS numeric(20, 2)) AS Valor
+INTO #Datos
+FROM Numeros AS O
+CROSS JOIN Numeros AS I
+CROSS JOIN Numeros AS N
+CROSS JOIN Numeros AS P
+WHERE O.N <= @Origenes
+    AND I.N <= @Instituciones
+    AND N.N <= @Indicadores
+    AND P.N <= (@Anios + 1) * 12
+
+PRINT CONCAT('Registros generados: ', @@ROWCOUNT)
+
+/*
+ * Carga inicial: todos los aos excepto el nuevo
+ */
+PRINT 'Carga inicial'
+
+INSERT INTO Staging.Datos(Origen, Institucion, Indicador, Anio, Mes, Valor)
+SELECT Origen, Institucion, Indicador, Anio, Mes, Valor
+FROM #Datos
+WHERE Anio < @AnioNuevo
+
+SET @Registros = @@ROWCOUNT
+SET @Inicio = SYSDATETIME()
+
+EXEC #uspCargar_Benchmark
+
+INSERT INTO #Resultados VALUES (@Diseno, 'Carga inicial', @Registros, DATEDIFF(ms, @Inicio, SYSDATETIME()))
+
+/*
+ * Carga incremental: ltimos aos con montos revisados (actualizaciones y registros sin cambios)
+ * ms el ao nuevo (inserciones)
+ */
+PRINT 'Carga incremental'
+
+TRUNCATE TABLE Staging.Datos
+
+INSERT INTO Staging.Datos(Origen, Institucion, Indicador, Anio, Mes, Valor)
+SELECT
+    Origen,
+    Institucion,
+    Indicador,
+    Anio,
+    Mes,
+    CASE
+        WHEN Anio < @AnioNuevo AND ABS(CHECKSUM(NEWID())) % 100 < @PorcentajeRevisado THEN Valor + 1
+        ELSE Valor
+    END
+FROM #Datos
+WHERE Anio >= @AnioNuevo - @AniosRevision
+
+SET @Registros = @@ROWCOUNT
+SET @Inicio = SYSDATETIME()
+
+EXEC #uspCargar_Benchmark
+
+INSERT INTO #Resultados VALUES (@Diseno, 'Carga incremental', @Registros, DATEDIFF(ms, @Inicio, SYSDATETIME()))
+
+/*
+ * Pruebas de recorrido de los ltimos aos para todos los indicadores del benchmark.
+ * Requiere permisos de sysadmin para limpiar el buffer pool entre pruebas,
+ * sin ellos se miden lecturas en caliente.
+ */
+DECLARE @Limpiar bit = IS_SRVROLEMEMBER('sysadmin')
+
+CREATE TABLE #Recorrido(IdIndicador int NOT NULL, IdPeriodo int NOT NULL, Total numeric(38, 2) NOT NULL)
+
+-- Filtro por ao en dbo.Periodo
+IF @Limpiar = 1 BEGIN CHECKPOINT; DBCC DROPCLEANBUFFERS WITH NO_INFOMSGS; END
+SET @Inicio = SYSDATETIME()
+
+INSERT INTO #Recorrido
+SELECT V.IdIndicador, V.IdPeriodo, SUM(V.Monto)
+FROM dbo.Valor AS V
+INNER JOIN dbo.Periodo AS P
+    ON V.IdPeriodo = P.IdPeriodo
+INNER JOIN dbo.Origen AS O
+    ON V.IdOrigen = O.IdOrigen
+WHERE P.Anio BETWEEN @AnioDesde AND @AnioNuevo
+    AND O.Nombre LIKE 'BENCH%'
+GROUP BY V.IdIndicador, V.IdPeriodo
+
+INSERT INTO #Resultados VALUES (@Diseno, 'Recorrido (Periodo)', @@ROWCOUNT, DATEDIFF(ms, @Inicio, SYSDATETIME()))
+TRUNCATE TABLE #Recorrido
+
+-- Filtro por rango de IdPeriodo (yyyymm), como el cliente de consultas
+IF @Limpiar = 1 BEGIN CHECKPOINT; DBCC DROPCLEANBUFFERS WITH NO_INFOMSGS; END
+SET @Inicio = SYSDATETIME()
+
+INSERT INTO #Recorrido
+SELECT V.IdIndicador, V.IdPeriodo, SUM(V.Monto)
+FROM dbo.Valor AS V
+INNER JOIN dbo.Origen AS O
+    ON V.IdOrigen = O.IdOrigen
+WHERE V.IdPeriodo BETWEEN @AnioDesde * 100 + 1 AND @AnioNuevo * 100 + 12
+    AND O.Nombre LIKE 'BENCH%'
+GROUP BY V.IdIndicador, V.IdPeriodo
+
+INSERT INTO #Resultados VALUES (@Diseno, 'Recorrido (IdPeriodo)', @@ROWCOUNT, DATEDIFF(ms, @Inicio, SYSDATETIME()))
+
+/*
+ * Resultados
+ */
+SELECT Diseno, Prueba, Registros, Ms
+FROM #Resultados
+
+/*
+ * Limpieza
+ */
+PRINT 'Eliminando datos del benchmark'
+
+EXEC #uspLimpiar_Benchmark
+
+DROP TABLE #Recorrido
+DROP TABLE #Datos
+DROP TABLE #PeriodosExistentes
+DROP TABLE #Resultados
+GO
+
+DROP PROCEDURE IF EXISTS #uspLimpiar_Benchmark
+DROP PROCEDURE IF EXISTS #uspCargar_Benchmark
+GO
@@ -39,6 +39,18 @@ USE IndicadoresDW
 GO
 
 
+/*
+ * Diseo fsico de la tabla de hechos dbo.Valor
+ *
+ * Cambiar el valor de 'DisenoValor' antes de ejecutar el script:
+ *  - ROWSTORE:     ndice clustered por (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo) (por defecto).
+ *  - COLUMNSTORE:  ndice clustered columnstore, para consultas que recorren rangos de periodos.
+ *  - PARTICIONADO: Tabla particionada por ao (IdPeriodo), la carga se hace con partition switching.
+ */
+EXEC sp_set_session_context @key = N'DisenoValor', @value = N'ROWSTORE';
+GO
+
+
 /* 
  * SCHEMA: Staging 
  */
@@ -110,10 +122,13 @@ GO
 
 /* 
  * TABLE: Periodo 
+ *
+ * IdPeriodo se calcula del ao y mes (yyyymm), de modo que sigue el orden cronolgico
+ * y no depende del orden de carga (rangos de periodos y particiones por ao).
  */
 
 CREATE TABLE dbo.Periodo(
-    IdPeriodo    int    IDENTITY(1,1),
+    IdPeriodo    AS (Anio * 100 + Mes) PERSISTED NOT NULL,
     Anio         int    NOT NULL,
     Mes          int    NOT NULL,
     CONSTRAINT PK_Periodo_IdPeriodo PRIMARY KEY CLUSTERED (IdPeriodo),
@@ -123,27 +138,156 @@ GO
 
 
 /* 
- * TABLE: Valor 
+ * TABLE: Carga 
+ *
+ * Un registro por cada actualizacin del DW (uspFill_Carga),
+ * usado por los clientes de consulta para invalidar su cach.
  */
- 
-CREATE TABLE dbo.Valor(
-    IdOrigen         int               NOT NULL,
-    IdInstitucion    int               NOT NULL,
-    IdIndicador      int               NOT NULL,
-    IdPeriodo        int               NOT NULL,
-    Monto            numeric(20, 2)    NOT NULL,
-    CONSTRAINT PK_Valor_IdOrigen_IdInstitucion_IdIndicador_IdPeriodo PRIMARY KEY CLUSTERED (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo),
-    CONSTRAINT FK_Valor_Origen_IdOrigen FOREIGN KEY (IdOrigen) REFERENCES Origen(IdOrigen),
-    CONSTRAINT FK_Valor_Institucion_IdInstitucion FOREIGN KEY (IdInstitucion) REFERENCES Institucion(IdInstitucion),
-    CONSTRAINT FK_Valor_Indicador_IdIndicador FOREIGN KEY (IdIndicador) REFERENCES Indicador(IdIndicador),
-    CONSTRAINT FK_Valor_Periodo_IdPeriodo FOREIGN KEY (IdPeriodo) REFERENCES Periodo(IdPeriodo)
+
+CREATE TABLE dbo.Carga(
+    IdCarga      int          IDENTITY(1,1),
+    Fecha        datetime2    NOT NULL    CONSTRAINT DF_Carga_Fecha DEFAULT SYSDATETIME(),
+    Registros    int          NOT NULL,
+    CONSTRAINT PK_Carga_IdCarga PRIMARY KEY CLUSTERED (IdCarga)
 )
 GO
 
-CREATE INDEX FK_Valor_Origen_IdOrigen ON Valor(IdOrigen)
-CREATE INDEX FK_Valor_Institucion_IdInstitucion ON Valor(IdInstitucion)
-CREATE INDEX FK_Valor_Indicador_IdIndicador ON Valor(IdIndicador)
-CREATE INDEX FK_Valor_Periodo_IdPeriodo ON Valor(IdPeriodo)
+
+/*
+ * PARTITION FUNCTION: pfValorPeriodo (solo diseo PARTICIONADO)
+ *
+ * Una particin por ao: los lmites son los periodos de enero (yyyy01) de cada ao.
+ * Las consultas por rango de IdPeriodo leen solo las particiones de esos aos,
+ * y la carga (uspFill_FTValor) intercambia solo las particiones de los aos cargados.
+ */
+
+IF CAST(SESSION_CONTEXT(N'DisenoValor') AS varchar(20)) = 'PARTICIONADO'
+BEGIN
+    PRINT 'Creating partition function'
+
+    DECLARE @Limites varchar(max) = ''
+    DECLARE @Anio int = 1961
+
+    -- Aos 1961 a 2100, la primera y la ltima particin quedan abiertas
+    WHILE @Anio <= 2100
+    BEGIN
+        SET @Limites = @Limites + CASE WHEN @Limites = '' THEN '' ELSE ', ' END + CAST(@Anio * 100 + 1 AS varchar(10))
+        SET @Anio = @Anio + 1
+    END
+
+    EXEC ('CREATE PARTITION FUNCTION pfValorPeriodo(int) AS RANGE RIGHT FOR VALUES (' + @Limites + ')')
+    EXEC ('CREATE PARTITION SCHEME psValorPeriodo AS PARTITION pfValorPeriodo ALL TO ([PRIMARY])')
+END
+GO
+
+
+/* 
+ * TABLE: Valor 
+ */
+ 
+IF CAST(SESSION_CONTEXT(N'DisenoValor') AS varchar(20)) = 'COLUMNSTORE'
+BEGIN
+    PRINT 'Creating dbo.Valor (COLUMNSTORE)'
+
+    CREATE TABLE dbo.Valor(
+        IdOrigen         int               NOT NULL,
+        IdInstitucion    int               NOT NULL,
+        IdIndicador      int               NOT NULL,
+        IdPeriodo        int               NOT NULL,
+        Monto            numeric(20, 2)    NOT NULL,
+        CONSTRAINT PK_Valor_IdOrigen_IdInstitucion_IdIndicador_IdPeriodo PRIMARY KEY NONCLUSTERED (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo),
+        CONSTRAINT FK_Valor_Origen_IdOrigen FOREIGN KEY (IdOrigen) REFERENCES Origen(IdOrigen),
+        CONSTRAINT FK_Valor_Institucion_IdInstitucion FOREIGN KEY (IdInstitucion) REFERENCES Institucion(IdInstitucion),
+        CONSTRAINT FK_Valor_Indicador_IdIndicador FOREIGN KEY (IdIndicador) REFERENCES Indicador(IdIndicador),
+        CONSTRAINT FK_Valor_Periodo_IdPeriodo FOREIGN KEY (IdPeriodo) REFERENCES Periodo(IdPeriodo)
+    )
+
+    -- Los segmentos del columnstore reemplazan los ndices por FK
+    CREATE CLUSTERED COLUMNSTORE INDEX CCI_Valor ON dbo.Valor
+END
+ELSE IF CAST(SESSION_CONTEXT(N'DisenoValor') AS varchar(20)) = 'PARTICIONADO'
+BEGIN
+    PRINT 'Creating dbo.Valor (PARTICIONADO)'
+
+    CREATE TABLE dbo.Valor(
+        IdOrigen         int               NOT NULL,
+        IdInstitucion    int               NOT NULL,
+        IdIndicador      int               NOT NULL,
+        IdPeriodo        int               NOT NULL,
+        Monto            numeric(20, 2)    NOT NULL,
+        CONSTRAINT PK_Valor_IdOrigen_IdInstitucion_IdIndicador_IdPeriodo PRIMARY KEY CLUSTERED (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo),
+        CONSTRAINT FK_Valor_Origen_IdOrigen FOREIGN KEY (IdOrigen) REFERENCES Origen(IdOrigen),
+        CONSTRAINT FK_Valor_Institucion_IdInstitucion FOREIGN KEY (IdInstitucion) REFERENCES Institucion(IdInstitucion),
+        CONSTRAINT FK_Valor_Indicador_IdIndicador FOREIGN KEY (IdIndicador) REFERENCES Indicador(IdIndicador),
+        CONSTRAINT FK_Valor_Periodo_IdPeriodo FOREIGN KEY (IdPeriodo) REFERENCES Periodo(IdPeriodo)
+    ) ON psValorPeriodo(IdPeriodo)
+
+    CREATE INDEX FK_Valor_Origen_IdOrigen ON dbo.Valor(IdOrigen)
+    CREATE INDEX FK_Valor_Institucion_IdInstitucion ON dbo.Valor(IdInstitucion)
+    CREATE INDEX FK_Valor_Indicador_IdIndicador ON dbo.Valor(IdIndicador)
+    CREATE INDEX FK_Valor_Periodo_IdPeriodo ON dbo.Valor(IdPeriodo)
+
+    /*
+     * Tablas auxiliares para partition switching.
+     * Deben tener la misma estructura, ndices y FKs que dbo.Valor.
+     */
+
+    -- Particin reconstruida que se intercambia hacia dbo.Valor
+    CREATE TABLE dbo.ValorCarga(
+        IdOrigen         int               NOT NULL,
+        IdInstitucion    int               NOT NULL,
+        IdIndicador      int               NOT NULL,
+        IdPeriodo        int               NOT NULL,
+        Monto            numeric(20, 2)    NOT NULL,
+        CONSTRAINT PK_ValorCarga_IdOrigen_IdInstitucion_IdIndicador_IdPeriodo PRIMARY KEY CLUSTERED (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo),
+        CONSTRAINT FK_ValorCarga_Origen_IdOrigen FOREIGN KEY (IdOrigen) REFERENCES Origen(IdOrigen),
+        CONSTRAINT FK_ValorCarga_Institucion_IdInstitucion FOREIGN KEY (IdInstitucion) REFERENCES Institucion(IdInstitucion),
+        CONSTRAINT FK_ValorCarga_Indicador_IdIndicador FOREIGN KEY (IdIndicador) REFERENCES Indicador(IdIndicador),
+        CONSTRAINT FK_ValorCarga_Periodo_IdPeriodo FOREIGN KEY (IdPeriodo) REFERENCES Periodo(IdPeriodo)
+    ) ON psValorPeriodo(IdPeriodo)
+
+    CREATE INDEX FK_ValorCarga_Origen_IdOrigen ON dbo.ValorCarga(IdOrigen)
+    CREATE INDEX FK_ValorCarga_Institucion_IdInstitucion ON dbo.ValorCarga(IdInstitucion)
+    CREATE INDEX FK_ValorCarga_Indicador_IdIndicador ON dbo.ValorCarga(IdIndicador)
+    CREATE INDEX FK_ValorCarga_Periodo_IdPeriodo ON dbo.ValorCarga(IdPeriodo)
+
+    -- Particin anterior que sale de dbo.Valor
+    CREATE TABLE dbo.ValorSalida(
+        IdOrigen         int               NOT NULL,
+        IdInstitucion    int               NOT NULL,
+        IdIndicador      int               NOT NULL,
+        IdPeriodo        int               NOT NULL,
+        Monto            numeric(20, 2)    NOT NULL,
+        CONSTRAINT PK_ValorSalida_IdOrigen_IdInstitucion_IdIndicador_IdPeriodo PRIMARY KEY CLUSTERED (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo)
+    ) ON psValorPeriodo(IdPeriodo)
+
+    CREATE INDEX FK_ValorSalida_Origen_IdOrigen ON dbo.ValorSalida(IdOrigen)
+    CREATE INDEX FK_ValorSalida_Institucion_IdInstitucion ON dbo.ValorSalida(IdInstitucion)
+    CREATE INDEX FK_ValorSalida_Indicador_IdIndicador ON dbo.ValorSalida(IdIndicador)
+    CREATE INDEX FK_ValorSalida_Periodo_IdPeriodo ON dbo.ValorSalida(IdPeriodo)
+END
+ELSE
+BEGIN
+    PRINT 'Creating dbo.Valor (ROWSTORE)'
+
+    CREATE TABLE dbo.Valor(
+        IdOrigen         int               NOT NULL,
+        IdInstitucion    int               NOT NULL,
+        IdIndicador      int               NOT NULL,
+        IdPeriodo        int               NOT NULL,
+        Monto            numeric(20, 2)    NOT NULL,
+        CONSTRAINT PK_Valor_IdOrigen_IdInstitucion_IdIndicador_IdPeriodo PRIMARY KEY CLUSTERED (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo),
+        CONSTRAINT FK_Valor_Origen_IdOrigen FOREIGN KEY (IdOrigen) REFERENCES Origen(IdOrigen),
+        CONSTRAINT FK_Valor_Institucion_IdInstitucion FOREIGN KEY (IdInstitucion) REFERENCES Institucion(IdInstitucion),
+        CONSTRAINT FK_Valor_Indicador_IdIndicador FOREIGN KEY (IdIndicador) REFERENCES Indicador(IdIndicador),
+        CONSTRAINT FK_Valor_Periodo_IdPeriodo FOREIGN KEY (IdPeriodo) REFERENCES Periodo(IdPeriodo)
+    )
+
+    CREATE INDEX FK_Valor_Origen_IdOrigen ON dbo.Valor(IdOrigen)
+    CREATE INDEX FK_Valor_Institucion_IdInstitucion ON dbo.Valor(IdInstitucion)
+    CREATE INDEX FK_Valor_Indicador_IdIndicador ON dbo.Valor(IdIndicador)
+    CREATE INDEX FK_Valor_Periodo_IdPeriodo ON dbo.Valor(IdPeriodo)
+END
 GO
 
 
@@ -243,7 +387,6 @@ AS
         WHERE Anio = O.Anio
             AND Mes = O.Mes
     )
-    ORDER BY Anio, Mes
 
     DROP TABLE #Periodos
 GO
@@ -252,6 +395,7 @@ GO
 EXEC dbo.uspFill_FTValor
 */
 CREATE OR ALTER PROCEDURE dbo.uspFill_FTValor
+WITH EXECUTE AS OWNER -- Requerido por TRUNCATE y SWITCH en el diseo PARTICIONADO
 AS
     PRINT 'Procesando FTValor ...'
 
@@ -272,7 +416,108 @@ AS
     INNER JOIN dbo.Periodo AS P
         ON S.Anio = P.Anio AND S.Mes = P.Mes
 
-
+    /*
+     * Diseo PARTICIONADO: se reconstruye la particin de cada ao cargado en dbo.ValorCarga
+     * y se intercambia con la particin de dbo.Valor (partition switching).
+     * Las particiones de los dems aos no se leen ni se modifican.
+     */
+    IF OBJECT_ID('dbo.ValorCarga') IS NOT NULL
+    BEGIN
+        CREATE TABLE #Particiones(Particion int NOT NULL PRIMARY KEY)
+
+        -- $PARTITION se usa con SQL dinmico para que el SP compile sin la partition function
+        EXEC ('
+            INSERT INTO #Particiones(Particion)
+            SELECT DISTINCT $PARTITION.pfValorPeriodo(IdPeriodo)
+            FROM #Valores')
+
+        DECLARE @Particion int = (SELECT MIN(Particion) FROM #Particiones)
+
+        WHILE @Particion IS NOT NULL
+        BEGIN
+            TRUNCATE TABLE dbo.ValorCarga
+
+            EXEC sp_executesql N'
+                INSERT INTO dbo.ValorCarga WITH (TABLOCK) (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo, Monto)
+                -- Registros existentes de la particin que no vienen en la carga
+                SELECT T.IdOrigen, T.IdInstitucion, T.IdIndicador, T.IdPeriodo, T.Monto
+                FROM dbo.Valor AS T
+                WHERE $PARTITION.pfValorPeriodo(T.IdPeriodo) = @Particion
+                    AND NOT EXISTS(
+                        SELECT 1
+                        FROM #Valores AS S
+                        WHERE T.IdOrigen = S.IdOrigen
+                            AND T.IdInstitucion = S.IdInstitucion
+                            AND T.IdIndicador = S.IdIndicador
+                            AND T.IdPeriodo = S.IdPeriodo
+                    )
+                UNION ALL
+                -- Registros nuevos o actualizados de la particin
+                SELECT S.IdOrigen, S.IdInstitucion, S.IdIndicador, S.IdPeriodo, S.Valor
+                FROM #Valores AS S
+                WHERE $PARTITION.pfValorPeriodo(S.IdPeriodo) = @Particion',
+                N'@Particion int',
+                @Particion = @Particion
+
+            BEGIN TRANSACTION
+
+            ALTER TABLE dbo.Valor SWITCH PARTITION @Particion TO dbo.ValorSalida PARTITION @Particion
+            ALTER TABLE dbo.ValorCarga SWITCH PARTITION @Particion TO dbo.Valor PARTITION @Particion
+
+            COMMIT TRANSACTION
+
+            TRUNCATE TABLE dbo.ValorSalida
+
+            SET @Particion = (SELECT MIN(Particion) FROM #Particiones WHERE Particion > @Particion)
+        END
+
+        DROP TABLE #Particiones
+        DROP TABLE #Valores
+
+        RETURN
+    END
+
+    /*
+     * Diseo COLUMNSTORE: UPDATE + INSERT masivo en lugar de MERGE,
+     * con TABLOCK para que las inserciones grandes se compriman directamente en rowgroups.
+     */
+    IF EXISTS(
+        SELECT 1
+        FROM sys.indexes
+        WHERE object_id = OBJECT_ID('dbo.Valor')
+            AND type_desc = 'CLUSTERED COLUMNSTORE'
+    )
+    BEGIN
+        UPDATE T
+        SET T.Monto = S.Valor
+        FROM dbo.Valor AS T
+        INNER JOIN #Valores AS S
+            ON T.IdOrigen = S.IdOrigen
+                AND T.IdInstitucion = S.IdInstitucion
+                AND T.IdIndicador = S.IdIndicador
+                AND T.IdPeriodo = S.IdPeriodo
+        WHERE T.Monto != S.Valor
+
+        INSERT INTO dbo.Valor WITH (TABLOCK) (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo, Monto)
+        SELECT S.IdOrigen, S.IdInstitucion, S.IdIndicador, S.IdPeriodo, S.Valor
+        FROM #Valores AS S
+        WHERE NOT EXISTS(
+            SELECT 1
+            FROM dbo.Valor AS T
+            WHERE T.IdOrigen = S.IdOrigen
+                AND T.IdInstitucion = S.IdInstitucion
+                AND T.IdIndicador = S.IdIndicador
+                AND T.IdPeriodo = S.IdPeriodo
+        )
+
+        DROP TABLE #Valores
+
+        RETURN
+    END
+
+    /*
+     * Diseo ROWSTORE
+     */
     MERGE dbo.Valor AS T
     USING #Valores AS S
         ON T.IdOrigen = S.IdOrigen
@@ -290,6 +535,18 @@ AS
         VALUES (S.IdOrigen, S.IdInstitucion, S.IdIndicador, S.IdPeriodo, S.Valor);
 GO
 
+/*
+EXEC dbo.uspFill_Carga
+*/
+CREATE OR ALTER PROCEDURE dbo.uspFill_Carga
+AS
+    PRINT 'Registrando carga ...'
+
+    INSERT INTO dbo.Carga(Registros)
+    SELECT COUNT(*)
+    FROM Staging.Datos
+GO
+
 /*
 Permisos
 */
@@ -317,6 +574,10 @@ GRANT EXEC ON dbo.uspFill_DimInstitucion TO LoadDataRole
 GRANT EXEC ON dbo.uspFill_DimIndicador TO LoadDataRole
 GRANT EXEC ON dbo.uspFill_DimPeriodo TO LoadDataRole
 GRANT EXEC ON dbo.uspFill_FTValor TO LoadDataRole;
+GRANT EXEC ON dbo.uspFill_Carga TO LoadDataRole;
+
+-- Consultas del DW (consultas.py)
+GRANT SELECT ON SCHEMA::dbo TO LoadDataRole;
 GO
 
 -- Add role to user
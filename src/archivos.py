@@ -0,0 +1,84 @@
+"""
+Modulo para guardar en disco los archivos descargados, en segundo plano.\n
+Los archivos descargados se procesan en memoria y por defecto no se guardan.
+Para conservarlos (e.g. para revisar un reporte) se usa la variable de entorno:\n
+    GUARDAR_ARCHIVOS=1
+
+o la opción `--guardar-archivos` de `procesar.py`.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Estado de la ejecución actual
+_activo = os.getenv("GUARDAR_ARCHIVOS", "").strip().lower() in ("1", "true", "si")
+_executor: ThreadPoolExecutor | None = None
+_pendientes: list[Future] = []
+_lock = threading.Lock()
+
+
+def activar():
+    """
+    Activa el guardado de los archivos descargados.
+    """
+
+    global _activo
+
+    _activo = True
+
+
+def _escribir(file_path: str, content: bytes):
+    """
+    Escribe el archivo de forma atómica.
+    """
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    # Escribir a un archivo temporal para no dejar archivos incompletos
+    with open(file_path + ".tmp", "wb") as file:
+        file.write(content)
+
+    os.replace(file_path + ".tmp", file_path)
+
+
+def guardar(files_dir: str, file_name: str, content: bytes):
+    """
+    Guarda el contenido en segundo plano si el guardado está activo.
+
+    :param files_dir: Directorio de los archivos del origen.
+    :param file_name: Nombre del archivo.
+    :param content: Contenido descargado.
+    """
+
+    global _executor
+
+    if not _activo:
+        return
+
+    file_path = os.path.join(files_dir, file_name)
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1)
+
+        _pendientes.append(_executor.submit(_escribir, file_path, content))
+
+
+def esperar():
+    """
+    Espera a que se terminen de escribir los archivos pendientes.
+    """
+
+    with _lock:
+        pendientes = list(_pendientes)
+        _pendientes.clear()
+
+    for pendiente in pendientes:
+        try:
+            pendiente.result()
+        except OSError as e:
+            print("No se pudo guardar el archivo descargado:", e)
@@ -4,4 +4,14 @@ Módulo para obtener datos de indicadores del **BCN**.\n
     pip install openpyxl
 """
 
-from bcn.main import get_all_periodos, get_last_periodo, get_periodo
+from bcn.main import (
+    get_all_periodos,
+    get_last_periodo,
+    get_periodo,
+    get_rango_periodos,
+    get_periodos,
+    get_tareas_all_periodos,
+    get_tareas_last_periodo,
+    get_tareas_rango_periodos,
+    get_tareas_periodos,
+)
@@ -0,0 +1,345 @@
+"""
+Modulo que extrae los indicadores de los reportes del BCN a partir de su especificación.\n
+Cada reporte de `bcn.reportes.reportes_list` se describe con datos (hoja, filas del
+encabezado, disposición de los periodos, conceptos, nombre del indicador y multiplicador)
+y `extraer` lo procesa con operaciones vectorizadas, sin recorrer las filas del archivo.\n
+Disposiciones de los periodos (`periodo`):\n
+- `trimestre_filas`: una fila por trimestre con las columnas del año y del trimestre ("I Trim"),
+  el año solo en el primer trimestre, y una columna por concepto.
+- `trimestre_columnas`: una fila por concepto y una columna por trimestre ("I Trim 24").
+- `trimestre_encabezado`: una fila por concepto y una columna por trimestre, con los años
+  y los trimestres ("I") en filas del encabezado.
+- `mes_columnas`: una fila por año y una columna por mes ("Ene").
+- `mes_filas`: una columna con el año seguido de los meses ("Enero") y una columna por concepto.
+- `hoja_anio`: una hoja por año con una fila por concepto y una columna por mes.
+"""
+
+import io
+import numpy as np
+import pandas as pd
+import excel
+from utils import parse_periodos
+
+# Columnas del DataFrame devuelto
+COLUMNAS = ["ORIGEN", "INSTITUCION", "INDICADOR", "ANIO", "MES", "VALOR"]
+
+
+def _numeros(df: pd.DataFrame) -> np.ndarray:
+    """
+    Devuelve los valores del DataFrame como números (NaN si no son números).
+    """
+
+    try:
+        return df.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        # Solo se convierte celda por celda si hay textos (e.g. notas o "n.d.")
+        return df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+def _apilar_columnas(
+    valores: pd.DataFrame, anios: np.ndarray, meses: np.ndarray
+) -> pd.DataFrame:
+    """
+    Apila los valores de un reporte con un periodo por fila y un concepto por columna.
+    """
+
+    filas, columnas = valores.shape
+
+    return pd.DataFrame(
+        {
+            "CONCEPTO": np.repeat(valores.columns.to_numpy(), filas),
+            "ANIO": np.tile(anios, columnas),
+            "MES": np.tile(meses, columnas),
+            "VALOR": _numeros(valores).ravel(order="F"),
+        }
+    )
+
+
+def _apilar_filas(
+    valores: pd.DataFrame, conceptos: np.ndarray, anios: np.ndarray, meses: np.ndarray
+) -> pd.DataFrame:
+    """
+    Apila los valores de un reporte con un concepto por fila y un periodo por columna.
+    """
+
+    filas, columnas = valores.shape
+
+    return pd.DataFrame(
+        {
+            "CONCEPTO": np.tile(conceptos, columnas),
+            "ANIO": np.repeat(anios, filas),
+            "MES": np.repeat(meses, filas),
+            "VALOR": _numeros(valores).ravel(order="F"),
+        }
+    )
+
+
+def _buscar_conceptos(df: pd.DataFrame, conceptos: list[str]) -> pd.Series:
+    """
+    Devuelve el concepto de cada fila que contiene alguno de los conceptos especificados
+    (sin distinguir mayúsculas), o NaN si no contiene ninguno.\n
+    Si una fila contiene varios conceptos se asigna el primero de la lista.
+    """
+
+    # Convertir la hoja a texto una sola vez para buscar todos los conceptos
+    texto = np.char.lower(df.to_numpy().astype(str))
+    encontrados = pd.Series(np.nan, index=df.index, dtype=object)
+
+    for concepto in conceptos:
+        contiene = (np.char.find(texto, concepto.lower()) >= 0).any(axis=1)
+
+        encontrados = encontrados.mask(contiene & encontrados.isna(), concepto)
+
+    return encontrados
+
+
+def _trimestre_filas(fuente, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae un reporte con una fila por trimestre y una columna por concepto.
+    """
+
+    columna_anio = reporte["columna_anio"]
+    columna_periodo = reporte["columna_periodo"]
+    conceptos = reporte.get("conceptos")
+
+    # Si se especifican conceptos, leer solo sus columnas
+    usecols = [columna_anio, columna_periodo, *conceptos] if conceptos else None
+
+    df = excel.leer(fuente, skiprows=reporte["encabezado"], usecols=usecols)
+
+    # Solo las filas con trimestre tienen datos
+    df = df[df[columna_periodo].notna()]
+
+    # El año solo se muestra en el primer trimestre
+    anios = pd.Series(parse_periodos(df[columna_anio])[0]).ffill().to_numpy()
+    _, meses = parse_periodos(df[columna_periodo], "trimestre")
+
+    valores = df.drop(columns=[columna_anio, columna_periodo]).dropna(axis=1, how="all")
+
+    return _apilar_columnas(valores, anios, meses)
+
+
+def _trimestre_columnas(fuente, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae un reporte con una fila por concepto y una columna por trimestre ("I Trim 24").
+    """
+
+    df = excel.leer(fuente, skiprows=reporte["encabezado"])
+
+    columna_concepto = reporte["columna_concepto"]
+    conceptos = reporte.get("conceptos")
+
+    # Filas de los conceptos especificados
+    if conceptos:
+        df = df[df[columna_concepto].isin(conceptos)]
+    else:
+        df = df[df[columna_concepto].notna()]
+
+    # Columnas por trimestre ("I Trim 24"); las columnas de total por año no tienen trimestre
+    anios, meses = parse_periodos(df.columns, "trimestre")
+    columnas = ~np.isnan(anios) & ~np.isnan(meses)
+
+    return _apilar_filas(
+        df.loc[:, columnas],
+        df[columna_concepto].to_numpy(),
+        anios[columnas],
+        meses[columnas],
+    )
+
+
+def _trimestre_encabezado(fuente, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae un reporte con una fila por concepto y una columna por trimestre,
+    con los años y los trimestres en filas del encabezado.
+    """
+
+    df = excel.leer(fuente, sheet_name=reporte.get("hoja", 0), header=None)
+
+    # La primera columna contiene los nombres de los conceptos
+    anios, _ = parse_periodos(df.iloc[reporte["fila_anios"], 1:])
+    _, meses = parse_periodos(df.iloc[reporte["fila_periodos"], 1:], "trimestre")
+
+    # El año solo se muestra en el primer trimestre
+    anios = pd.Series(anios).ffill().to_numpy()
+    columnas = ~np.isnan(anios) & ~np.isnan(meses)
+
+    conceptos = _buscar_conceptos(df, reporte["conceptos"])
+    filas = conceptos.notna()
+
+    return _apilar_filas(
+        df.iloc[:, 1:].loc[filas, columnas],
+        conceptos[filas].to_numpy(),
+        anios[columnas],
+        meses[columnas],
+    )
+
+
+def _mes_columnas(fuente, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae un reporte de un solo concepto con una fila por año y una columna por mes ("Ene").
+    """
+
+    df = excel.leer(fuente, skiprows=reporte["encabezado"])
+
+    # Limpiar los nombres de las columnas, eliminando espacios en blanco adicionales
+    df.columns = df.columns.astype(str).str.strip()
+
+    anios, _ = parse_periodos(df[reporte["columna_anio"]])
+
+    # Columnas por mes ("Ene"); la columna Total no es un mes
+    _, meses = parse_periodos(df.columns, "mes")
+    columnas = ~np.isnan(meses)
+
+    filas, cantidad = len(df), int(columnas.sum())
+
+    # Apilar por filas para conservar el orden por año y mes
+    return pd.DataFrame(
+        {
+            "CONCEPTO": "",
+            "ANIO": np.repeat(anios, cantidad),
+            "MES": np.tile(meses[columnas], filas),
+            "VALOR": _numeros(df.loc[:, columnas]).ravel(order="C"),
+        }
+    )
+
+
+def _mes_filas(fuente, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae un reporte con una columna con el año seguido de sus meses ("Enero")
+    y una columna por concepto.
+    """
+
+    columna_periodo = reporte["columna_periodo"]
+    conceptos = reporte["conceptos"]
+
+    # Leer solo las columnas que se van a trabajar
+    df = excel.leer(
+        fuente, skiprows=reporte["encabezado"], usecols=[columna_periodo, *conceptos]
+    )
+
+    df = df[df[columna_periodo].notna()]
+    etiquetas = df[columna_periodo]
+
+    anios, meses = parse_periodos(etiquetas, "mes")
+
+    # El año está en la fila anterior a sus meses
+    anios = pd.Series(anios, index=df.index).ffill()
+    meses = pd.Series(meses, index=df.index)
+
+    # Antes de este año el reporte solo tiene datos anuales, que se asignan a diciembre
+    anio_mensual = reporte.get("anio_mensual")
+
+    if anio_mensual:
+        meses = meses.mask((anios < anio_mensual) & meses.isna(), 12)
+
+    filas = meses.notna()
+
+    return _apilar_columnas(
+        df.loc[filas, conceptos], anios[filas].to_numpy(), meses[filas].to_numpy()
+    )
+
+
+def _hoja_anio(fuente, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae un reporte con una hoja por año, una fila por concepto y una columna por mes.
+    """
+
+    tablas = []
+
+    with excel.abrir(fuente) as xls:
+        # El nombre de la hoja es el año; las demás hojas no tienen datos
+        anios, _ = parse_periodos(xls.sheet_names)
+
+        for sheet_name, anio in zip(xls.sheet_names, anios):
+            if np.isnan(anio):
+                continue
+
+            df = xls.parse(sheet_name=sheet_name, header=None)
+
+            # Mes de cada celda, para encontrar las filas con los nombres de los meses
+            _, meses_hoja = parse_periodos(df.to_numpy().ravel(), "mes")
+            meses_hoja = meses_hoja.reshape(df.shape)
+            filas_meses = np.flatnonzero((~np.isnan(meses_hoja)).any(axis=1))
+
+            conceptos = _buscar_conceptos(df, reporte["conceptos"])
+
+            for fila in np.flatnonzero(conceptos.notna().to_numpy()):
+                # La fila con los nombres de los meses es la más cercana arriba del concepto
+                filas_arriba = filas_meses[filas_meses < fila]
+
+                if not filas_arriba.size:
+                    continue
+
+                meses = meses_hoja[filas_arriba[-1]]
+                columnas = ~np.isnan(meses)
+
+                tablas.append(
+                    pd.DataFrame(
+                        {
+                            "CONCEPTO": conceptos.iloc[fila],
+                            "ANIO": anio,
+                            "MES": meses[columnas],
+                            "VALOR": pd.to_numeric(
+                                df.iloc[fila, columnas], errors="coerce"
+                            ).to_numpy(dtype=float),
+                        }
+                    )
+                )
+
+    if not tablas:
+        return pd.DataFrame(columns=["CONCEPTO", "ANIO", "MES", "VALOR"])
+
+    return pd.concat(tablas, ignore_index=True)
+
+
+# Función que extrae cada disposición de los periodos
+_EXTRACTORES = {
+    "trimestre_filas": _trimestre_filas,
+    "trimestre_columnas": _trimestre_columnas,
+    "trimestre_encabezado": _trimestre_encabezado,
+    "mes_columnas": _mes_columnas,
+    "mes_filas": _mes_filas,
+    "hoja_anio": _hoja_anio,
+}
+
+
+def extraer(fuente: str | io.BytesIO, reporte: dict) -> pd.DataFrame:
+    """
+    Extrae los indicadores del archivo según la especificación del reporte.
+
+    :param fuente: Ruta o contenido en memoria (BytesIO) del archivo descargado.
+    :param reporte: Especificación del reporte (ver `bcn.reportes.reportes_list`).
+
+    :return: DataFrame con las columnas ORIGEN, INSTITUCION, INDICADOR, ANIO, MES y VALOR.
+    :rtype: pd.DataFrame
+    """
+
+    df = _EXTRACTORES[reporte["periodo"]](fuente, reporte)
+
+    # Eliminar los periodos y valores vacíos
+    filas = df["ANIO"].notna() & df["MES"].notna() & df["VALOR"].notna()
+
+    if reporte.get("omitir_ceros"):
+        filas &= df["VALOR"] != 0
+
+    df = df[filas]
+
+    # Nombre del indicador de cada concepto, calculado una sola vez por concepto
+    nombres = reporte.get("nombres", {})
+    indicadores = {
+        concepto: reporte["indicador"].format(concepto=nombres.get(concepto, concepto))
+        for concepto in df["CONCEPTO"].unique()
+    }
+
+    return pd.DataFrame(
+        {
+            "ORIGEN": "BCN",
+            "INSTITUCION": "NICARAGUA",
+            "INDICADOR": df["CONCEPTO"].map(indicadores).to_numpy(),
+            "ANIO": df["ANIO"].to_numpy(dtype=int),
+            "MES": df["MES"].to_numpy(dtype=int),
+            "VALOR": df["VALOR"].to_numpy(dtype=float)
+            * reporte.get("multiplicador", 1),
+        },
+        columns=COLUMNAS,
+    )
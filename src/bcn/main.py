@@ -4,23 +4,31 @@ Módulo para obtener datos del **BCN**.\n
     pip install openpyxl
 """
 
+import io
 import os
-import time
-import requests
+from functools import partial
+from typing import Optional
 import pandas as pd
-from bcn.reportes import reportes_list
+import archivos
+import derivados
+import descarga
+import pipeline
+from bcn.reportes import reportes_list, get_procesador
 
 
 def _download_file(url: str, file_name: str):
     """
     Descarga un archivo del BCN dada la url y el nombre que recibirá el archivo
-    y devuelve la ruta del archivo.
+    y devuelve su contenido en memoria.\n
+    El archivo se guarda en disco en segundo plano solo si está activo (ver `archivos`).
 
     :param url: Url del archivo a descargar.
-    :file_name: Nombre que recibirá el archivo al ser descargado.
+    :file_name: Nombre que recibirá el archivo al ser guardado.
 
-    :return: Ruta del archivo descargado o `None` si ocurre algún error.
-    :rtype: str | None
+    :return: Contenido del archivo descargado.
+    :rtype: io.BytesIO
+
+    :raises ErrorDescarga: Si la respuesta no es satisfactoria.
     """
 
     current_dir = os.path.dirname(__file__)
@@ -33,32 +41,21 @@ def _download_file(url: str, file_name: str):
         "Referer": "https://www.bcn.gob.ni/publicaciones/sector-externo",
     }
 
-    # Esperar 3 segundos antes de hacer el request
-    # para evitar que el sitio bloquee peticiones sospechosas por ser muy rápidas
-    time.sleep(3)
-
-    # Se define un timeout para evitar una request infinita
-    response = requests.get(url, headers=headers, timeout=60)
+    # Se define un timeout para evitar una request infinita.
+    # El ritmo de las peticiones lo controla `descarga` para que el sitio no las bloquee
+    response = descarga.get(url, "BCN", headers=headers, timeout=60)
 
-    # Si la respuesta no es satisfactoria imprimir error y devolver valor vacío
+    # Si la respuesta no es satisfactoria la tarea se registra con error para reintentarla
     if response.status_code != 200:
-        print("Error al descargar archivo del BCN", response.status_code)
-        return None
-
-    # Crear el directorio para guardar los archivos descargados
-    os.makedirs(files_dir, exist_ok=True)
-
-    # Definir el nombre del archivo
-    file_path = os.path.join(files_dir, file_name)
+        raise descarga.ErrorDescarga(
+            f"Error al descargar archivo del BCN: {response.status_code}"
+        )
 
-    # print(response.content)
+    # Guardar una copia del archivo sin esperar a que se escriba
+    archivos.guardar(files_dir, file_name, response.content)
 
-    # Abrir archivo en modo de escritura en binario
-    with open(file_path, "wb") as file:
-        # Escribir el contenido de la respuesta al archivo
-        file.write(response.content)
-
-    return file_path
+    # El contenido se procesa desde memoria, sin leerlo nuevamente del disco
+    return io.BytesIO(response.content)
 
 
 # def _filtrar_periodo(
@@ -81,100 +78,200 @@ def _download_file(url: str, file_name: str):
 #     return df
 
 
-def get_all_periodos():
+def _filtrar_ultimo_periodo(df: pd.DataFrame):
+    """
+    Devuelve solo las filas del último periodo disponible de cada indicador.
     """
-    Devuelve un DataFrame con los datos del BCN de todos los periodos disponibles.
 
-    :return: pandas DataFrame
+    if df.empty:
+        return df
+
+    # Obtener el máximo año para cada indicador
+    max_years = df.groupby("INDICADOR")["ANIO"].max().reset_index()
+
+    # Hacer merge con el DataFrame original para obtener solo las filas del año máximo
+    df_max_year = pd.merge(df, max_years, on=["INDICADOR", "ANIO"])
+
+    # Obtener la fila del máximo mes para cada indicador
+    df = df_max_year.loc[df_max_year.groupby("INDICADOR")["MES"].idxmax()]
+
+    # Resetear índices
+    df = df.reset_index(drop=True)
+
+    return df
+
+
+def _filtrar_periodos(
+    df: pd.DataFrame,
+    periodos: Optional[set[int]] = None,
+    desde: Optional[int] = None,
+    hasta: Optional[int] = None,
+):
+    """
+    Devuelve solo las filas de los periodos (yyyymm) especificados
+    o del rango de periodos especificado.
     """
 
-    df = pd.DataFrame()
+    if df.empty:
+        return df
 
-    # Descargar y procesar los archivos de cada reporte
-    for reporte in reportes_list:
-        name, url, file_name, function = reporte.values()
+    periodos_df = df["ANIO"].astype(int) * 100 + df["MES"].astype(int)
 
-        print("Procesando archivo:", name)
+    filtro = pd.Series(True, index=df.index)
 
-        file_path = _download_file(url, file_name)
+    if periodos is not None:
+        filtro = filtro & periodos_df.isin(periodos)
 
-        if file_path:
-            # df = _process_file_ied(file_path)
-            df_data = function(file_path)
+    if desde:
+        filtro = filtro & (periodos_df >= desde)
 
-            # Concatenar los DataFrames
-            df = pd.concat([df, df_data], ignore_index=True)
+    if hasta:
+        filtro = filtro & (periodos_df <= hasta)
+
+    df = df[filtro]
+
+    # Resetear índices
+    df = df.reset_index(drop=True)
 
     return df
 
 
-def get_last_periodo():
+def _agregar_derivados(df: pd.DataFrame, reporte: dict) -> pd.DataFrame:
+    """
+    Agrega los indicadores derivados del reporte, calculados con todos los periodos del archivo.
     """
-    Devuelve un DataFrame con los datos del BCN del último periodo disponible para cada indicador.
 
-    :return: pandas DataFrame
+    # Los datos anuales anteriores a los mensuales (asignados a diciembre) no se usan
+    df_mensual = df[df["ANIO"] >= reporte.get("anio_mensual", 0)]
+
+    df_derivados = derivados.calcular(df_mensual, reporte["derivados"])
+
+    return pd.concat([df, df_derivados], ignore_index=True)
+
+
+def _procesar_archivo(
+    contenido: io.BytesIO, function, filtro=None, reporte: Optional[dict] = None
+):
+    """
+    Procesa el archivo con la función del reporte, agrega sus indicadores derivados
+    y aplica el filtro especificado.\n
+    Los derivados se calculan antes del filtro para contar con los periodos anteriores
+    que necesitan (e.g. los 12 meses de la variación interanual).
     """
 
-    # Obtener DataFrame con los datos
-    df_data = get_all_periodos()
+    df = function(contenido)
 
-    # Obtener el máximo año para cada indicador
-    max_years = df_data.groupby("INDICADOR")["ANIO"].max().reset_index()
+    if reporte and reporte.get("derivados"):
+        df = _agregar_derivados(df, reporte)
 
-    # Hacer merge con el DataFrame original para obtener solo las filas del año máximo
-    df_max_year = pd.merge(df_data, max_years, on=["INDICADOR", "ANIO"])
+    if filtro:
+        df = filtro(df)
 
-    # Obtener la fila del máximo mes para cada indicador
-    df = df_max_year.loc[df_max_year.groupby("INDICADOR")["MES"].idxmax()]
+    return df
 
-    # Resetear índices
-    df = df.reset_index(drop=True)
 
-    # df = pd.DataFrame()
+def _get_tareas(filtro=None) -> list[dict]:
+    """
+    Devuelve una tarea por cada reporte del BCN.\n
+    Los archivos del BCN contienen todos los periodos,
+    por lo que el filtro especificado se aplica luego de procesar cada archivo.
+    """
 
-    # for _, row in max_years.iterrows():
-    #     indicador = row["INDICADOR"]
-    #     anio = row["ANIO"]
+    tareas = []
 
-    #     # Filtrar por el máximo año de cada indicador
-    #     df_filtrado = df_data[
-    #         (df_data["INDICADOR"] == indicador) & (df_data["ANIO"] == anio)
-    #     ]
+    for reporte in reportes_list:
+        tareas.append(
+            {
+                "origen": "BCN",
+                "nombre": reporte["name"],
+                "descargar": partial(
+                    _download_file, reporte["url"], reporte["file_name"]
+                ),
+                # Todos los conceptos del reporte se extraen con una sola lectura
+                "procesar": partial(
+                    _procesar_archivo,
+                    function=get_procesador(reporte),
+                    filtro=filtro,
+                    reporte=reporte,
+                ),
+            }
+        )
+
+    return tareas
+
+
+def get_tareas_all_periodos():
+    """
+    Devuelve las tareas para obtener los datos del BCN de todos los periodos disponibles.
+    """
+
+    return _get_tareas()
+
+
+def get_tareas_last_periodo():
+    """
+    Devuelve las tareas para obtener los datos del BCN del último periodo disponible
+    para cada indicador.
+    """
 
-    #     # Agrupar por indicador para obtener el máximo mes de cada uno
-    #     df_mes = df_filtrado.groupby("INDICADOR").agg({"MES": "max"}).reset_index()
+    return _get_tareas(_filtrar_ultimo_periodo)
 
-    #     mes = df_mes.loc[0, "MES"]
 
-    #     df_filtrado = df_filtrado[df_filtrado["MES"] == mes]
+def get_tareas_periodos(periodos: list[tuple[int, int]]):
+    """
+    Devuelve las tareas para obtener los datos del BCN de los periodos especificados.
 
-    #     df = pd.concat([df, df_filtrado], ignore_index=True)
+    :param periodos: Lista de periodos (año, mes).
+    """
 
-    # # Obtener el máximo año y mes por indicador
-    # df_filtros = (
-    #     df_data.groupby("INDICADOR").agg({"ANIO": "max", "MES": "max"}).reset_index()
-    # )
+    periodos_set = {year * 100 + month for year, month in periodos}
 
-    # df = pd.DataFrame()
+    return _get_tareas(partial(_filtrar_periodos, periodos=periodos_set))
 
-    # # Filtrar por indicador y obtener un solo DataFrame de resultado
-    # for _, row in df_filtros.iterrows():
-    #     indicador, year, month = row
 
-    #     print("Filtrando indicador:", indicador)
+def get_tareas_rango_periodos(
+    year_ini: int,
+    month_ini: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+):
+    """
+    Devuelve las tareas para obtener los datos del BCN del rango de periodos especificado.
 
-    #     df_filtrado = _filtrar_periodo(df_data, year, month, indicador)
+    :param year_ini: Año del periodo inicial.
+    :param month_ini: Mes del periodo inicial (1-12).
+    :param year_fin: Año del periodo final (opcional, por defecto el último disponible).
+    :param month_fin: Mes del periodo final (opcional).
+    """
 
-    #     # Concatenar los DataFrames
-    #     df = pd.concat([df, df_filtrado], ignore_index=True)
+    desde = year_ini * 100 + month_ini
+    hasta = year_fin * 100 + month_fin if year_fin and month_fin else None
 
-    # # # Obtener los máximos valores de las columnas 'Año' y 'Mes'
-    # # year, month = df[["ANIO", "MES"]].max()
+    return _get_tareas(partial(_filtrar_periodos, desde=desde, hasta=hasta))
 
-    # # # Filtrar los datos del año y mes del último periodo
-    # # df = _filtrar_periodo(df, year, month)
 
-    return df
+def get_all_periodos():
+    """
+    Devuelve un DataFrame con los datos del BCN de todos los periodos disponibles.
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("BCN", get_tareas_all_periodos)
+
+
+def get_last_periodo():
+    """
+    Devuelve un DataFrame con los datos del BCN del último periodo disponible para cada indicador.
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("BCN", get_tareas_last_periodo)
 
 
 def get_periodo(year: int, month: int):
@@ -187,13 +284,45 @@ def get_periodo(year: int, month: int):
     :return: pandas DataFrame
     """
 
-    # Obtener DataFrame con los datos
-    df = get_all_periodos()
+    return get_periodos([(year, month)])
 
-    # Filtrar los datos del año y mes especificado
-    df = df[(df["ANIO"] == year) & (df["MES"] == month)]
 
-    # Resetear índices
-    df = df.reset_index(drop=True)
+def get_rango_periodos(
+    year_ini: int,
+    month_ini: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+):
+    """
+    Devuelve un DataFrame con los datos del BCN para el rango de periodos especificado.\n
+    Los archivos del BCN contienen todos los periodos, por lo que se descargan completos
+    y luego se filtran.
 
-    return df
+    :param year_ini: Año del periodo inicial.
+    :param month_ini: Mes del periodo inicial (1-12).
+    :param year_fin: Año del periodo final (opcional, por defecto el último disponible).
+    :param month_fin: Mes del periodo final (opcional).
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    plan = partial(get_tareas_rango_periodos, year_ini, month_ini, year_fin, month_fin)
+
+    return pipeline.obtener("BCN", plan)
+
+
+def get_periodos(periodos: list[tuple[int, int]]):
+    """
+    Devuelve un DataFrame con los datos del BCN para los periodos especificados,
+    descargando y procesando cada archivo una sola vez.
+
+    :param periodos: Lista de periodos (año, mes).
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("BCN", partial(get_tareas_periodos, periodos))
@@ -1,19 +1,26 @@
 """
-Modulo con la lista de reportes del BCN a procesar.
+Modulo con la lista de reportes del BCN a procesar.\n
+Cada reporte se describe con su especificación y lo procesa `bcn.extraccion.extraer`:\n
+- `name`, `url` y `file_name`: nombre del reporte, URL de descarga y nombre del archivo guardado.
+- `periodo`: disposición de los periodos en el archivo (ver `bcn.extraccion`).
+- `hoja`: nombre o índice de la hoja (por defecto la primera).
+- `encabezado`: filas a omitir antes de los nombres de las columnas.
+- `fila_anios` y `fila_periodos`: filas con los años y los trimestres (sin nombres de columnas).
+- `columna_anio`, `columna_periodo` y `columna_concepto`: columnas del año, del periodo y del concepto.
+- `conceptos`: filas o columnas a extraer en una sola lectura del archivo
+  (`None` para todas las columnas del reporte).
+- `indicador`: nombre del indicador, donde `{concepto}` se reemplaza por cada concepto.
+- `nombres`: nombre a usar en el indicador para los conceptos que no se publican con el nombre del archivo.
+- `multiplicador`: factor para convertir los valores a unidades (e.g. millones de dólares).
+- `omitir_ceros`: no cargar los valores en cero.
+- `anio_mensual`: año desde el cual el reporte tiene datos mensuales;
+  antes solo tiene datos anuales, que se asignan a diciembre.
+- `derivados`: transformaciones que se cargan como indicadores propios
+  (ver `derivados.TRANSFORMACIONES`), calculadas con todos los periodos del archivo.
 """
 
-from bcn import (
-    ied,
-    balanza_pagos,
-    pii,
-    remesas,
-    deuda_externa,
-    indice_precios,
-    importaciones,
-    exportaciones,
-    balanza_comercial,
-)
-
+from functools import partial
+from bcn import extraccion
 
 # Lista de reportes a procesar
 reportes_list = [
@@ -21,78 +28,143 @@ reportes_list = [
         "name": "Ingresos brutos y flujos netos de IED",
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_real/IED/IBIED.xlsx",
         "file_name": "IED.xlsx",
-        "function": ied.procesar_datos,
+        "periodo": "trimestre_filas",
+        "encabezado": 4,
+        "columna_anio": "Año",
+        "columna_periodo": "Trimestre",
+        # Todas las columnas del reporte
+        "conceptos": None,
+        "indicador": "Inversión Extranjera Directa - {concepto}",
+        "multiplicador": 1_000_000,
+        "derivados": ["anual"],
     },
     {
-        # Nombre del reporte
         "name": "Balanza de pagos",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/balanza_pagos/MBP6_(2006).xls",
-        "file_name": "BPCC.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": balanza_pagos.procesar_datos,
+        "file_name": "BPCC.xls",
+        "periodo": "trimestre_columnas",
+        "encabezado": 5,
+        "columna_concepto": "Conceptos",
+        "conceptos": ["Cuenta corriente"],
+        "indicador": "Balanza de pagos - {concepto}",
+        "multiplicador": 1_000_000,
+        "omitir_ceros": True,
+        "derivados": ["anual"],
     },
     {
-        # Nombre del reporte
         "name": "Posición de Inversión Internacional",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/posicion_inversion/PII_(referencia_2006).xls",
-        "file_name": "PIIN.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": pii.procesar_datos,
+        "file_name": "PIIN.xls",
+        "periodo": "trimestre_columnas",
+        "encabezado": 5,
+        "columna_concepto": "Conceptos",
+        "conceptos": ["Posición de inversión internacional neta"],
+        "indicador": "Posición de inversión internacional - {concepto}",
+        "multiplicador": 1_000_000,
+        "omitir_ceros": True,
     },
     {
-        # Nombre del reporte
         "name": "Remesas Mensuales",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/siec/datos/remesas.xls",
-        "file_name": "REMESAS.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": remesas.procesar_datos,
+        "file_name": "REMESAS.xls",
+        "periodo": "mes_columnas",
+        "encabezado": 4,
+        "columna_anio": "Año",
+        "indicador": "Remesas mensuales",
+        "multiplicador": 1_000_000,
+        "derivados": [
+            "variacion_mensual",
+            "variacion_interanual",
+            "suma_12_meses",
+            "trimestral",
+        ],
     },
     {
-        # Nombre del reporte
         "name": "Deuda Externa Total",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/deuda_externa/cuadros_DET.xlsx",
-        "file_name": "DET.xlsx",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": deuda_externa.procesar_datos,  # type: ignore
+        "file_name": "DET.xlsx",
+        "periodo": "trimestre_encabezado",
+        "hoja": "C1",
+        "fila_anios": 4,
+        "fila_periodos": 5,
+        "conceptos": ["Gobierno General"],
+        "indicador": "Deuda Externa Total - {concepto}",
+        "multiplicador": 1_000_000,
     },
     {
-        # Nombre del reporte
         "name": "Índices de precios de exportación tipo Fisher",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/comercio_exterior/indices_comercio/6-25.xls",
-        "file_name": "IPE.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": indice_precios.procesar_excel,
+        "file_name": "IPE.xls",
+        "periodo": "hoja_anio",
+        "conceptos": ["Producción Agropecuaria"],
+        "indicador": "Índices de precios de exportación tipo Fisher - {concepto}",
+        "multiplicador": 1_000_000,
     },
     {
-        # Nombre del reporte
         "name": "Importaciones CIF: mercancías",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/comercio_exterior/importaciones/6-10.xls",
-        "file_name": "Importaciones.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": importaciones.procesar_datos,
+        "file_name": "Importaciones.xls",
+        "periodo": "mes_filas",
+        "encabezado": 3,
+        "columna_periodo": "Año y mes",
+        "conceptos": ["Bienes de consumo"],
+        "indicador": "Importaciones - {concepto}",
+        "nombres": {"Bienes de consumo": "Bienes de consumo - No Duraderos"},
+        "multiplicador": 1_000_000,
+        "anio_mensual": 2006,
+        "derivados": [
+            "variacion_mensual",
+            "variacion_interanual",
+            "suma_12_meses",
+            "trimestral",
+        ],
     },
     {
-        # Nombre del reporte
         "name": "Exportaciones FOB: mercancías por sector económico",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/comercio_exterior/exportaciones/6-3b.xls",
-        "file_name": "Exportaciones.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": exportaciones.procesar_datos,
+        "file_name": "Exportaciones.xls",
+        "periodo": "mes_filas",
+        "encabezado": 4,
+        # La columna del año y mes no tiene nombre
+        "columna_periodo": "Unnamed: 0",
+        "conceptos": ["Agropecuarios"],
+        "indicador": "Exportaciones - {concepto}",
+        "multiplicador": 1_000_000,
+        "anio_mensual": 2006,
+        "derivados": [
+            "variacion_mensual",
+            "variacion_interanual",
+            "suma_12_meses",
+            "trimestral",
+        ],
     },
     {
-        # Nombre del reporte
         "name": "Balanza comercial: mercancías generales",
-        # URL de descarga
         "url": "https://www.bcn.gob.ni/sites/default/files/estadisticas/sector_externo/comercio_exterior/balanza_comercial/6-3a.xls",
-        "file_name": "Balanza Comercial.xls",  # Nombre que recibirá el archivo descargado
-        # Nombre de la función que procesará el archivo y devuelve el DataFrame
-        "function": balanza_comercial.procesar_datos,
+        "file_name": "Balanza Comercial.xls",
+        "periodo": "mes_filas",
+        "encabezado": 4,
+        # La columna del año y mes no tiene nombre
+        "columna_periodo": "Unnamed: 0",
+        "conceptos": ["Agropecuarios"],
+        "indicador": "Balanza comercial - {concepto}",
+        "multiplicador": 1_000_000,
+        "anio_mensual": 2006,
+        "derivados": [
+            "variacion_mensual",
+            "variacion_interanual",
+            "suma_12_meses",
+            "trimestral",
+        ],
     },
 ]
+
+
+def get_procesador(reporte: dict):
+    """
+    Devuelve la función que procesa el archivo del reporte según su especificación.
+
+    :param reporte: Reporte de `reportes_list`.
+    """
+
+    return partial(extraccion.extraer, reporte=reporte)
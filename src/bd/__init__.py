@@ -0,0 +1,109 @@
+"""
+Paquete para guardar indicadores en la base de datos.\n
+El backend se elige con la variable de entorno `DB_BACKEND` (o la opción `--bd` de `procesar.py`):\n
+- `sqlserver` (por defecto): SQL Server (`bd.sqlserver`, depende del paquete `pyodbc`).
+- `sqlite`: base de datos embebida (`bd.sqlite`), sin servidor ni dependencias adicionales.
+
+Todos los backends implementan las mismas funciones de carga:
+`iniciar_carga`, `cargar`, `finalizar_carga` y `actualizar`,
+y `conectar` para las consultas (ver `consultas.py`).
+"""
+
+import os
+import importlib
+from types import ModuleType
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Módulo de cada backend (se importa solo el que se usa)
+BACKENDS = {
+    "sqlserver": "bd.sqlserver",
+    "sqlite": "bd.sqlite",
+}
+
+# Backend de la ejecución actual
+_backend: ModuleType | None = None
+
+
+def usar(nombre: str) -> ModuleType:
+    """
+    Selecciona el backend de la base de datos.
+
+    :param nombre: Nombre del backend (ver `BACKENDS`).
+
+    :raises ValueError: Si el backend no existe.
+    """
+
+    global _backend
+
+    nombre = nombre.strip().lower()
+
+    if nombre not in BACKENDS:
+        raise ValueError(
+            f"Backend de base de datos inválido: {nombre} ({', '.join(BACKENDS)})"
+        )
+
+    _backend = importlib.import_module(BACKENDS[nombre])
+
+    return _backend
+
+
+def get_backend() -> ModuleType:
+    """
+    Devuelve el backend seleccionado o el de la variable de entorno `DB_BACKEND`.
+    """
+
+    if _backend is None:
+        return usar(os.getenv("DB_BACKEND") or "sqlserver")
+
+    return _backend
+
+
+def conectar():
+    """
+    Devuelve una conexión DB-API a la base de datos del backend (parámetros `?`).
+    """
+
+    return get_backend().conectar()
+
+
+def actualizar(df: pd.DataFrame) -> bool:
+    """
+    Actualiza la BD con la información del DataFrame.
+
+    :return: `True` si la información se cargó y el DW se actualizó correctamente.
+    """
+
+    return get_backend().actualizar(df)
+
+
+def iniciar_carga() -> bool:
+    """
+    Inicia una carga por bloques limpiando la tabla de carga.
+
+    :return: `True` si la tabla de carga se limpió correctamente.
+    """
+
+    return get_backend().iniciar_carga()
+
+
+def cargar(df: pd.DataFrame) -> bool:
+    """
+    Agrega un bloque de datos a la tabla de carga.
+
+    :return: `True` si el bloque se cargó correctamente.
+    """
+
+    return get_backend().cargar(df)
+
+
+def finalizar_carga() -> bool:
+    """
+    Actualiza el DW con los bloques agregados a la tabla de carga.
+
+    :return: `True` si el DW se actualizó correctamente.
+    """
+
+    return get_backend().finalizar_carga()
@@ -0,0 +1,359 @@
+"""
+Modulo para guardar indicadores en una base de datos SQLite embebida.\n
+Reproduce el modelo de SQL Server (`database/create_database.sql`) sin servidor:
+la tabla de carga `Staging_Datos`, las dimensiones `Origen`, `Institucion`, `Indicador`
+y `Periodo`, la tabla de hechos `Valor` y el registro de cargas `Carga`.\n
+- El esquema se crea al iniciar la carga si no existe (`crear_esquema`).
+- La base de datos usa WAL, de modo que las consultas no bloquean la carga.
+- Cada bloque se inserta en una transacción y el DW se actualiza en otra,
+  con sentencias por conjunto (`INSERT ... SELECT` y upsert) como los SPs de SQL Server.
+
+La ruta de la base de datos se configura con la variable de entorno:\n
+    DB_SQLITE_PATH=/datos/IndicadoresDW.db
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+import pandas as pd
+from dotenv import load_dotenv
+import metricas
+import perfil
+
+load_dotenv()
+
+DB_PATH = os.getenv("DB_SQLITE_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "IndicadoresDW.db"
+)
+
+# Segundos de espera cuando otra conexión tiene bloqueada la base de datos
+_TIMEOUT = 30
+
+# Indica si el esquema ya se creó en este proceso (ver `crear_esquema`)
+_esquema_creado = False
+
+_STAGING_TABLE = "Staging_Datos"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS Staging_Datos(
+    Id             INTEGER    PRIMARY KEY,
+    Origen         TEXT       NOT NULL,
+    Institucion    TEXT       NOT NULL,
+    Indicador      TEXT       NOT NULL,
+    Anio           INTEGER    NOT NULL,
+    Mes            INTEGER    NOT NULL,
+    Valor          REAL       NOT NULL,
+    UNIQUE (Origen, Institucion, Indicador, Anio, Mes)
+);
+
+CREATE TABLE IF NOT EXISTS Origen(
+    IdOrigen    INTEGER    PRIMARY KEY,
+    Nombre      TEXT       NOT NULL    UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Institucion(
+    IdInstitucion    INTEGER    PRIMARY KEY,
+    Nombre           TEXT       NOT NULL    UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Indicador(
+    IdIndicador    INTEGER    PRIMARY KEY,
+    Nombre         TEXT       NOT NULL    UNIQUE
+);
+
+-- IdPeriodo es el año y mes (yyyymm), igual que en SQL Server
+CREATE TABLE IF NOT EXISTS Periodo(
+    IdPeriodo    INTEGER    PRIMARY KEY,
+    Anio         INTEGER    NOT NULL,
+    Mes          INTEGER    NOT NULL,
+    UNIQUE (Anio, Mes)
+);
+
+CREATE TABLE IF NOT EXISTS Carga(
+    IdCarga      INTEGER    PRIMARY KEY,
+    Fecha        TEXT       NOT NULL    DEFAULT CURRENT_TIMESTAMP,
+    Registros    INTEGER    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS Valor(
+    IdOrigen         INTEGER    NOT NULL    REFERENCES Origen(IdOrigen),
+    IdInstitucion    INTEGER    NOT NULL    REFERENCES Institucion(IdInstitucion),
+    IdIndicador      INTEGER    NOT NULL    REFERENCES Indicador(IdIndicador),
+    IdPeriodo        INTEGER    NOT NULL    REFERENCES Periodo(IdPeriodo),
+    Monto            REAL       NOT NULL,
+    PRIMARY KEY (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS FK_Valor_Institucion_IdInstitucion ON Valor(IdInstitucion);
+CREATE INDEX IF NOT EXISTS FK_Valor_Indicador_IdIndicador ON Valor(IdIndicador);
+CREATE INDEX IF NOT EXISTS FK_Valor_Periodo_IdPeriodo ON Valor(IdPeriodo);
+"""
+
+# Sentencias equivalentes a los SPs de SQL Server, en el orden en que se ejecutan
+_PASOS_DW = {
+    "uspFill_DimOrigen": """
+        INSERT OR IGNORE INTO Origen(Nombre)
+        SELECT DISTINCT TRIM(Origen) FROM Staging_Datos
+    """,
+    "uspFill_DimInstitucion": """
+        INSERT OR IGNORE INTO Institucion(Nombre)
+        SELECT DISTINCT TRIM(Institucion) FROM Staging_Datos
+    """,
+    "uspFill_DimIndicador": """
+        INSERT OR IGNORE INTO Indicador(Nombre)
+        SELECT DISTINCT TRIM(Indicador) FROM Staging_Datos
+    """,
+    "uspFill_DimPeriodo": """
+        INSERT OR IGNORE INTO Periodo(IdPeriodo, Anio, Mes)
+        SELECT DISTINCT Anio * 100 + Mes, Anio, Mes FROM Staging_Datos
+    """,
+    # Upsert: actualizar solo los montos que cambiaron e insertar los nuevos
+    "uspFill_FTValor": """
+        INSERT INTO Valor(IdOrigen, IdInstitucion, IdIndicador, IdPeriodo, Monto)
+        SELECT O.IdOrigen, I.IdInstitucion, N.IdIndicador, P.IdPeriodo, ROUND(S.Valor, 2)
+        FROM Staging_Datos AS S
+        INNER JOIN Origen AS O
+            ON TRIM(S.Origen) = O.Nombre
+        INNER JOIN Institucion AS I
+            ON TRIM(S.Institucion) = I.Nombre
+        INNER JOIN Indicador AS N
+            ON TRIM(S.Indicador) = N.Nombre
+        INNER JOIN Periodo AS P
+            ON S.Anio = P.Anio AND S.Mes = P.Mes
+        WHERE true
+        ON CONFLICT (IdOrigen, IdInstitucion, IdIndicador, IdPeriodo)
+        DO UPDATE SET Monto = excluded.Monto
+        WHERE Monto != excluded.Monto
+    """,
+    "uspFill_Carga": """
+        INSERT INTO Carga(Registros)
+        SELECT COUNT(*) FROM Staging_Datos
+    """,
+}
+
+
+def crear_esquema():
+    """
+    Crea el esquema si no existe y activa WAL, una sola vez por proceso.\n
+    El modo WAL queda guardado en el archivo de la base de datos,
+    por lo que las conexiones posteriores no necesitan activarlo.
+
+    :return: `True` si el esquema se creó o ya existía.
+    """
+
+    global _esquema_creado
+
+    if _esquema_creado:
+        return True
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(DB_PATH)), exist_ok=True)
+
+        with closing(sqlite3.connect(DB_PATH, timeout=_TIMEOUT)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # executescript confirma la transacción pendiente antes de ejecutarse
+            conn.executescript(_ESQUEMA)
+
+        _esquema_creado = True
+
+        return True
+    except Exception as e:
+        print("Error al crear el esquema:", e)
+        return False
+
+
+def conectar() -> sqlite3.Connection:
+    """
+    Devuelve una conexión a la base de datos con los pragmas de cada conexión.\n
+    El esquema se crea con `crear_esquema` al iniciar la carga.
+    """
+
+    conn = sqlite3.connect(DB_PATH, timeout=_TIMEOUT)
+
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+
+    return conn
+
+
+def _limpiar_staging():
+    """
+    Elimina los registros de la tabla Staging_Datos
+
+    :return: `True` si se limpió correctamente.
+    """
+
+    try:
+        with closing(conectar()) as conn, conn:
+            # Limpiando la tabla
+            print("Limpiando tabla de carga")
+            conn.execute(f"DELETE FROM {_STAGING_TABLE}")
+
+        return True
+    except Exception as e:
+        print("Error al limpiar tabla de carga:", e)
+        return False
+
+
+def _insertar_data(df: pd.DataFrame):
+    """
+    Inserta la información del DataFrame en la tabla Staging_Datos
+    en una sola transacción, sin eliminar los registros existentes.
+
+    :param df: DataFrame con los datos a insertar
+
+    :return: `True` si se insertó correctamente.
+    """
+
+    try:
+        # Convertir el DataFrame en una lista de tuplas con tipos de Python
+        with perfil.perfilar("carga", paso="to_numpy"):
+            values = list(
+                zip(
+                    *(
+                        df[columna].tolist()
+                        for columna in (
+                            "ORIGEN",
+                            "INSTITUCION",
+                            "INDICADOR",
+                            "ANIO",
+                            "MES",
+                            "VALOR",
+                        )
+                    )
+                )
+            )
+
+        insert_query = f"""
+            INSERT INTO {_STAGING_TABLE}(Origen, Institucion, Indicador, Anio, Mes, Valor)
+            VALUES(?, ?, ?, ?, ?, ?)"""
+
+        with closing(conectar()) as conn, conn, metricas.medir(
+            "carga", registros=len(values)
+        ), perfil.perfilar("carga", paso="executemany"):
+            conn.executemany(insert_query, values)
+
+        return True
+    except Exception as e:
+        print("Error al cargar datos:", e)
+        return False
+
+
+def _cargar_data(df: pd.DataFrame):
+    """
+    Carga la información del DataFrame en la tabla Staging_Datos
+
+    :param df: DataFrame con los datos a insertar
+    """
+
+    if not _limpiar_staging():
+        return False
+
+    if df.empty:
+        print("El DataFrame está vacío!")
+        print("No se insertaron registros en la base de datos.")
+        return False
+
+    print("Cargando registros")
+
+    if not _insertar_data(df):
+        return False
+
+    print("Registros cargados:", df.shape[0])
+
+    return True
+
+
+def _ejecutar_paso(conn: sqlite3.Connection, paso: str):
+    """
+    Ejecuta el paso de actualización del DW especificado registrando su duración.
+    """
+
+    with metricas.medir("sp", nombre=paso), perfil.perfilar("sp", nombre=paso):
+        conn.execute(_PASOS_DW[paso])
+
+
+def _actualizar_dw():
+    """
+    Actualiza los datos del DW en una sola transacción.
+
+    :return: `True` si se actualizó correctamente.
+    """
+
+    try:
+        with closing(conectar()) as conn, conn:
+            print("Actualizando dimensiones")
+            _ejecutar_paso(conn, "uspFill_DimOrigen")
+            _ejecutar_paso(conn, "uspFill_DimInstitucion")
+            _ejecutar_paso(conn, "uspFill_DimIndicador")
+            _ejecutar_paso(conn, "uspFill_DimPeriodo")
+
+            print("Actualizando FT")
+            _ejecutar_paso(conn, "uspFill_FTValor")
+
+            # Registrar la carga para invalidar la caché de las consultas
+            _ejecutar_paso(conn, "uspFill_Carga")
+
+        return True
+    except Exception as e:
+        print("Error al actualizar DW:", e)
+        return False
+
+
+def actualizar(df: pd.DataFrame):
+    """
+    Actualiza la BD con la información del DataFrame.
+
+    :param df: DataFrame con los datos a cargar
+
+    :return: `True` si la información se cargó y el DW se actualizó correctamente.
+    """
+
+    if not crear_esquema():
+        return False
+
+    cargar = _cargar_data(df)
+
+    if not cargar:
+        return False
+
+    return _actualizar_dw()
+
+
+def iniciar_carga():
+    """
+    Inicia una carga por bloques limpiando la tabla de carga.\n
+    Los bloques se agregan con `cargar` y el DW se actualiza con `finalizar_carga`.
+
+    :return: `True` si la tabla de carga se limpió correctamente.
+    """
+
+    if not crear_esquema():
+        return False
+
+    return _limpiar_staging()
+
+
+def cargar(df: pd.DataFrame):
+    """
+    Agrega un bloque de datos a la tabla de carga.
+
+    :param df: DataFrame con los datos a cargar
+
+    :return: `True` si el bloque se cargó correctamente.
+    """
+
+    if df.empty:
+        return True
+
+    return _insertar_data(df)
+
+
+def finalizar_carga():
+    """
+    Actualiza el DW con los bloques agregados a la tabla de carga.
+
+    :return: `True` si el DW se actualizó correctamente.
+    """
+
+    return _actualizar_dw()
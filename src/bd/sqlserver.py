@@ -0,0 +1,242 @@
+"""
+Modulo para guardar indicadoes en la base de datos de SQL Server\n
+- Depende del paquete `python-dotenv` para cargar variables de entorno
+necesarias para conectarse a SQL:\n
+    pip install python-dotenv
+
+El esquema y los SPs se crean con `database/create_database.sql`.
+"""
+
+import os
+from dotenv import load_dotenv
+import pyodbc
+import pandas as pd
+import metricas
+import perfil
+
+# Cargar las variables desde el archivo .env
+load_dotenv()
+
+server = os.getenv("DB_SERVER")
+database = os.getenv("DB_NAME")
+username = os.getenv("DB_USER")
+password = os.getenv("DB_PASSWORD")
+
+driver = "{ODBC Driver 17 for SQL Server}"
+
+# Conectarse a sql server
+conn_str = f"""
+DRIVER={driver};
+SERVER={server};
+DATABASE={database};
+UID={username};
+PWD={password}"""
+
+
+_STAGING_TABLE = "Staging.Datos"
+
+
+def conectar():
+    """
+    Devuelve una conexión a la base de datos.
+    """
+
+    return pyodbc.connect(conn_str)
+
+
+def _limpiar_staging():
+    """
+    Elimina los registros de la tabla Staging.Datos
+
+    :return: `True` si se limpió correctamente.
+    """
+
+    conn = None
+
+    try:
+        conn = conectar()
+        cursor = conn.cursor()
+
+        # Limpiando la tabla
+        print("Limpiando tabla de carga")
+        cursor.execute(f"TRUNCATE TABLE {_STAGING_TABLE}")
+
+        conn.commit()
+
+        return True
+    except Exception as e:
+        print("Error al limpiar tabla de carga:", e)
+        return False
+    finally:
+        # Cerrar la conexión
+        if conn:
+            conn.close()
+
+
+def _insertar_data(df: pd.DataFrame):
+    """
+    Inserta la información del DataFrame en la tabla Staging.Datos,
+    sin eliminar los registros existentes.
+
+    :param df: DataFrame con los datos a insertar
+
+    :return: `True` si se insertó correctamente.
+    """
+
+    conn = None
+
+    # Insertar en la tabla
+    try:
+        conn = conectar()
+        cursor = conn.cursor()
+
+        # Convertir elk data frame en una lista de tuplas
+        with perfil.perfilar("carga", paso="to_numpy"):
+            values = [tuple(x) for x in df.to_numpy()]
+
+        insert_query = f"""
+            INSERT INTO {_STAGING_TABLE}(Origen, Institucion, Indicador, Anio, Mes, Valor)
+            VALUES(?, ?, ?, ?, ?, ?)"""
+
+        with metricas.medir("carga", registros=len(values)), perfil.perfilar(
+            "carga", paso="executemany"
+        ):
+            cursor.executemany(insert_query, values)
+
+            conn.commit()
+
+        return True
+    except Exception as e:
+        print("Error al cargar datos:", e)
+        return False
+    finally:
+        # Cerrar la conexión
+        if conn:
+            conn.close()
+
+
+def _cargar_data(df: pd.DataFrame):
+    """
+    Carga la información del DataFrame en la tabla Staging.Datos
+
+    :param df: DataFrame con los datos a insertar
+    """
+
+    if not _limpiar_staging():
+        return False
+
+    if df.empty:
+        print("El DataFrame está vacío!")
+        print("No se insertaron registros en la base de datos.")
+        return False
+
+    print("Cargando registros")
+
+    if not _insertar_data(df):
+        return False
+
+    # print("Registros insertados:", cursor.rowcount)
+    print("Registros cargados:", df.shape[0])
+
+    return True
+
+
+def _ejecutar_sp(cursor, sp: str):
+    """
+    Ejecuta el SP especificado registrando su duración.
+    """
+
+    with metricas.medir("sp", nombre=sp), perfil.perfilar("sp", nombre=sp):
+        cursor.execute(f"EXEC {sp}")
+
+
+def _actualizar_dw():
+    """
+    Actualiza los datos del DW
+
+    :return: `True` si se actualizó correctamente.
+    """
+
+    conn = None
+
+    try:
+        conn = conectar()
+        cursor = conn.cursor()
+
+        print("Actualizando dimensiones")
+        _ejecutar_sp(cursor, "dbo.uspFill_DimOrigen")
+        _ejecutar_sp(cursor, "dbo.uspFill_DimInstitucion")
+        _ejecutar_sp(cursor, "dbo.uspFill_DimIndicador")
+        _ejecutar_sp(cursor, "dbo.uspFill_DimPeriodo")
+
+        conn.commit()
+
+        print("Actualizando FT")
+        _ejecutar_sp(cursor, "dbo.uspFill_FTValor")
+
+        # Registrar la carga para invalidar la caché de las consultas
+        _ejecutar_sp(cursor, "dbo.uspFill_Carga")
+
+        conn.commit()
+
+        return True
+    except Exception as e:
+        print("Error al actualizar DW:", e)
+        return False
+    finally:
+        # Cerrar la conexión
+        if conn:
+            conn.close()
+
+
+def actualizar(df: pd.DataFrame):
+    """
+    Actualiza la BD con la información del DataFrame.
+
+    :param df: DataFrame con los datos a cargar
+
+    :return: `True` si la información se cargó y el DW se actualizó correctamente.
+    """
+
+    cargar = _cargar_data(df)
+
+    if not cargar:
+        return False
+
+    return _actualizar_dw()
+
+
+def iniciar_carga():
+    """
+    Inicia una carga por bloques limpiando la tabla de carga.\n
+    Los bloques se agregan con `cargar` y el DW se actualiza con `finalizar_carga`.
+
+    :return: `True` si la tabla de carga se limpió correctamente.
+    """
+
+    return _limpiar_staging()
+
+
+def cargar(df: pd.DataFrame):
+    """
+    Agrega un bloque de datos a la tabla de carga.
+
+    :param df: DataFrame con los datos a cargar
+
+    :return: `True` si el bloque se cargó correctamente.
+    """
+
+    if df.empty:
+        return True
+
+    return _insertar_data(df)
+
+
+def finalizar_carga():
+    """
+    Actualiza el DW con los bloques agregados a la tabla de carga.
+
+    :return: `True` si el DW se actualizó correctamente.
+    """
+
+    return _actualizar_dw()
@@ -0,0 +1,5 @@
+"""
+Paquete de benchmarks sin conexión a los orígenes.\n
+Se ejecutan desde el directorio `src`:\n
+    py -m benchmarks.parsers
+"""
@@ -0,0 +1,119 @@
+"""
+Benchmark de la carga en la base de datos SQLite embebida (ver `bd.sqlite`).\n
+Carga por bloques (un bloque por año, como las tareas de la SIBOIF) registros sintéticos
+en una base de datos temporal y mide la carga a la tabla de staging y la actualización
+del DW, primero con una base de datos vacía (inserciones) y luego con los mismos datos
+(upsert sin cambios).\n
+Uso (desde el directorio `src`):\n
+    py -m benchmarks.carga
+    py -m benchmarks.carga --anios 20 --instituciones 80
+"""
+
+import io
+import os
+import time
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+from benchmarks import fixtures
+from bd import sqlite
+from siboif import main as siboif
+
+
+def _get_bloques(anios: int, instituciones: int) -> list:
+    """
+    Devuelve un DataFrame procesado de la SIBOIF por cada año.
+    """
+
+    return [
+        siboif._process_data(
+            fixtures.generar_siboif(
+                [(2000 + anio, month) for month in range(1, 13)],
+                instituciones=instituciones,
+            )
+        )
+        for anio in range(anios)
+    ]
+
+
+def _medir_carga(bloques: list) -> dict:
+    """
+    Ejecuta una carga completa y devuelve los segundos de cada etapa.
+    """
+
+    # Los mensajes de la carga no se imprimen en los resultados
+    with redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+
+        if not sqlite.iniciar_carga():
+            raise RuntimeError("No se pudo limpiar la tabla de carga")
+
+        for df in bloques:
+            if not sqlite.cargar(df):
+                raise RuntimeError("No se pudo cargar el bloque")
+
+        staging = time.perf_counter()
+
+        if not sqlite.finalizar_carga():
+            raise RuntimeError("No se pudo actualizar el DW")
+
+        fin = time.perf_counter()
+
+    return {"staging": staging - inicio, "dw": fin - staging, "total": fin - inicio}
+
+
+def ejecutar(anios: int = 10, instituciones: int = 40):
+    """
+    Ejecuta el benchmark de la carga.
+
+    :param anios: Cantidad de años (bloques) a cargar.
+    :param instituciones: Cantidad de instituciones por periodo.
+    """
+
+    bloques = _get_bloques(anios, instituciones)
+    registros = sum(df.shape[0] for df in bloques)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Base de datos temporal, sin modificar la configurada en DB_SQLITE_PATH
+        sqlite.DB_PATH = os.path.join(temp_dir, "IndicadoresDW.db")
+
+        print(f"Registros: {registros} en {len(bloques)} bloques\n")
+        print(
+            f"{'carga':<12}{'staging_seg':>12}{'dw_seg':>12}{'total_seg':>12}{'registros/seg':>15}"
+        )
+
+        for nombre in ("inserción", "upsert"):
+            tiempos = _medir_carga(bloques)
+
+            print(
+                f"{nombre:<12}{tiempos['staging']:>12.4f}{tiempos['dw']:>12.4f}"
+                f"{tiempos['total']:>12.4f}{registros / tiempos['total']:>15.0f}"
+            )
+
+
+def main():
+    """
+    Función principal del benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la carga en la base de datos SQLite."
+    )
+
+    parser.add_argument(
+        "--anios", type=int, default=10, help="Años (bloques) a cargar."
+    )
+    parser.add_argument(
+        "--instituciones",
+        type=int,
+        default=40,
+        help="Instituciones por periodo.",
+    )
+
+    args = parser.parse_args()
+
+    ejecutar(anios=args.anios, instituciones=args.instituciones)
+
+
+if __name__ == "__main__":
+    main()
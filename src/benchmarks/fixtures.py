@@ -0,0 +1,499 @@
+"""
+Modulo con generadores de archivos sintéticos con el mismo formato
+que los reportes del BCN y de la CONAMI.\n
+Cada archivo se genera con el formato de su extensión, igual que los reportes reales:
+los `.xls` (BIFF, que se leen con `xlrd`) con el paquete opcional `xlwt`
+y los `.xlsx` con `openpyxl`:\n
+    pip install xlwt
+"""
+
+import os
+import random
+from openpyxl import Workbook
+from utils import get_date_str
+
+# Último año de los datos generados
+ANIO_FINAL = 2024
+
+_MESES = (
+    "Enero",
+    "Febrero",
+    "Marzo",
+    "Abril",
+    "Mayo",
+    "Junio",
+    "Julio",
+    "Agosto",
+    "Septiembre",
+    "Octubre",
+    "Noviembre",
+    "Diciembre",
+)
+
+_MESES_ABREVIADOS = (
+    "Ene",
+    "Feb",
+    "Mar",
+    "Abr",
+    "May",
+    "Jun",
+    "Jul",
+    "Ago",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dic",
+)
+
+_TRIMESTRES = ("I", "II", "III", "IV")
+
+# Conceptos adicionales de los reportes, para que los archivos tengan un tamaño realista
+_CONCEPTOS_BALANZA_PAGOS = (
+    "Cuenta corriente",
+    "Bienes",
+    "Exportaciones FOB",
+    "Importaciones FOB",
+    "Servicios",
+    "Ingreso primario",
+    "Ingreso secundario",
+    "Cuenta de capital",
+    "Cuenta financiera",
+    "Inversión directa",
+    "Inversión de cartera",
+    "Otra inversión",
+    "Activos de reserva",
+    "Errores y omisiones",
+)
+
+_CONCEPTOS_PII = (
+    "Posición de inversión internacional neta",
+    "Activos",
+    "Inversión directa",
+    "Inversión de cartera",
+    "Otra inversión",
+    "Activos de reserva",
+    "Pasivos",
+    "Inversión directa ",
+    "Inversión de cartera ",
+    "Otra inversión ",
+)
+
+_CONCEPTOS_DEUDA = (
+    "Deuda externa total",
+    "Gobierno General",
+    "Banco Central",
+    "Sociedades captadoras de depósitos",
+    "Otros sectores",
+    "Inversión directa: préstamos entre empresas",
+)
+
+_CONCEPTOS_INDICE = (
+    "Índice general",
+    "Producción Agropecuaria",
+    "Producción Pesquera",
+    "Productos Mineros",
+    "Productos Manufacturados",
+)
+
+_SECTORES_EXPORTACIONES = (
+    "Total",
+    "Agropecuarios",
+    "Pesqueros",
+    "Minería",
+    "Manufactura",
+)
+
+_SECTORES_IMPORTACIONES = (
+    "Total",
+    "Bienes de consumo",
+    "Petróleo, combustibles y lubricantes",
+    "Bienes intermedios",
+    "Bienes de capital",
+    "Diversos",
+)
+
+# Cuentas del Estado de Situación Financiera (CONAMI y SIBOIF)
+_CUENTAS_ESF = (
+    "ACTIVO",
+    "Disponibilidades",
+    "Cartera de créditos",
+    "Otras cuentas por cobrar",
+    "Bienes de uso",
+    "PASIVO",
+    "Obligaciones con instituciones financieras",
+    "Otras cuentas por pagar",
+    "PATRIMONIO",
+    "Capital social",
+    "Resultados acumulados",
+)
+
+
+def _valor(random_gen: random.Random) -> float:
+    """
+    Devuelve un valor aleatorio en millones con dos decimales.
+    """
+
+    return round(random_gen.uniform(-500, 5000), 2)
+
+
+def _anios(anios: int) -> range:
+    """
+    Devuelve el rango de los últimos años especificados.
+    """
+
+    return range(ANIO_FINAL - anios + 1, ANIO_FINAL + 1)
+
+
+def _guardar(file_path: str, hojas: dict[str, list[list]]):
+    """
+    Guarda las filas de cada hoja con el formato de la extensión del archivo:
+    `.xls` (BIFF) con `xlwt`, igual que los reportes del BCN que se leen con `xlrd`,
+    y `.xlsx` con `openpyxl`.
+
+    :raises ImportError: Si el archivo es `.xls` y el paquete `xlwt` no está instalado.
+    """
+
+    if file_path.lower().endswith(".xls"):
+        import xlwt  # pylint: disable=import-outside-toplevel
+
+        wb = xlwt.Workbook()
+
+        for nombre, filas in hojas.items():
+            ws = wb.add_sheet(nombre)
+
+            for row, fila in enumerate(filas):
+                for col, valor in enumerate(fila):
+                    if valor is not None:
+                        ws.write(row, col, valor)
+    else:
+        wb = Workbook()
+        wb.remove(wb.active)
+
+        for nombre, filas in hojas.items():
+            ws = wb.create_sheet(nombre)
+
+            for fila in filas:
+                ws.append(fila)
+
+    wb.save(file_path)
+
+
+def _encabezado(filas: int) -> list[list]:
+    """
+    Devuelve las filas de título que los reportes tienen antes de los datos.
+    """
+
+    return [["Banco Central de Nicaragua"]] + [[] for _ in range(filas - 1)]
+
+
+def generar_ied(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Ingresos brutos y flujos netos de IED**:
+    columnas Año y Trimestre ("I Trim"), con el año solo en el primer trimestre.
+    """
+
+    random_gen = random.Random(seed)
+
+    filas = _encabezado(4)
+    filas.append(["Año", "Trimestre", "Ingresos brutos", "Flujos netos"])
+
+    for year in _anios(anios):
+        for trimestre in _TRIMESTRES:
+            # El año solo se muestra en el primer trimestre
+            anio = year if trimestre == "I" else None
+            filas.append(
+                [anio, f"{trimestre} Trim", _valor(random_gen), _valor(random_gen)]
+            )
+
+    filas.append([])
+    filas.append(["Fuente: BCN"])
+
+    _guardar(file_path, {"Hoja1": filas})
+
+
+def _generar_trimestres_columnas(
+    file_path: str, conceptos: tuple, anios: int, seed: int
+):
+    """
+    Genera un reporte con conceptos en filas y columnas por trimestre ("I Trim 24")
+    más una columna de total por año.
+    """
+
+    random_gen = random.Random(seed)
+
+    filas = _encabezado(5)
+
+    columnas = ["Conceptos"]
+
+    for year in _anios(anios):
+        columnas.extend(
+            f"{trimestre} Trim {year % 100:02d}" for trimestre in _TRIMESTRES
+        )
+        columnas.append(year)
+
+    filas.append(columnas)
+
+    for concepto in conceptos:
+        filas.append([concepto] + [_valor(random_gen) for _ in columnas[1:]])
+
+    _guardar(file_path, {"Hoja1": filas})
+
+
+def generar_balanza_pagos(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Balanza de pagos** (columnas "I Trim 24").
+    """
+
+    _generar_trimestres_columnas(file_path, _CONCEPTOS_BALANZA_PAGOS, anios, seed)
+
+
+def generar_pii(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Posición de inversión internacional** (columnas "I Trim 24").
+    """
+
+    _generar_trimestres_columnas(file_path, _CONCEPTOS_PII, anios, seed)
+
+
+def generar_remesas(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Remesas Mensuales**: una fila por año y una columna por mes ("Ene").
+    """
+
+    random_gen = random.Random(seed)
+
+    filas = _encabezado(4)
+    filas.append(["Año", *_MESES_ABREVIADOS, "Total"])
+
+    for year in _anios(anios):
+        valores = [_valor(random_gen) for _ in _MESES_ABREVIADOS]
+        filas.append([year, *valores, round(sum(valores), 2)])
+
+    _guardar(file_path, {"Hoja1": filas})
+
+
+def generar_deuda_externa(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Deuda Externa Total**: hoja "C1" con los años en la fila 5
+    y los trimestres en la fila 6.
+    """
+
+    random_gen = random.Random(seed)
+
+    filas = [
+        ["Nicaragua: Saldo de deuda externa total"],
+        ["(millones de dólares)"],
+        [],
+        [],
+    ]
+
+    fila_anios = ["Concepto"]
+    fila_trimestres = [None]
+
+    for year in _anios(anios):
+        fila_anios.extend([year, None, None, None])
+        fila_trimestres.extend(_TRIMESTRES)
+
+    filas.append(fila_anios)
+    filas.append(fila_trimestres)
+
+    for concepto in _CONCEPTOS_DEUDA:
+        filas.append([concepto] + [_valor(random_gen) for _ in fila_trimestres[1:]])
+
+    # Hojas adicionales del archivo
+    hojas = {"C1": filas}
+    hojas.update({hoja: [["Cuadro", hoja]] for hoja in ("C2", "C3")})
+
+    _guardar(file_path, hojas)
+
+
+def generar_indice_precios(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Índices de precios de exportación tipo Fisher**:
+    una hoja por año con los meses dos filas arriba del concepto procesado.
+    """
+
+    random_gen = random.Random(seed)
+
+    hojas = {}
+
+    for year in _anios(anios):
+        filas = [
+            ["Índices de precios de exportación tipo Fisher"],
+            [],
+            ["Conceptos", *_MESES],
+        ]
+
+        for concepto in _CONCEPTOS_INDICE:
+            filas.append([concepto] + [_valor(random_gen) for _ in _MESES])
+
+        hojas[str(year)] = filas
+
+    _guardar(file_path, hojas)
+
+
+def _generar_anio_mes(
+    file_path: str,
+    sectores: tuple,
+    filas_encabezado: int,
+    columna_fecha: str | None,
+    anios: int,
+    seed: int,
+):
+    """
+    Genera un reporte con la columna "Año y mes": una fila con el año
+    seguida de una fila por mes. Antes de 2006 solo hay filas anuales.
+    """
+
+    random_gen = random.Random(seed)
+
+    filas = _encabezado(filas_encabezado)
+    filas.append([columna_fecha, *sectores])
+
+    for year in _anios(anios):
+        filas.append([year] + [_valor(random_gen) for _ in sectores])
+
+        if year < 2006:
+            continue
+
+        for mes in _MESES:
+            filas.append([mes] + [_valor(random_gen) for _ in sectores])
+
+    filas.append([])
+    filas.append(["Fuente: DGA"])
+
+    _guardar(file_path, {"Hoja1": filas})
+
+
+def generar_importaciones(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Importaciones CIF: mercancías** (columna "Año y mes").
+    """
+
+    _generar_anio_mes(file_path, _SECTORES_IMPORTACIONES, 3, "Año y mes", anios, seed)
+
+
+def generar_exportaciones(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Exportaciones FOB: mercancías por sector económico**
+    (primera columna sin nombre).
+    """
+
+    _generar_anio_mes(file_path, _SECTORES_EXPORTACIONES, 4, None, anios, seed)
+
+
+def generar_balanza_comercial(file_path: str, anios: int = 20, seed: int = 0):
+    """
+    Genera el reporte **Balanza comercial: mercancías generales**
+    (primera columna sin nombre).
+    """
+
+    _generar_anio_mes(file_path, _SECTORES_EXPORTACIONES, 4, None, anios, seed)
+
+
+def generar_conami(file_path: str, instituciones: int = 30, seed: int = 0):
+    """
+    Genera el reporte **Estado de Situación Financiera** de la CONAMI:
+    cuentas en filas y una columna por institución más la columna Total.
+
+    :raises ImportError: Si el paquete `xlwt` no está instalado.
+    """
+
+    import xlwt  # pylint: disable=import-outside-toplevel
+
+    random_gen = random.Random(seed)
+
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("Reporte")
+
+    ws.write(0, 0, "Comisión Nacional de Microfinanzas")
+    ws.write(1, 0, "Estado de Situación Financiera")
+
+    columnas = [
+        "Descripcion de Cuenta",
+        *(f"INSTITUCION {i + 1}" for i in range(instituciones)),
+        "Total",
+    ]
+
+    for col, columna in enumerate(columnas):
+        ws.write(9, col, columna)
+
+    for row, cuenta in enumerate(_CUENTAS_ESF, start=10):
+        valores = [_valor(random_gen) for _ in range(instituciones)]
+
+        ws.write(row, 0, f" {cuenta} ")
+
+        for col, valor in enumerate(valores, start=1):
+            ws.write(row, col, valor)
+
+        ws.write(row, len(columnas) - 1, round(sum(valores), 2))
+
+    wb.save(file_path)
+
+
+def generar_siboif(
+    periodos: list[tuple[int, int]], instituciones: int = 20, seed: int | str = 0
+) -> list[dict]:
+    """
+    Genera los registros del servicio web de la SIBOIF para los periodos especificados,
+    con las columnas que devuelve `/rest/estadisticas` (valores con separador de miles).
+    """
+
+    registros = []
+
+    nombres = [f"BANCO {i + 1}" for i in range(instituciones)]
+
+    # Instituciones con valores totalizados
+    nombres.extend(("SF", "SFB", "SFN"))
+
+    for year, month in periodos:
+        random_gen = random.Random(f"{seed}-{year}-{month}")
+        fecha = get_date_str(year, month)
+
+        for institucion in nombres:
+            for variable in _CUENTAS_ESF:
+                registros.append(
+                    {
+                        "fecha": fecha,
+                        "institucion": institucion,
+                        "intendencia": "Bancos",
+                        "tipo_reporte": "Estado de Situación Financiera (ESF)",
+                        "variable_1": variable,
+                        "valor_1": f"{_valor(random_gen) * 1000:,.2f}",
+                    }
+                )
+
+    return registros
+
+
+# Generador de cada archivo del BCN, según el nombre de archivo de `bcn.reportes`
+generadores_bcn = {
+    "IED.xlsx": generar_ied,
+    "BPCC.xls": generar_balanza_pagos,
+    "PIIN.xls": generar_pii,
+    "REMESAS.xls": generar_remesas,
+    "DET.xlsx": generar_deuda_externa,
+    "IPE.xls": generar_indice_precios,
+    "Importaciones.xls": generar_importaciones,
+    "Exportaciones.xls": generar_exportaciones,
+    "Balanza Comercial.xls": generar_balanza_comercial,
+}
+
+
+def generar_bcn(files_dir: str, anios: int = 20, seed: int = 0) -> dict[str, str]:
+    """
+    Genera todos los archivos del BCN en el directorio especificado.
+
+    :return: Diccionario con el nombre de archivo como key y la ruta como value.
+    """
+
+    os.makedirs(files_dir, exist_ok=True)
+
+    rutas = {}
+
+    for file_name, generador in generadores_bcn.items():
+        file_path = os.path.join(files_dir, file_name)
+        generador(file_path, anios=anios, seed=seed)
+        rutas[file_name] = file_path
+
+    return rutas
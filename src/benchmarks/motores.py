@@ -0,0 +1,312 @@
+"""
+Benchmark de los motores para leer archivos de Excel (ver `excel`).\n
+Por cada archivo y cada motor instalado para su formato mide el tiempo (mínimo de
+varias repeticiones) de leer todas las hojas y de ejecutar el procesador del reporte,
+y verifica que el procesador devuelva los mismos datos con todos los motores.\n
+Usa los archivos descargados guardados (`--guardar-archivos` de `procesar.py`)
+y, si no hay, archivos sintéticos.\n
+Uso (desde el directorio `src`):\n
+    py -m benchmarks.motores
+    py -m benchmarks.motores --dir bcn/files --repeticiones 3
+    py -m benchmarks.motores --sinteticos --anios 40
+"""
+
+import os
+import gc
+import sys
+import time
+import argparse
+import tempfile
+from functools import partial
+from typing import Callable, Optional
+import pandas as pd
+import excel
+from benchmarks import fixtures
+from bcn.reportes import reportes_list, get_procesador
+from conami import main as conami
+
+_SRC_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Directorios donde se guardan los archivos descargados
+_FILES_DIRS = [
+    os.path.join(_SRC_DIR, "bcn", "files"),
+    os.path.join(_SRC_DIR, "conami", "files"),
+]
+
+# Año y mes asignados a los reportes de la CONAMI
+_CONAMI_PERIODO = (2024, 6)
+
+
+def _get_procesador(file_path: str) -> Optional[Callable[[str], pd.DataFrame]]:
+    """
+    Devuelve el procesador del reporte según el nombre del archivo, o `None` si no se conoce.
+    """
+
+    file_name = os.path.basename(file_path)
+
+    for reporte in reportes_list:
+        if reporte["file_name"] == file_name:
+            return get_procesador(reporte)
+
+    # Los reportes de la CONAMI se guardan con el nombre del periodo
+    if "conami" in os.path.normpath(file_path).split(os.sep):
+        return partial(
+            conami._process_file, year=_CONAMI_PERIODO[0], month=_CONAMI_PERIODO[1]
+        )
+
+    return None
+
+
+def _get_archivos(files_dirs: list[str]) -> dict[str, Optional[Callable]]:
+    """
+    Devuelve los archivos de Excel de los directorios especificados con su procesador.
+    """
+
+    archivos = {}
+
+    for files_dir in files_dirs:
+        if not os.path.isdir(files_dir):
+            continue
+
+        for file_name in sorted(os.listdir(files_dir)):
+            if file_name.lower().endswith((".xls", ".xlsx")):
+                file_path = os.path.join(files_dir, file_name)
+                archivos[file_path] = _get_procesador(file_path)
+
+    return archivos
+
+
+def _generar_archivos(files_dir: str, anios: int, instituciones: int) -> dict:
+    """
+    Genera los archivos sintéticos y devuelve cada archivo con su procesador.
+    """
+
+    archivos = {}
+
+    rutas = fixtures.generar_bcn(files_dir, anios=anios)
+
+    for reporte in reportes_list:
+        archivos[rutas[reporte["file_name"]]] = get_procesador(reporte)
+
+    try:
+        file_path = os.path.join(files_dir, "ESF.xls")
+        fixtures.generar_conami(file_path, instituciones=instituciones)
+
+        archivos[file_path] = partial(
+            conami._process_file, year=_CONAMI_PERIODO[0], month=_CONAMI_PERIODO[1]
+        )
+    except ImportError:
+        print("Se omite la CONAMI: el paquete xlwt no está instalado.")
+
+    return archivos
+
+
+def _leer_hojas(file_path: str, motor: str):
+    """
+    Lee todas las hojas del archivo con el motor especificado.
+    """
+
+    with excel.abrir(file_path, motor) as xls:
+        return xls.parse(sheet_name=None)
+
+
+def _medir(funcion: Callable, repeticiones: int) -> tuple[float, object]:
+    """
+    Ejecuta la función especificada y devuelve el tiempo mínimo y su resultado.
+    """
+
+    tiempos = []
+    resultado = None
+
+    for _ in range(repeticiones):
+        gc.collect()
+
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    return min(tiempos), resultado
+
+
+def _procesar(procesador: Callable, file_path: str, motor: str) -> pd.DataFrame:
+    """
+    Ejecuta el procesador forzando el motor especificado.
+    """
+
+    anterior = os.environ.get("EXCEL_MOTOR")
+    os.environ["EXCEL_MOTOR"] = motor
+
+    try:
+        return procesador(file_path)
+    finally:
+        if anterior is None:
+            del os.environ["EXCEL_MOTOR"]
+        else:
+            os.environ["EXCEL_MOTOR"] = anterior
+
+
+def _iguales(df_1: pd.DataFrame, df_2: pd.DataFrame) -> bool:
+    """
+    Indica si los procesadores devolvieron los mismos datos.
+    """
+
+    try:
+        pd.testing.assert_frame_equal(
+            df_1.reset_index(drop=True), df_2.reset_index(drop=True)
+        )
+    except AssertionError:
+        return False
+
+    return True
+
+
+def _comparar_archivo(
+    file_path: str, procesador: Optional[Callable], repeticiones: int
+) -> bool:
+    """
+    Compara los motores instalados para el archivo e imprime los resultados.
+
+    :return: `True` si el procesador devuelve los mismos datos con todos los motores.
+    """
+
+    formato = excel.get_formato(file_path)
+    motores = excel.get_motores(formato)
+
+    referencia = None
+    iguales = True
+
+    for motor in motores:
+        lectura, _ = _medir(partial(_leer_hojas, file_path, motor), repeticiones)
+
+        if procesador:
+            proceso, df = _medir(
+                partial(_procesar, procesador, file_path, motor), repeticiones
+            )
+
+            if referencia is None:
+                referencia = df
+                estado = "referencia"
+            elif _iguales(referencia, df):
+                estado = "OK"
+            else:
+                estado = "DATOS DISTINTOS"
+                iguales = False
+
+            proceso = f"{proceso:>12.4f}"
+        else:
+            proceso, estado = f"{'-':>12}", "sin procesador"
+
+        print(
+            f"{os.path.basename(file_path)[:35]:<36}{formato:<6}{motor:<10}"
+            f"{lectura:>12.4f}{proceso}  {estado}"
+        )
+
+    return iguales
+
+
+def ejecutar(
+    files_dirs: Optional[list[str]] = None,
+    sinteticos: bool = False,
+    anios: int = 25,
+    instituciones: int = 40,
+    repeticiones: int = 5,
+) -> bool:
+    """
+    Ejecuta el benchmark de los motores.
+
+    :param files_dirs: Directorios con los archivos a leer (opcional, por defecto los
+    archivos descargados guardados del BCN y de la CONAMI).
+    :param sinteticos: Usar archivos sintéticos aunque existan archivos descargados.
+    :param anios: Cantidad de años de los archivos sintéticos del BCN.
+    :param instituciones: Cantidad de instituciones del archivo sintético de la CONAMI.
+    :param repeticiones: Cantidad de ejecuciones para medir el tiempo.
+
+    :return: `True` si todos los motores devuelven los mismos datos.
+    """
+
+    for formato, motores in excel.MOTORES.items():
+        instalados = excel.get_motores(formato)
+        print(
+            f"Motores .{formato}: {', '.join(instalados) or '-'}"
+            f" (preferencia: {', '.join(motores)})"
+        )
+
+    iguales = True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archivos = {} if sinteticos else _get_archivos(files_dirs or _FILES_DIRS)
+
+        if not archivos:
+            if not sinteticos:
+                print("No hay archivos descargados, se usan archivos sintéticos.")
+
+            archivos = _generar_archivos(temp_dir, anios, instituciones)
+
+        print(
+            f"\n{'archivo':<36}{'fmt':<6}{'motor':<10}"
+            f"{'lectura_seg':>12}{'proceso_seg':>12}  estado"
+        )
+
+        for file_path, procesador in archivos.items():
+            try:
+                iguales = (
+                    _comparar_archivo(file_path, procesador, repeticiones) and iguales
+                )
+            except ValueError as e:
+                print(f"{os.path.basename(file_path)}: {e}")
+
+    return iguales
+
+
+def main():
+    """
+    Función principal del benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark de los motores para leer archivos de Excel."
+    )
+
+    parser.add_argument(
+        "--dir",
+        action="append",
+        dest="files_dirs",
+        help="Directorio con archivos de Excel (se puede repetir).",
+    )
+    parser.add_argument(
+        "--sinteticos",
+        action="store_true",
+        help="Usar archivos sintéticos aunque existan archivos descargados.",
+    )
+    parser.add_argument(
+        "--anios", type=int, default=25, help="Años de los archivos sintéticos del BCN."
+    )
+    parser.add_argument(
+        "--instituciones",
+        type=int,
+        default=40,
+        help="Instituciones del archivo sintético de la CONAMI.",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        type=int,
+        default=5,
+        help="Ejecuciones por motor para medir el tiempo.",
+    )
+
+    args = parser.parse_args()
+
+    ok = ejecutar(
+        files_dirs=args.files_dirs,
+        sinteticos=args.sinteticos,
+        anios=args.anios,
+        instituciones=args.instituciones,
+        repeticiones=args.repeticiones,
+    )
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
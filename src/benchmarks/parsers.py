@@ -0,0 +1,279 @@
+"""
+Benchmark de los procesadores de archivos del BCN y de la CONAMI y de los datos de la SIBOIF
+con datos sintéticos.\n
+Mide el tiempo (mínimo de varias repeticiones) y la memoria máxima de cada procesador
+y los compara con las líneas base guardadas en `benchmarks/baselines.json`.\n
+Uso (desde el directorio `src`):\n
+    py -m benchmarks.parsers --guardar        # Guardar las líneas base
+    py -m benchmarks.parsers                  # Comparar con las líneas base
+    py -m benchmarks.parsers --anios 40 --instituciones 80
+
+Termina con código 1 si algún procesador es más lento, usa más memoria
+(según la tolerancia) o devuelve una cantidad distinta de registros.
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from functools import partial
+from typing import Callable
+import pandas as pd
+from benchmarks import fixtures
+from bcn.reportes import reportes_list, get_procesador
+from conami import main as conami
+from siboif import main as siboif
+
+_BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# Margen absoluto sobre la línea base, para no reportar variaciones de milisegundos
+_MARGEN = {"segundos": 0.01, "memoria_mb": 0.1}
+
+# Año y mes asignados al reporte sintético de la CONAMI
+_CONAMI_PERIODO = (2024, 6)
+
+
+def _get_procesadores(
+    files_dir: str, anios: int, instituciones: int
+) -> dict[str, tuple[Callable[[], pd.DataFrame], dict]]:
+    """
+    Genera los archivos sintéticos y devuelve un diccionario con el nombre del procesador
+    como key y como value la función sin parámetros a medir y la escala del archivo.
+    """
+
+    procesadores = {}
+
+    rutas = fixtures.generar_bcn(files_dir, anios=anios)
+
+    for reporte in reportes_list:
+        file_path = rutas[reporte["file_name"]]
+
+        procesadores[f"BCN {reporte['name']}"] = (
+            partial(get_procesador(reporte), file_path),
+            {"anios": anios},
+        )
+
+    try:
+        file_path = os.path.join(files_dir, "ESF.xls")
+        fixtures.generar_conami(file_path, instituciones=instituciones)
+
+        procesadores["CONAMI Estado de Situación Financiera"] = (
+            partial(conami._process_file, file_path, *_CONAMI_PERIODO),
+            {"instituciones": instituciones},
+        )
+    except ImportError:
+        print("Se omite la CONAMI: el paquete xlwt no está instalado.")
+
+    # Un periodo por mes de los años especificados, como una consulta por rango
+    periodos = [(2000 + i // 12, i % 12 + 1) for i in range(anios * 12)]
+    data = fixtures.generar_siboif(periodos, instituciones=instituciones)
+
+    procesadores["SIBOIF Estado de Situación Financiera"] = (
+        partial(siboif._process_data, data),
+        {"anios": anios, "instituciones": instituciones},
+    )
+
+    return procesadores
+
+
+def _medir(funcion: Callable[[], pd.DataFrame], repeticiones: int) -> dict:
+    """
+    Ejecuta la función especificada y devuelve el tiempo mínimo,
+    la memoria máxima y la cantidad de registros devueltos.
+    """
+
+    tiempos = []
+
+    for _ in range(repeticiones):
+        gc.collect()
+
+        inicio = time.perf_counter()
+        df = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    # La memoria se mide en una ejecución aparte, ya que tracemalloc afecta el tiempo
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "segundos": round(min(tiempos), 6),
+        "memoria_mb": round(pico / 1024 / 1024, 3),
+        "registros": int(df.shape[0]),
+    }
+
+
+def _comparar(
+    resultado: dict, baseline: dict | None, escala: dict, tolerancia: float
+) -> list[str]:
+    """
+    Compara el resultado con la línea base y devuelve la lista de regresiones.
+    """
+
+    if not baseline:
+        return []
+
+    # Las líneas base solo son comparables con archivos de la misma escala
+    if baseline.get("escala") != escala:
+        return []
+
+    regresiones = []
+
+    for medida in ("segundos", "memoria_mb"):
+        limite = baseline[medida] * (1 + tolerancia) + _MARGEN[medida]
+
+        if resultado[medida] > limite:
+            regresiones.append(f"{medida} {resultado[medida]} > {limite:.3f}")
+
+    if resultado["registros"] != baseline["registros"]:
+        regresiones.append(
+            f"registros {resultado['registros']} != {baseline['registros']}"
+        )
+
+    return regresiones
+
+
+def _leer_baselines() -> dict:
+    """
+    Devuelve las líneas base guardadas o un diccionario vacío si no existen.
+    """
+
+    if not os.path.exists(_BASELINES_PATH):
+        return {}
+
+    with open(_BASELINES_PATH, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _guardar_baselines(baselines: dict):
+    """
+    Guarda las líneas base en el archivo JSON.
+    """
+
+    with open(_BASELINES_PATH, "w", encoding="utf-8") as file:
+        json.dump(baselines, file, ensure_ascii=False, indent=2)
+
+
+def ejecutar(
+    anios: int = 25,
+    instituciones: int = 40,
+    repeticiones: int = 5,
+    tolerancia: float = 0.25,
+    guardar: bool = False,
+) -> bool:
+    """
+    Ejecuta el benchmark de todos los procesadores.
+
+    :param anios: Cantidad de años de los archivos del BCN y de los datos de la SIBOIF.
+    :param instituciones: Cantidad de instituciones de la CONAMI y de la SIBOIF.
+    :param repeticiones: Cantidad de ejecuciones para medir el tiempo.
+    :param tolerancia: Porcentaje permitido sobre la línea base (e.g. 0.25).
+    :param guardar: Guardar los resultados como nuevas líneas base.
+
+    :return: `True` si no hubo regresiones.
+    """
+
+    baselines = _leer_baselines()
+    regresiones_total = 0
+
+    print(
+        f"{'procesador':<56}{'segundos':>12}{'memoria_mb':>12}"
+        f"{'registros':>12}{'base_seg':>12}  estado"
+    )
+
+    with tempfile.TemporaryDirectory() as files_dir:
+        procesadores = _get_procesadores(files_dir, anios, instituciones)
+
+        for nombre, (funcion, escala) in procesadores.items():
+            resultado = _medir(funcion, repeticiones)
+            baseline = baselines.get(nombre)
+
+            regresiones = _comparar(resultado, baseline, escala, tolerancia)
+            regresiones_total += len(regresiones)
+
+            if guardar:
+                baselines[nombre] = {**resultado, "escala": escala}
+
+            if regresiones:
+                estado = "REGRESION: " + ", ".join(regresiones)
+            elif baseline and baseline.get("escala") == escala:
+                estado = "OK"
+            else:
+                estado = "sin línea base"
+
+            base_segundos = baseline["segundos"] if baseline else "-"
+
+            print(
+                f"{nombre[:55]:<56}{resultado['segundos']:>12.4f}"
+                f"{resultado['memoria_mb']:>12.3f}{resultado['registros']:>12}"
+                f"{base_segundos:>12}  {estado}"
+            )
+
+    if guardar:
+        _guardar_baselines(baselines)
+        print("Líneas base guardadas en", _BASELINES_PATH)
+
+    return regresiones_total == 0
+
+
+def main():
+    """
+    Función principal del benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark de los procesadores de archivos con datos sintéticos."
+    )
+
+    parser.add_argument(
+        "--anios", type=int, default=25, help="Años del BCN y de la SIBOIF."
+    )
+    parser.add_argument(
+        "--instituciones",
+        type=int,
+        default=40,
+        help="Instituciones de la CONAMI y de la SIBOIF.",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        type=int,
+        default=5,
+        help="Ejecuciones por procesador para medir el tiempo.",
+    )
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=0.25,
+        help="Porcentaje permitido sobre la línea base (por defecto 0.25).",
+    )
+    parser.add_argument(
+        "--guardar",
+        action="store_true",
+        help="Guardar los resultados como nuevas líneas base.",
+    )
+
+    args = parser.parse_args()
+
+    ok = ejecutar(
+        anios=args.anios,
+        instituciones=args.instituciones,
+        repeticiones=args.repeticiones,
+        tolerancia=args.tolerancia,
+        guardar=args.guardar,
+    )
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+Servidor HTTP local que simula los sitios del BCN, la SIBOIF y la CONAMI
+con datos sintéticos (ver `benchmarks.fixtures`).\n
+- BCN: archivos de `bcn.reportes` en la misma ruta de la url original.
+- SIBOIF: `GET /rest/estadisticas` con los filtros `fecha[min]` y `fecha[max]`
+  (con datos distintos para cada `intendencia` y `tipo_reporte`).
+- CONAMI: `GET /index.php/est-reportes` con el select `Periodo` y el `POST` de exportación.
+
+La latencia, el ancho de banda, la tasa de errores y el límite de peticiones
+(respuestas 429 con `Retry-After`) son configurables.\n
+Uso (desde el directorio `src`):\n
+    py -m benchmarks.servidor --puerto 8000 --latencia 0.2 --errores 0.05 --limite 5
+
+Y en `.env` (o en el entorno de la ejecución):\n
+    BCN_BASE_URL=http://127.0.0.1:8000
+    SIBOIF_BASE_URL=http://127.0.0.1:8000
+    CONAMI_BASE_URL=http://127.0.0.1:8000
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from benchmarks import fixtures
+from bcn.reportes import reportes_list
+from utils import add_months, meses_dict
+
+_SIBOIF_PATH = "/rest/estadisticas"
+_CONAMI_PATH = "/index.php/est-reportes"
+
+# Primer periodo publicado por la CONAMI
+_CONAMI_INICIO = (2018, 1)
+
+# Tamaño de los bloques de la respuesta para simular el ancho de banda
+_TAM_BLOQUE = 16 * 1024
+
+_NOMBRES_MESES = {mes: nombre for nombre, mes in meses_dict.items()}
+
+
+class _Configuracion:
+    """
+    Configuración y estado compartido del servidor.
+    """
+
+    def __init__(
+        self,
+        files_dir: str,
+        anios: int,
+        instituciones: int,
+        latencia: float,
+        variacion: float,
+        ancho_banda: float,
+        errores: float,
+        limite: int,
+    ):
+        self.latencia = latencia
+        self.variacion = variacion
+        self.ancho_banda = ancho_banda
+        self.errores = errores
+        self.limite = limite
+        self.instituciones = instituciones
+
+        self.lock = threading.Lock()
+        self.random_gen = random.Random(0)
+
+        # Peticiones del último segundo y contadores por origen
+        self.ventanas: dict[str, deque] = {}
+        self.contadores: dict[str, dict] = {}
+
+        # Archivos del BCN por ruta de la url original
+        rutas = fixtures.generar_bcn(files_dir, anios=anios)
+
+        self.bcn_files = {
+            urlsplit(reporte["url"]).path: rutas[reporte["file_name"]]
+            for reporte in reportes_list
+        }
+
+        # Periodos de la CONAMI con su identificador
+        self.conami_periodos = {}
+
+        year, month = _CONAMI_INICIO
+        periodo_id = 1
+
+        while year <= fixtures.ANIO_FINAL:
+            self.conami_periodos[periodo_id] = (year, month)
+            year, month = add_months(year, month, 1)
+            periodo_id += 1
+
+        self.conami_files: dict[int, bytes] = {}
+        self.files_dir = files_dir
+
+    def contar(self, origen: str, clave: str):
+        """
+        Incrementa el contador especificado del origen.
+        """
+
+        with self.lock:
+            contador = self.contadores.setdefault(
+                origen, {"peticiones": 0, "429": 0, "errores": 0}
+            )
+            contador[clave] += 1
+
+    def limitar(self, origen: str) -> bool:
+        """
+        Registra la petición del origen y devuelve `True` si supera el límite por segundo.
+        """
+
+        if not self.limite:
+            return False
+
+        ahora = time.monotonic()
+
+        with self.lock:
+            ventana = self.ventanas.setdefault(origen, deque())
+
+            while ventana and ahora - ventana[0] > 1:
+                ventana.popleft()
+
+            if len(ventana) >= self.limite:
+                return True
+
+            ventana.append(ahora)
+
+        return False
+
+    def fallar(self) -> bool:
+        """
+        Devuelve `True` si la petición debe responder con error, según la tasa de errores.
+        """
+
+        with self.lock:
+            return self.random_gen.random() < self.errores
+
+    def esperar(self):
+        """
+        Espera la latencia configurada con su variación aleatoria.
+        """
+
+        with self.lock:
+            variacion = self.random_gen.uniform(-self.variacion, self.variacion)
+
+        time.sleep(max(0.0, self.latencia + variacion))
+
+    def conami_file(self, periodo_id: int) -> bytes:
+        """
+        Devuelve el archivo `.xls` de la CONAMI del periodo, generándolo la primera vez.
+        """
+
+        with self.lock:
+            if periodo_id not in self.conami_files:
+                file_path = os.path.join(self.files_dir, f"ESF_{periodo_id}.xls")
+
+                fixtures.generar_conami(
+                    file_path, instituciones=self.instituciones, seed=periodo_id
+                )
+
+                with open(file_path, "rb") as file:
+                    self.conami_files[periodo_id] = file.read()
+
+            return self.conami_files[periodo_id]
+
+
+def _get_handler(config: _Configuracion):
+    """
+    Devuelve la clase que atiende las peticiones con la configuración especificada.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        """
+        Atiende las peticiones de los tres orígenes.
+        """
+
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            # No imprimir cada petición
+            pass
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            self._atender("GET")
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            self._atender("POST")
+
+        def _atender(self, method: str):
+            partes = urlsplit(self.path)
+
+            if partes.path == _SIBOIF_PATH:
+                origen = "SIBOIF"
+            elif partes.path == _CONAMI_PATH:
+                origen = "CONAMI"
+            else:
+                origen = "BCN"
+
+            # Leer el cuerpo para mantener la conexión utilizable
+            tam_body = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(tam_body).decode() if tam_body else ""
+
+            config.contar(origen, "peticiones")
+
+            if config.limitar(origen):
+                config.contar(origen, "429")
+                self._responder(429, b"Too Many Requests", headers={"Retry-After": "1"})
+                return
+
+            config.esperar()
+
+            if config.fallar():
+                config.contar(origen, "errores")
+                self._responder(503, b"Service Unavailable")
+                return
+
+            if origen == "SIBOIF":
+                self._siboif(parse_qs(partes.query))
+            elif origen == "CONAMI" and method == "POST":
+                self._conami_exportar(parse_qs(body))
+            elif origen == "CONAMI":
+                self._conami_pagina()
+            else:
+                self._bcn(partes.path)
+
+        def _responder(
+            self,
+            status: int,
+            content: bytes,
+            content_type: str = "text/plain",
+            headers: dict | None = None,
+        ):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+
+            self.end_headers()
+
+            # Enviar en bloques para simular el ancho de banda (bytes por segundo)
+            for inicio in range(0, len(content), _TAM_BLOQUE):
+                bloque = content[inicio : inicio + _TAM_BLOQUE]
+                self.wfile.write(bloque)
+
+                if config.ancho_banda:
+                    time.sleep(len(bloque) / config.ancho_banda)
+
+        def _bcn(self, path: str):
+            file_path = config.bcn_files.get(path)
+
+            if not file_path:
+                self._responder(404, b"Not Found")
+                return
+
+            with open(file_path, "rb") as file:
+                self._responder(200, file.read(), "application/vnd.ms-excel")
+
+        def _siboif(self, query: dict):
+            fecha_min = query.get("fecha[min]", [""])[0]
+            fecha_max = query.get("fecha[max]", [""])[0]
+
+            try:
+                year, month = (int(valor) for valor in fecha_min.split("-")[:2])
+                year_fin, month_fin = (int(valor) for valor in fecha_max.split("-")[:2])
+            except ValueError:
+                self._responder(400, b"Bad Request")
+                return
+
+            periodos = []
+
+            while (year, month) <= (year_fin, month_fin):
+                if year <= fixtures.ANIO_FINAL:
+                    periodos.append((year, month))
+
+                year, month = add_months(year, month, 1)
+
+            # Datos distintos para cada intendencia y tipo de reporte
+            seed = "{}-{}".format(
+                query.get("intendencia", [""])[0], query.get("tipo_reporte", [""])[0]
+            )
+
+            data = fixtures.generar_siboif(
+                periodos, instituciones=config.instituciones, seed=seed
+            )
+
+            self._responder(
+                200, json.dumps(data, ensure_ascii=False).encode(), "application/json"
+            )
+
+        def _conami_pagina(self):
+            opciones = "".join(
+                f'<option value="{periodo_id}">{_NOMBRES_MESES[month]} - {year}</option>'
+                for periodo_id, (year, month) in config.conami_periodos.items()
+            )
+
+            html = (
+                "<html><body>"
+                '<form id="reportForm" method="post">'
+                f'<select name="Periodo">{opciones}</select>'
+                '<select name="exportSelect"><option value="EXCEL">Excel</option></select>'
+                "</form></body></html>"
+            )
+
+            self._responder(200, html.encode(), "text/html; charset=utf-8")
+
+        def _conami_exportar(self, data: dict):
+            try:
+                periodo_id = int(data.get("Periodo", [""])[0])
+            except ValueError:
+                periodo_id = 0
+
+            if periodo_id not in config.conami_periodos:
+                self._responder(404, b"Not Found")
+                return
+
+            try:
+                content = config.conami_file(periodo_id)
+            except ImportError:
+                self._responder(501, b"xlwt no instalado")
+                return
+
+            self._responder(200, content, "application/vnd.ms-excel")
+
+    return Handler
+
+
+def main():
+    """
+    Función principal del servidor.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Servidor local con datos sintéticos del BCN, la SIBOIF y la CONAMI."
+    )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección del servidor.")
+    parser.add_argument("--puerto", type=int, default=8000, help="Puerto del servidor.")
+    parser.add_argument(
+        "--latencia",
+        type=float,
+        default=0.0,
+        help="Latencia de cada respuesta en segundos.",
+    )
+    parser.add_argument(
+        "--variacion",
+        type=float,
+        default=0.0,
+        help="Variación aleatoria de la latencia en segundos (+/-).",
+    )
+    parser.add_argument(
+        "--ancho-banda",
+        type=float,
+        default=0.0,
+        help="Ancho de banda por respuesta en KB/s (0 sin límite).",
+    )
+    parser.add_argument(
+        "--errores",
+        type=float,
+        default=0.0,
+        help="Proporción de respuestas 503 (e.g. 0.05).",
+    )
+    parser.add_argument(
+        "--limite",
+        type=int,
+        default=0,
+        help="Peticiones por segundo por origen antes de responder 429 (0 sin límite).",
+    )
+    parser.add_argument(
+        "--anios", type=int, default=25, help="Años de los archivos del BCN."
+    )
+    parser.add_argument(
+        "--instituciones",
+        type=int,
+        default=20,
+        help="Instituciones de la SIBOIF y de la CONAMI.",
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as files_dir:
+        config = _Configuracion(
+            files_dir,
+            anios=args.anios,
+            instituciones=args.instituciones,
+            latencia=args.latencia,
+            variacion=args.variacion,
+            ancho_banda=args.ancho_banda * 1024,
+            errores=args.errores,
+            limite=args.limite,
+        )
+
+        server = ThreadingHTTPServer((args.host, args.puerto), _get_handler(config))
+
+        print(f"Servidor en http://{args.host}:{args.puerto} (Ctrl+C para detener)")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+        # Resumen de las peticiones atendidas por origen
+        for origen, contador in config.contadores.items():
+            print(origen, contador)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Modulo para guardar el avance de las ejecuciones de todos los periodos.\n
+Cada bloque completado (origen y reporte o periodo) se guarda en el directorio
+`checkpoints/` y el avance se registra en `checkpoints/avance.json`, de modo que
+una ejecución interrumpida pueda reanudarse descargando solo los bloques faltantes:\n
+    py procesar.py todos --resume
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+
+_CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), "checkpoints")
+_AVANCE_FILE = os.path.join(_CHECKPOINT_DIR, "avance.json")
+
+_BLOQUES_KEY = "bloques"
+_INICIO_KEY = "inicio"
+
+# Estado de la ejecución actual
+_activo = False
+_avance: dict = {}
+_lock = threading.Lock()
+
+
+def _get_file_name(origen: str, bloque: str) -> str:
+    """
+    Devuelve el nombre del archivo donde se guarda el bloque especificado.
+    """
+
+    nombre = re.sub(r"[^\w]+", "_", f"{origen}_{bloque}", flags=re.ASCII)
+
+    return f"{nombre.strip('_')}.pkl"
+
+
+def _guardar_avance():
+    """
+    Escribe el archivo de avance de forma atómica.
+    """
+
+    temp_path = _AVANCE_FILE + ".tmp"
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(_avance, file, ensure_ascii=False, indent=2)
+
+    os.replace(temp_path, _AVANCE_FILE)
+
+
+def _cargar_avance() -> dict:
+    """
+    Lee el archivo de avance de una ejecución anterior.
+    """
+
+    if not os.path.exists(_AVANCE_FILE):
+        return {}
+
+    try:
+        with open(_AVANCE_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print("No se pudo leer el avance anterior:", e)
+        return {}
+
+
+def iniciar(reanudar: bool = False):
+    """
+    Activa el guardado de bloques para la ejecución actual.
+
+    :param reanudar: Si es `True` se conservan los bloques de la ejecución anterior,
+    de lo contrario se eliminan.
+    """
+
+    global _activo, _avance
+
+    os.makedirs(_CHECKPOINT_DIR, exist_ok=True)
+
+    avance = _cargar_avance() if reanudar else {}
+
+    if not avance:
+        limpiar()
+        avance = {_INICIO_KEY: datetime.now().isoformat(), _BLOQUES_KEY: {}}
+    else:
+        total = sum(len(bloques) for bloques in avance[_BLOQUES_KEY].values())
+        print("Reanudando ejecución del", avance[_INICIO_KEY])
+        print("Bloques completados:", total)
+
+    with _lock:
+        _avance = avance
+        _activo = True
+        _guardar_avance()
+
+
+def obtener(origen: str, bloque: str) -> Optional[pd.DataFrame]:
+    """
+    Devuelve el DataFrame guardado del bloque especificado,
+    o `None` si no se ha completado o no hay una ejecución activa.
+
+    :param origen: Origen de los datos (e.g. BCN).
+    :param bloque: Identificador del bloque dentro del origen (reporte o periodo).
+    """
+
+    if not _activo:
+        return None
+
+    file_name = _avance[_BLOQUES_KEY].get(origen, {}).get(bloque)
+
+    if not file_name:
+        return None
+
+    try:
+        return pd.read_pickle(os.path.join(_CHECKPOINT_DIR, file_name))
+    except (OSError, ValueError) as e:
+        print("No se pudo leer el bloque guardado:", origen, bloque, e)
+        return None
+
+
+def guardar(origen: str, bloque: str, df: pd.DataFrame):
+    """
+    Guarda el DataFrame del bloque completado y registra el avance.
+    No hace nada si no hay una ejecución activa.
+
+    :param origen: Origen de los datos (e.g. BCN).
+    :param bloque: Identificador del bloque dentro del origen (reporte o periodo).
+    :param df: DataFrame con los datos del bloque.
+    """
+
+    if not _activo:
+        return
+
+    file_name = _get_file_name(origen, bloque)
+    file_path = os.path.join(_CHECKPOINT_DIR, file_name)
+
+    # Escribir a un archivo temporal para no dejar bloques incompletos
+    df.to_pickle(file_path + ".tmp")
+    os.replace(file_path + ".tmp", file_path)
+
+    with _lock:
+        _avance[_BLOQUES_KEY].setdefault(origen, {})[bloque] = file_name
+        _guardar_avance()
+
+
+def limpiar():
+    """
+    Elimina los bloques guardados y finaliza la ejecución activa.
+    Se debe llamar luego de cargar los datos en la base de datos.
+    """
+
+    global _activo, _avance
+
+    with _lock:
+        _activo = False
+        _avance = {}
+
+    if not os.path.isdir(_CHECKPOINT_DIR):
+        return
+
+    for file_name in os.listdir(_CHECKPOINT_DIR):
+        os.remove(os.path.join(_CHECKPOINT_DIR, file_name))
@@ -4,4 +4,15 @@ Módulo para obtener datos de la **CONAMI**.\n
     pip install xlrd
 """
 
-from conami.main import get_all_periodos, get_last_periodo, get_periodo
+from conami.main import (
+    get_all_periodos,
+    get_last_periodo,
+    get_periodo,
+    get_rango_periodos,
+    get_periodos,
+    get_tareas_all_periodos,
+    get_tareas_last_periodo,
+    get_tareas_rango_periodos,
+    get_tareas_periodos,
+    get_workers,
+)
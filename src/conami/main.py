@@ -1,27 +1,51 @@
 """
 Módulo para obtener datos de la **CONAMI**.\n
+Cada reporte (ver `conami.reportes`) y periodo es una tarea independiente, de modo que
+las exportaciones de todos los reportes se descargan al mismo tiempo (ver `pipeline`).\n
 - Depende del paquete `xlrd` para leer archivos `.xls`:\n
     pip install xlrd
 """
 
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional
-import requests
 from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
-import xlrd
-from utils import meses_dict
+import archivos
+import descarga
+import excel
+import pipeline
+from conami.reportes import reportes_list, get_reportes
+from utils import parse_periodos
 
-_CONAMI_URL = "http://www.conami.gob.ni/index.php/est-reportes?reportName=/RptEstadisticas/RptEstadoSituacion&tituloreport=Estado de Situación Financiera&cat=Reportes Contables"
+_CONAMI_URL = "http://www.conami.gob.ni/index.php/est-reportes"
 
 _PERIODO_ID_KEY = "periodo_id"
 _PERIODO_MONTH_KEY = "month"
 _PERIODO_YEAR_KEY = "year"
 
+# Hilos de descarga por reporte, para que agregar reportes no multiplique la duración.
+# El total de peticiones se mantiene limitado por el ritmo de la CONAMI (ver `ritmo`).
+_WORKERS_REPORTE = 2
 
-def _get_periodos() -> list[dict]:
+
+def _get_url(reporte: dict) -> str:
+    """
+    Devuelve la url de la página del reporte en el portal de estadísticas.
     """
-    Devuelve una lista de los periodos disponibles.\n
+
+    return (
+        f"{_CONAMI_URL}?reportName={reporte['report_name']}"
+        f"&tituloreport={reporte['titulo']}&cat={reporte['categoria']}"
+    )
+
+
+def _get_periodos(reporte: Optional[dict] = None) -> list[dict]:
+    """
+    Devuelve una lista de los periodos disponibles del reporte.\n
     Ejemplo:\n
         [
             { "periodo_id": 1, "year": 2018, "month": 1 }
@@ -30,64 +54,57 @@ def _get_periodos() -> list[dict]:
     """
     periodos = []
 
-    response = requests.get(_CONAMI_URL, timeout=60)
+    response = descarga.get(_get_url(reporte or reportes_list[0]), "CONAMI", timeout=60)
 
-    # Si la respuesta no es satisfactoria devolver el diccionario vacío
+    # Si la respuesta no es satisfactoria generar error, para no confundirlo con una lista vacía
     if response.status_code != 200:
-        print(
-            "Error al consultar periodos en la página de la CONAMI:",
-            response.status_code,
+        raise descarga.ErrorDescarga(
+            f"Error al consultar periodos en la página de la CONAMI: {response.status_code}"
         )
-        return periodos
 
     soup = BeautifulSoup(response.content, "html.parser")
 
     # Obtener los options del select de periodos
     periodo_options = soup.select('form#reportForm select[name="Periodo"] option')
 
-    for option in periodo_options:
-        # Obtener el texto de cada opción, remplazando cualquier espacio en el texto
-        text = option.text.replace(" ", "")
-
-        # Obtener el mes y año haciendo un split del texto
-        month_name, year = text.split("-")
+    # Obtener el año y mes del texto de todas las opciones (e.g. "Enero - 2018")
+    years, months = parse_periodos((option.text for option in periodo_options), "mes")
 
-        # Obtener el numero del mes
-        month = meses_dict[month_name]
+    for option, year, month in zip(periodo_options, years, months):
+        # Omitir las opciones que no son un periodo
+        if np.isnan(year) or np.isnan(month):
+            continue
 
         # Llenar el diccionario, donde la key será el periodo_id y el value será la tuple (año, mes)
         periodos.append(
             {
                 _PERIODO_ID_KEY: int(option["value"]),
                 _PERIODO_YEAR_KEY: int(year),
-                _PERIODO_MONTH_KEY: month,
+                _PERIODO_MONTH_KEY: int(month),
             }
         )
 
     return periodos
 
 
-def _get_ultimo_periodo():
+def _get_catalogos(reportes: list[dict]) -> list[tuple[dict, list[dict]]]:
     """
-    Devuelve el último periodo disponible.
+    Devuelve cada reporte con su catálogo de periodos.\n
+    Los catálogos se consultan una sola vez por reporte y al mismo tiempo.
     """
 
-    periodos = _get_periodos()
+    with ThreadPoolExecutor(max_workers=max(len(reportes), 1)) as executor:
+        return list(zip(reportes, executor.map(_get_periodos, reportes)))
 
-    ultimo_periodo = max(periodos, key=lambda x: x[_PERIODO_ID_KEY])
-
-    if not ultimo_periodo:
-        return None
 
-    return ultimo_periodo
-
-
-def _get_periodo_id(year: int, month: int) -> int | None:
+def _get_periodo_id(
+    year: int, month: int, reporte: Optional[dict] = None
+) -> int | None:
     """
     Devuelve el identificador del periodo según el año y mes especificado.
     """
 
-    periodos = _get_periodos()
+    periodos = _get_periodos(reporte)
 
     for periodo in periodos:
         if periodo[_PERIODO_YEAR_KEY] == year and periodo[_PERIODO_MONTH_KEY] == month:
@@ -96,12 +113,14 @@ def _get_periodo_id(year: int, month: int) -> int | None:
     return None
 
 
-def _download_file_by_periodo_id(periodo_id: int):
+def _download_file_by_periodo_id(periodo_id: int, reporte: Optional[dict] = None):
     """
-    Descarga un archivo Excel con los datos de la CONAMI para el periodo especificado
-    y devuelve la ruta del archivo.
+    Descarga un archivo Excel con los datos del reporte de la CONAMI
+    para el periodo especificado y devuelve su contenido en memoria.
     """
 
+    reporte = reporte or reportes_list[0]
+
     current_dir = os.path.dirname(__file__)
     files_dir = os.path.join(current_dir, "files")
 
@@ -110,59 +129,115 @@ def _download_file_by_periodo_id(periodo_id: int):
         "exportSelect": "EXCEL",
         "parameters": "false",
         "exportName": "Reporte",
-        "reportName": "/RptEstadisticas/RptEstadoSituacion",
+        "reportName": reporte["report_name"],
     }
 
-    response = requests.post(_CONAMI_URL, data=payload, timeout=60)
+    response = descarga.post(_get_url(reporte), "CONAMI", data=payload, timeout=60)
 
-    # Si la respuesta no es satisfactoria devolver un valor vacío
+    # Si la respuesta no es satisfactoria la tarea se registra con error para reintentarla
     if response.status_code != 200:
-        print("Error al descargar reporte de la CONAMI:", response.status_code)
-        return None
-
-    # Crear el directorio para guardar los archivos descargados
-    os.makedirs(files_dir, exist_ok=True)
-
-    # Definir el nombre del archivo
-    file_path = os.path.join(files_dir, f"EstadoSituacionFinanciera_{periodo_id}.xls")
+        raise descarga.ErrorDescarga(
+            f"Error al descargar reporte de la CONAMI: {response.status_code}"
+        )
 
-    # Abrir archivo en modo de escritura binaria
-    with open(file_path, "wb") as file:
-        # Escribir el contenido de la respuesta al archivo
-        file.write(response.content)
+    # Guardar una copia del archivo sin esperar a que se escriba
+    file_name = f"{reporte['file_name']}_{periodo_id}.xls"
+    archivos.guardar(files_dir, file_name, response.content)
 
-    return file_path
+    # El contenido se procesa desde memoria, sin leerlo nuevamente del disco
+    return io.BytesIO(response.content)
 
 
-def _download_file(year: int, month: int):
+def _download_file(year: int, month: int, reporte: Optional[dict] = None):
     """
-    Descarga un archivo Excel con los datos de la CONAMI para el periodo especificado
-    y devuelve la ruta del archivo.
+    Descarga un archivo Excel con los datos del reporte de la CONAMI para el periodo
+    especificado y devuelve su contenido en memoria (`io.BytesIO`).
     """
 
-    periodo_id = _get_periodo_id(year, month)
+    periodo_id = _get_periodo_id(year, month, reporte)
 
     if not periodo_id:
         print("Periodo inválido:", year, month)
         return None
 
-    return _download_file_by_periodo_id(periodo_id)
+    return _download_file_by_periodo_id(periodo_id, reporte)
+
+
+def _process_instituciones_columnas(
+    df_data: pd.DataFrame, reporte: dict, columna_indicador: str
+) -> pd.DataFrame:
+    """
+    Procesa un reporte con una fila por cuenta y una columna por institución
+    y devuelve una fila por cuenta e institución con su valor.
+    """
+
+    columna_institucion = "INSTITUCION"
+    columna_valor = "VALOR"
+
+    # Eliminar columnas que no contengan valores
+    df_data.dropna(axis=1, how="all", inplace=True)
+
+    # Eliminar filas que no contengan valores
+    df_data.dropna(how="all", inplace=True)
+
+    # Eliminar columnas que no son instituciones (e.g. Total)
+    df_data.drop(reporte["columnas_omitir"], axis=1, inplace=True, errors="ignore")
+
+    # Renombrar columna de descripción
+    df_data.rename(
+        columns={reporte["columna_concepto"]: columna_indicador}, inplace=True
+    )
+
+    # Limpiar valores de la columna indicador
+    # y pasarlos a mayúsculas para generar consistencia en los datos a la hora de filtrar
+    df_data[columna_indicador] = df_data[columna_indicador].str.strip().str.upper()
+
+    # Filtro de variables a obtener (todas si no se especifican)
+    if reporte["conceptos"] is not None:
+        df_data = df_data[df_data[columna_indicador].isin(reporte["conceptos"])]
+
+    # Usar la función melt para hacer unpivot de las instituciones
+    df_data = pd.melt(
+        df_data,
+        id_vars=[columna_indicador],
+        var_name=columna_institucion,
+        value_name=columna_valor,
+    )
+
+    # Limpiar valores de la columna insitución
+    # y pasarlos a mayúsculas para generar consistencia en los datos a la hora de filtrar
+    df_data[columna_institucion] = df_data[columna_institucion].str.strip().str.upper()
+
+    return df_data
+
+
+# Procesador de cada disposición de los reportes (ver `conami.reportes`)
+_PROCESADORES = {
+    "instituciones_columnas": _process_instituciones_columnas,
+}
 
 
 def _process_file(
-    file_path: str, year: int, month: int, institucion: Optional[str] = None
+    file_path: str | io.BytesIO,
+    year: int,
+    month: int,
+    institucion: Optional[str] = None,
+    reporte: Optional[dict] = None,
 ):
     """
-    Procesa el archivo especificado y devuelve un DataFrame con los datos de la CONAMI
+    Procesa el archivo especificado (ruta o contenido en memoria)
+    y devuelve un DataFrame con los datos del reporte de la CONAMI
+    (por defecto el primero de la lista).
     """
 
+    reporte = reporte or reportes_list[0]
+
     columna_origen = "ORIGEN"
     columna_institucion = "INSTITUCION"
     columna_indicador = "INDICADOR"
     columna_anio = "ANIO"
     columna_mes = "MES"
     columna_valor = "VALOR"
-    variables_a_devolver = ("ACTIVO", "PASIVO", "PATRIMONIO")
 
     # Se define un DataFrame vacío para devolverlo en caso de algún problema
     df_empty = pd.DataFrame(
@@ -179,55 +254,22 @@ def _process_file(
     if not file_path:
         return df_empty
 
-    # Leer el archivo de la CONAMI directamente muestra el warning:
-    # WARNING *** file size (81856) not 512 + multiple of sector size (512)
-    # Para solucionar esto se lee directamente del WorkBook con xlrd
-    # https://github.com/pandas-dev/pandas/issues/16620
-    # df_data = pd.read_excel(file_path, skiprows=9)
-
-    # Suppressing XLRD warnings redirecting standard error outputs to null device
-    with open(os.devnull, "w", encoding="utf-8") as log:
-        wb = xlrd.open_workbook(file_path, logfile=log)
-
-    # Cargar los datos del reporte en un DataFrame, omitiendo las primeras nueve filas
-    df_data = pd.read_excel(wb, skiprows=9)
+    # Cargar los datos del reporte en un DataFrame, omitiendo las filas del título
+    # (`excel` descarta los avisos de xlrd sobre el tamaño del archivo)
+    df_data = excel.leer(file_path, skiprows=reporte["encabezado"])
 
     if df_data.empty:
         return df_empty
 
-    # Eliminar columnas que no contengan valores
-    df_data.dropna(axis=1, how="all", inplace=True)
-
-    # Eliminar filas que no contengan valores
-    df_data.dropna(how="all", inplace=True)
-
-    # Eliminar columna Total
-    df_data.drop("Total", axis=1, inplace=True)
-
-    # Renombrar columna de descripción
-    df_data.rename(columns={"Descripcion de Cuenta": columna_indicador}, inplace=True)
+    df_data = _PROCESADORES[reporte["disposicion"]](df_data, reporte, columna_indicador)
 
-    # Limpiar valores de la columna indicador
-    # y pasarlos a mayúsculas para generar consistencia en los datos a la hora de filtrar
-    df_data[columna_indicador] = df_data[columna_indicador].str.strip().str.upper()
-
-    # Filtro de variables a obtener
-    filtro_variables = df_data[columna_indicador].isin(variables_a_devolver)
-
-    # Aplicar filtro de variables
-    df_data = df_data[filtro_variables]
-
-    # Usar la función melt para hacer unpivot de las instituciones
-    df_data = pd.melt(
-        df_data,
-        id_vars=[columna_indicador],
-        var_name=columna_institucion,
-        value_name=columna_valor,
-    )
+    # Nombre del indicador de cada cuenta distinta
+    indicadores = {
+        concepto: reporte["indicador"].format(concepto=concepto)
+        for concepto in df_data[columna_indicador].unique()
+    }
 
-    # Limpiar valores de la columna insitución
-    # y pasarlos a mayúsculas para generar consistencia en los datos a la hora de filtrar
-    df_data[columna_institucion] = df_data[columna_institucion].str.strip().str.upper()
+    df_data[columna_indicador] = df_data[columna_indicador].map(indicadores)
 
     # Filtrar la institución si se especifica
     if institucion:
@@ -259,58 +301,179 @@ def _process_file(
     return df_data
 
 
-def get_all_periodos():
+def _get_tareas(catalogos: list[tuple[dict, list[dict]]]) -> list[dict]:
+    """
+    Devuelve una tarea por cada reporte y periodo de su catálogo.\n
+    Las tareas se intercalan por periodo, de modo que los hilos de descarga
+    exportan todos los reportes al mismo tiempo.
     """
-    Devuelve un DataFrame con los datos de la CONAMI de todos los periodos disponibles.
 
-    :return: pandas DataFrame
+    tareas = []
+
+    for reporte, periodos in catalogos:
+        for periodo in periodos:
+            periodo_id, year, month = periodo.values()
+
+            tarea = {
+                "origen": "CONAMI",
+                "nombre": f"{reporte['name']} {year}{month:02d}",
+                "descargar": partial(_download_file_by_periodo_id, periodo_id, reporte),
+                "procesar": partial(
+                    _process_file, year=year, month=month, reporte=reporte
+                ),
+            }
+
+            tareas.append(((year, month), tarea))
+
+    # El orden es estable, por lo que los reportes mantienen su orden en cada periodo
+    tareas.sort(key=lambda item: item[0])
+
+    return [tarea for _, tarea in tareas]
+
+
+def get_workers() -> int:
     """
+    Devuelve la cantidad de hilos de descarga según los reportes a procesar.
 
-    df = pd.DataFrame()
+    :raises ValueError: Si se especifica un reporte que no existe.
+    """
 
-    periodos = _get_periodos()
+    return _WORKERS_REPORTE * len(get_reportes())
 
-    for periodo in periodos:
-        periodo_id, year, month = periodo.values()
 
-        print("Procesando periodo:", year, month)
+def get_tareas_all_periodos():
+    """
+    Devuelve las tareas para obtener los datos de la CONAMI de todos los periodos disponibles.
+    """
+
+    return _get_tareas(_get_catalogos(get_reportes()))
 
-        file_path = _download_file_by_periodo_id(periodo_id)
 
-        df_data = _process_file(file_path, year, month)
+def get_tareas_last_periodo():
+    """
+    Devuelve las tareas para obtener los datos de la CONAMI del último periodo disponible
+    de cada reporte.
+    """
 
-        # Concatenar los DataFrames
-        df = pd.concat([df, df_data], ignore_index=True)
+    catalogos = []
 
-    return df
+    for reporte, periodos in _get_catalogos(get_reportes()):
+        if not periodos:
+            continue
 
+        periodo = max(periodos, key=lambda x: x[_PERIODO_ID_KEY])
 
-def get_last_periodo():
+        print(
+            f"{reporte['name']} último periodo:",
+            periodo[_PERIODO_YEAR_KEY],
+            periodo[_PERIODO_MONTH_KEY],
+        )
+
+        catalogos.append((reporte, [periodo]))
+
+    return _get_tareas(catalogos)
+
+
+def get_tareas_rango_periodos(
+    year_ini: int,
+    month_ini: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+):
     """
-    Devuelve un DataFrame con los datos de la CONAMI del último periodo disponible.
+    Devuelve las tareas para obtener los datos de la CONAMI del rango de periodos especificado.
+    El catálogo de periodos se consulta una sola vez por reporte.
 
-    :return: pandas DataFrame
+    :param year_ini: Año del periodo inicial.
+    :param month_ini: Mes del periodo inicial (1-12).
+    :param year_fin: Año del periodo final (opcional, por defecto el último disponible).
+    :param month_fin: Mes del periodo final (opcional).
     """
 
-    df = pd.DataFrame()
+    desde = year_ini * 100 + month_ini
+    hasta = year_fin * 100 + month_fin if year_fin and month_fin else None
 
-    periodo = _get_ultimo_periodo()
+    catalogos = []
 
-    if not periodo:
-        return df
+    for reporte, catalogo in _get_catalogos(get_reportes()):
+        periodos = []
 
-    periodo_id, year, month = periodo.values()
+        for periodo in catalogo:
+            valor = periodo[_PERIODO_YEAR_KEY] * 100 + periodo[_PERIODO_MONTH_KEY]
 
-    print("Último periodo:", year, month)
+            # Omitir los periodos fuera del rango
+            if valor < desde or (hasta and valor > hasta):
+                continue
 
-    file_path = _download_file_by_periodo_id(periodo_id)
+            periodos.append(periodo)
 
-    df_data = _process_file(file_path, year, month)
+        catalogos.append((reporte, periodos))
 
-    return df_data
+    return _get_tareas(catalogos)
+
+
+def get_tareas_periodos(periodos: list[tuple[int, int]]):
+    """
+    Devuelve las tareas para obtener los datos de la CONAMI de los periodos especificados.
+    El catálogo de periodos se consulta una sola vez por reporte.
+
+    :param periodos: Lista de periodos (año, mes).
+    """
+
+    periodos_set = set(periodos)
+
+    catalogos = []
+
+    for reporte, catalogo in _get_catalogos(get_reportes()):
+        catalogo = [
+            periodo
+            for periodo in catalogo
+            if (periodo[_PERIODO_YEAR_KEY], periodo[_PERIODO_MONTH_KEY]) in periodos_set
+        ]
+
+        encontrados = {
+            (periodo[_PERIODO_YEAR_KEY], periodo[_PERIODO_MONTH_KEY])
+            for periodo in catalogo
+        }
+
+        for year, month in sorted(periodos_set - encontrados):
+            print(f"{reporte['name']} periodo inválido:", year, month)
+
+        catalogos.append((reporte, catalogo))
 
+    return _get_tareas(catalogos)
 
-def get_periodo(year: int, month: int, institucion: Optional[str] = None):
+
+def get_all_periodos():
+    """
+    Devuelve un DataFrame con los datos de la CONAMI de todos los periodos disponibles.
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("CONAMI", get_tareas_all_periodos)
+
+
+def get_last_periodo():
+    """
+    Devuelve un DataFrame con los datos de la CONAMI del último periodo disponible.
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("CONAMI", get_tareas_last_periodo)
+
+
+def get_periodo(
+    year: int,
+    month: int,
+    institucion: Optional[str] = None,
+    reporte: Optional[dict] = None,
+):
     """
     Devuelve un DataFrame con los datos de la CONAMI para el periodo especificado,
     filtrado opcionalmente por institución.
@@ -318,13 +481,54 @@ def get_periodo(year: int, month: int, institucion: Optional[str] = None):
     :param year: Año del periodo.
     :param month: Mes del periodo (1-12).
     :param institucion: Nombre de la institución (opcional).
+    :param reporte: Especificación del reporte (opcional, por defecto el primero de la lista).
 
     :return: pandas DataFrame
     """
 
     # Descargar el archivo
-    file_path = _download_file(year, month)
+    file_path = _download_file(year, month, reporte)
 
-    df_data = _process_file(file_path, year, month, institucion)
+    df_data = _process_file(file_path, year, month, institucion, reporte)
 
     return df_data
+
+
+def get_rango_periodos(
+    year_ini: int,
+    month_ini: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+):
+    """
+    Devuelve un DataFrame con los datos de la CONAMI para el rango de periodos especificado.\n
+    El catálogo de periodos se consulta una sola vez.
+
+    :param year_ini: Año del periodo inicial.
+    :param month_ini: Mes del periodo inicial (1-12).
+    :param year_fin: Año del periodo final (opcional, por defecto el último disponible).
+    :param month_fin: Mes del periodo final (opcional).
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    plan = partial(get_tareas_rango_periodos, year_ini, month_ini, year_fin, month_fin)
+
+    return pipeline.obtener("CONAMI", plan)
+
+
+def get_periodos(periodos: list[tuple[int, int]]):
+    """
+    Devuelve un DataFrame con los datos de la CONAMI para los periodos especificados.\n
+    El catálogo de periodos se consulta una sola vez.
+
+    :param periodos: Lista de periodos (año, mes).
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("CONAMI", partial(get_tareas_periodos, periodos))
@@ -0,0 +1,70 @@
+"""
+Modulo con la lista de reportes de la CONAMI a procesar.\n
+Todos los reportes del portal de estadísticas usan el mismo select `Periodo`
+y el mismo formulario de exportación, y se describen con:\n
+- `name`: nombre corto del reporte, usado en el nombre de las tareas.
+- `report_name`, `titulo` y `categoria`: parámetros `reportName`, `tituloreport` y `cat`
+  del reporte en el portal.
+- `file_name`: prefijo del archivo guardado (se agrega el identificador del periodo).
+- `disposicion`: disposición de los datos en el archivo, que define el procesador
+  (ver `conami.main`).
+- `encabezado`: filas a omitir antes de los nombres de las columnas.
+- `columna_concepto`: columna con los nombres de las cuentas.
+- `columnas_omitir`: columnas que no son instituciones (e.g. Total).
+- `conceptos`: cuentas a cargar (`None` para todas).
+- `indicador`: nombre del indicador, donde `{concepto}` se reemplaza por cada cuenta.
+  Los reportes nuevos deben incluir el nombre del reporte para no mezclar
+  sus indicadores con los de otros reportes.
+
+Los reportes a procesar se pueden limitar con la variable de entorno:\n
+    CONAMI_REPORTES=ESF
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Lista de reportes a procesar
+reportes_list = [
+    {
+        "name": "ESF",
+        "report_name": "/RptEstadisticas/RptEstadoSituacion",
+        "titulo": "Estado de Situación Financiera",
+        "categoria": "Reportes Contables",
+        "file_name": "EstadoSituacionFinanciera",
+        "disposicion": "instituciones_columnas",
+        "encabezado": 9,
+        "columna_concepto": "Descripcion de Cuenta",
+        "columnas_omitir": ["Total"],
+        "conceptos": ["ACTIVO", "PASIVO", "PATRIMONIO"],
+        "indicador": "{concepto}",
+    },
+]
+
+
+def get_reportes() -> list[dict]:
+    """
+    Devuelve los reportes a procesar: los de la variable de entorno `CONAMI_REPORTES`
+    (nombres separados por comas) o todos los de la lista.
+
+    :raises ValueError: Si se especifica un reporte que no existe.
+    """
+
+    nombres = [
+        nombre.strip()
+        for nombre in os.getenv("CONAMI_REPORTES", "").split(",")
+        if nombre.strip()
+    ]
+
+    if not nombres:
+        return reportes_list
+
+    reportes = {reporte["name"]: reporte for reporte in reportes_list}
+
+    faltantes = [nombre for nombre in nombres if nombre not in reportes]
+
+    if faltantes:
+        raise ValueError(f"Reportes de la CONAMI no existen: {', '.join(faltantes)}")
+
+    return [reportes[nombre] for nombre in nombres]
@@ -0,0 +1,370 @@
+"""
+Modulo para consultar las series de indicadores del DW sin escribir SQL.\n
+Uso:\n
+    import consultas
+
+    # Serie mensual del indicador, una columna por institución
+    df = consultas.get_series("ACTIVO", desde=(2020, 1), hasta=(2024, 12))
+
+    # Datos de varios indicadores en formato largo (columnas del dataset)
+    df = consultas.get_panel(indicadores=["ACTIVO", "PASIVO"], origenes=["SIBOIF"])
+
+- Los valores se leen por columnas con `fetchmany` en arreglos de NumPy, con los
+  identificadores de las dimensiones, y los nombres se asignan al final con las
+  dimensiones (tablas pequeñas) en lugar de leerlos en cada fila.
+- Los resultados se guardan en una caché LRU que se invalida cuando se registra una
+  carga nueva en la tabla `Carga` (al final de cada actualización del DW).
+  La última carga se revisa como máximo una vez cada `CONSULTAS_INTERVALO` segundos,
+  de modo que las consultas repetidas no llegan a la base de datos.
+
+Usa el backend de `bd` (`DB_BACKEND`). La caché se configura con las variables de entorno:\n
+    CONSULTAS_CACHE=128
+    CONSULTAS_INTERVALO=30
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+import bd
+import metricas
+
+load_dotenv()
+
+# Cantidad de consultas guardadas en la caché
+_TAM_CACHE = int(os.getenv("CONSULTAS_CACHE") or 128)
+
+# Segundos entre cada revisión de la última carga
+_INTERVALO_LOTE = float(os.getenv("CONSULTAS_INTERVALO") or 30)
+
+# Filas leídas en cada llamada a fetchmany
+_TAM_FETCH = 10_000
+
+# Columnas del dataset, en orden (igual que `exportacion.COLUMNAS`)
+COLUMNAS = ["ORIGEN", "INSTITUCION", "INDICADOR", "ANIO", "MES", "VALOR"]
+
+# Tabla de cada dimensión y columna de la consulta de valores
+_DIMENSIONES = {
+    "ORIGEN": ("Origen", "IdOrigen"),
+    "INSTITUCION": ("Institucion", "IdInstitucion"),
+    "INDICADOR": ("Indicador", "IdIndicador"),
+}
+
+# Los nombres de las tablas no tienen esquema para usarse en SQL Server (dbo) y SQLite
+_CONSULTA_VALORES = """
+    SELECT V.IdOrigen, V.IdInstitucion, V.IdIndicador, P.Anio, P.Mes, CAST(V.Monto AS float)
+    FROM Valor AS V
+    INNER JOIN Periodo AS P
+        ON V.IdPeriodo = P.IdPeriodo"""
+
+# Tipos de las columnas de la consulta de valores
+_TIPOS_VALORES = ["int64", "int64", "int64", "int64", "int64", "float64"]
+
+# Estado de la caché
+_cache: OrderedDict = OrderedDict()
+_lote = None
+_lote_revisado = float("-inf")
+_lock = threading.Lock()
+
+
+def _fetch_columnas(cursor, tipos: list[str]) -> list[np.ndarray]:
+    """
+    Lee el resultado del cursor por bloques y devuelve un arreglo de NumPy por columna.
+    """
+
+    bloques = [[] for _ in tipos]
+
+    while True:
+        rows = cursor.fetchmany(_TAM_FETCH)
+
+        if not rows:
+            break
+
+        for bloque, columna, tipo in zip(bloques, zip(*rows), tipos):
+            bloque.append(np.array(columna, dtype=tipo))
+
+    return [
+        np.concatenate(bloque) if bloque else np.empty(0, dtype=tipo)
+        for bloque, tipo in zip(bloques, tipos)
+    ]
+
+
+def _leer_dimensiones(conn) -> dict:
+    """
+    Devuelve, por cada dimensión, el nombre de cada identificador (arreglo indexado por Id)
+    y el identificador de cada nombre.
+    """
+
+    dimensiones = {}
+    cursor = conn.cursor()
+
+    for columna, (tabla, id_columna) in _DIMENSIONES.items():
+        cursor.execute(f"SELECT {id_columna}, Nombre FROM {tabla}")
+        ids, nombres = _fetch_columnas(cursor, ["int64", object])
+
+        # Arreglo para asignar los nombres a los identificadores con un solo `take`
+        por_id = np.empty(ids.max() + 1 if ids.size else 0, dtype=object)
+        por_id[ids] = nombres
+
+        dimensiones[columna] = (por_id, dict(zip(nombres.tolist(), ids.tolist())))
+
+    return dimensiones
+
+
+def _leer_lote(conn):
+    """
+    Devuelve el identificador de la última carga del DW.
+    """
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(IdCarga) FROM Carga")
+
+    return cursor.fetchone()[0]
+
+
+def _revisar_lote(conn):
+    """
+    Vacía la caché si se registró una carga nueva desde la última revisión.
+    """
+
+    global _lote, _lote_revisado
+
+    lote = _leer_lote(conn)
+
+    with _lock:
+        _lote_revisado = time.monotonic()
+
+        if lote != _lote:
+            _cache.clear()
+            _lote = lote
+
+
+def _leer_valores(conn, clave: tuple, dimensiones: dict) -> pd.DataFrame:
+    """
+    Lee los valores de la consulta especificada.
+    """
+
+    origenes, instituciones, indicadores, desde, hasta = clave
+
+    condiciones = []
+    parametros = []
+
+    for columna, nombres in (
+        ("ORIGEN", origenes),
+        ("INSTITUCION", instituciones),
+        ("INDICADOR", indicadores),
+    ):
+        if nombres is None:
+            continue
+
+        _, por_nombre = dimensiones[columna]
+        ids = [por_nombre[nombre] for nombre in nombres if nombre in por_nombre]
+
+        # Ninguno de los nombres existe en la dimensión
+        if not ids:
+            return pd.DataFrame(columns=COLUMNAS)
+
+        condiciones.append(
+            f"V.{_DIMENSIONES[columna][1]} IN ({', '.join('?' * len(ids))})"
+        )
+        parametros.extend(ids)
+
+    # IdPeriodo es el año y mes (yyyymm): el filtro usa el índice y, en el diseño
+    # PARTICIONADO, lee solo las particiones de los años consultados
+    if desde:
+        condiciones.append("V.IdPeriodo >= ?")
+        parametros.append(desde[0] * 100 + desde[1])
+
+    if hasta:
+        condiciones.append("V.IdPeriodo <= ?")
+        parametros.append(hasta[0] * 100 + hasta[1])
+
+    query = _CONSULTA_VALORES
+
+    if condiciones:
+        query += "\n    WHERE " + "\n        AND ".join(condiciones)
+
+    cursor = conn.cursor()
+    cursor.execute(query, parametros)
+
+    ids_origen, ids_institucion, ids_indicador, anios, meses, valores = _fetch_columnas(
+        cursor, _TIPOS_VALORES
+    )
+
+    df = pd.DataFrame(
+        {
+            "ORIGEN": dimensiones["ORIGEN"][0].take(ids_origen),
+            "INSTITUCION": dimensiones["INSTITUCION"][0].take(ids_institucion),
+            "INDICADOR": dimensiones["INDICADOR"][0].take(ids_indicador),
+            "ANIO": anios,
+            "MES": meses,
+            "VALOR": valores,
+        }
+    )
+
+    return df.sort_values(COLUMNAS[:5], ignore_index=True)
+
+
+def _consultar(clave: tuple) -> pd.DataFrame:
+    """
+    Devuelve los valores de la consulta desde la caché o la base de datos.
+    """
+
+    with _lock:
+        vencido = time.monotonic() - _lote_revisado >= _INTERVALO_LOTE
+
+        if not vencido and clave in _cache:
+            _cache.move_to_end(clave)
+            return _cache[clave]
+
+    with metricas.medir("consulta") as medicion, closing(bd.conectar()) as conn:
+        if vencido:
+            _revisar_lote(conn)
+
+        with _lock:
+            if clave in _cache:
+                _cache.move_to_end(clave)
+                medicion.agregar(cache=True)
+                return _cache[clave]
+
+            lote = _lote
+
+        # Las dimensiones se leen en cada consulta para incluir los nombres nuevos
+        df = _leer_valores(conn, clave, _leer_dimensiones(conn))
+
+        medicion.agregar(cache=False, registros=df.shape[0])
+
+    with _lock:
+        # No guardar resultados de una carga anterior si otra consulta ya invalidó la caché
+        if lote == _lote:
+            _cache[clave] = df
+
+            if len(_cache) > _TAM_CACHE:
+                _cache.popitem(last=False)
+
+    return df
+
+
+def _normalizar(nombres: Optional[Iterable[str] | str]) -> tuple | None:
+    """
+    Devuelve los nombres como una tupla ordenada, para usarlos en la llave de la caché.
+    """
+
+    if nombres is None:
+        return None
+
+    if isinstance(nombres, str):
+        nombres = [nombres]
+
+    return tuple(sorted(set(nombres)))
+
+
+def get_panel(
+    indicadores: Optional[Iterable[str]] = None,
+    instituciones: Optional[Iterable[str]] = None,
+    origenes: Optional[Iterable[str]] = None,
+    desde: Optional[tuple[int, int]] = None,
+    hasta: Optional[tuple[int, int]] = None,
+) -> pd.DataFrame:
+    """
+    Devuelve los valores de los indicadores en formato largo.
+
+    :param indicadores: Indicadores a consultar (opcional, por defecto todos).
+    :param instituciones: Instituciones a consultar (opcional, por defecto todas).
+    :param origenes: Orígenes a consultar (opcional, por defecto todos).
+    :param desde: Periodo inicial (año, mes) (opcional).
+    :param hasta: Periodo final (año, mes) (opcional).
+
+    :return: DataFrame con las columnas del dataset, ordenado por origen, institución,
+    indicador y periodo.
+    """
+
+    clave = (
+        _normalizar(origenes),
+        _normalizar(instituciones),
+        _normalizar(indicadores),
+        tuple(desde) if desde else None,
+        tuple(hasta) if hasta else None,
+    )
+
+    # Copia para no modificar el resultado guardado en la caché
+    return _consultar(clave).copy()
+
+
+def get_series(
+    indicador: str,
+    institucion: Optional[str] = None,
+    desde: Optional[tuple[int, int]] = None,
+    hasta: Optional[tuple[int, int]] = None,
+    origen: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Devuelve la serie mensual del indicador, con una columna por institución.
+
+    :param indicador: Nombre del indicador.
+    :param institucion: Institución a consultar (opcional, por defecto todas).
+    :param desde: Periodo inicial (año, mes) (opcional).
+    :param hasta: Periodo final (año, mes) (opcional).
+    :param origen: Origen del indicador (opcional), si varios orígenes usan el mismo nombre.
+
+    :return: DataFrame con índice mensual (`PERIODO`) y una columna por institución.
+    """
+
+    df = get_panel(
+        indicadores=indicador,
+        instituciones=institucion,
+        origenes=origen,
+        desde=desde,
+        hasta=hasta,
+    )
+
+    periodos = pd.PeriodIndex.from_fields(year=df["ANIO"], month=df["MES"], freq="M")
+
+    series = df.assign(PERIODO=periodos).pivot(
+        index="PERIODO", columns="INSTITUCION", values="VALOR"
+    )
+    series.columns.name = None
+
+    return series
+
+
+def get_lote():
+    """
+    Devuelve el identificador de la última carga del DW.
+    """
+
+    with closing(bd.conectar()) as conn:
+        return _leer_lote(conn)
+
+
+def get_lote_vigente():
+    """
+    Devuelve la última carga conocida por la caché, revisándola en la base de datos
+    como máximo una vez cada `CONSULTAS_INTERVALO` segundos.
+    """
+
+    with _lock:
+        if time.monotonic() - _lote_revisado < _INTERVALO_LOTE:
+            return _lote
+
+    with closing(bd.conectar()) as conn:
+        _revisar_lote(conn)
+
+    return _lote
+
+
+def invalidar():
+    """
+    Vacía la caché de las consultas.
+    """
+
+    global _lote_revisado
+
+    with _lock:
+        _cache.clear()
+        _lote_revisado = float("-inf")
@@ -0,0 +1,161 @@
+"""
+Modulo para calcular indicadores derivados de las series procesadas,
+que se cargan como indicadores propios en lugar de calcularse en cada consulta.\n
+Transformaciones disponibles (ver `TRANSFORMACIONES`):\n
+- `variacion_mensual`: variación porcentual respecto al mes anterior.
+- `variacion_interanual`: variación porcentual respecto al mismo periodo del año anterior
+  (mensual o trimestral).
+- `suma_12_meses`: suma de los últimos 12 meses (solo con 12 meses consecutivos).
+- `trimestral`: suma de los meses de cada trimestre completo.
+- `anual`: suma de los periodos de cada año completo (12 meses o 4 trimestres),
+  asignada a diciembre.
+
+Las agregaciones por frecuencia se hacen con `frecuencias.remuestrear`.
+
+Los cálculos se hacen por serie (origen, institución e indicador) con operaciones
+vectorizadas y comparan periodos, no filas, de modo que los periodos faltantes
+no generan valores incorrectos.
+"""
+
+from functools import partial
+import pandas as pd
+import frecuencias
+
+# Columnas que identifican una serie
+_SERIE = ["ORIGEN", "INSTITUCION", "INDICADOR"]
+
+# Columnas del dataset, en orden
+_COLUMNAS = ["ORIGEN", "INSTITUCION", "INDICADOR", "ANIO", "MES", "VALOR"]
+
+
+def _get_periodos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame ordenado por serie y periodo, con el número de mes absoluto
+    de cada periodo (`_PERIODO`).
+    """
+
+    return df.assign(
+        _PERIODO=df["ANIO"].astype(int) * 12 + df["MES"].astype(int) - 1
+    ).sort_values(_SERIE + ["_PERIODO"], ignore_index=True)
+
+
+def _resultado(df: pd.DataFrame, periodos: pd.Series, valores: pd.Series):
+    """
+    Devuelve las filas del dataset con los valores calculados (sin valores vacíos).
+    """
+
+    df = pd.DataFrame(
+        {
+            "ORIGEN": df["ORIGEN"],
+            "INSTITUCION": df["INSTITUCION"],
+            "INDICADOR": df["INDICADOR"],
+            "ANIO": periodos // 12,
+            "MES": periodos % 12 + 1,
+            "VALOR": valores,
+        }
+    )
+
+    return df[df["VALOR"].notna()]
+
+
+def _variacion(df: pd.DataFrame, meses: int) -> pd.DataFrame:
+    """
+    Variación porcentual de cada periodo respecto al periodo `meses` meses antes.
+    """
+
+    anterior = df[_SERIE + ["_PERIODO", "VALOR"]].assign(
+        _PERIODO=df["_PERIODO"] + meses
+    )
+
+    df = df.merge(anterior, on=_SERIE + ["_PERIODO"], suffixes=("", "_ANTERIOR"))
+
+    # Sin variación cuando el valor anterior es cero
+    anteriores = df["VALOR_ANTERIOR"].where(df["VALOR_ANTERIOR"] != 0)
+
+    # Dos decimales, la escala de Monto (numeric(20,2)) en la base de datos
+    return _resultado(
+        df, df["_PERIODO"], (df["VALOR"] / anteriores - 1).mul(100).round(2)
+    )
+
+
+def _suma_12_meses(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Suma de los últimos 12 meses de cada periodo con 12 meses consecutivos.
+    """
+
+    df = df.assign(_ACUMULADO=df.groupby(_SERIE, sort=False)["VALOR"].cumsum())
+    series = df.groupby(_SERIE, sort=False)
+
+    # 12 filas consecutivas deben abarcar exactamente 12 meses
+    consecutivos = df["_PERIODO"] - series["_PERIODO"].shift(11) == 11
+
+    valores = (df["_ACUMULADO"] - series["_ACUMULADO"].shift(12).fillna(0)).where(
+        consecutivos
+    )
+
+    return _resultado(df, df["_PERIODO"], valores)
+
+
+# Nombre del indicador y función de cada transformación
+TRANSFORMACIONES = {
+    "variacion_mensual": (
+        "{indicador} - Var. mensual (%)",
+        partial(_variacion, meses=1),
+    ),
+    "variacion_interanual": (
+        "{indicador} - Var. interanual (%)",
+        partial(_variacion, meses=12),
+    ),
+    "suma_12_meses": ("{indicador} - Acumulado 12 meses", _suma_12_meses),
+    "trimestral": (
+        "{indicador} - Trimestral",
+        partial(frecuencias.remuestrear, frecuencia="trimestral"),
+    ),
+    "anual": (
+        "{indicador} - Anual",
+        partial(frecuencias.remuestrear, frecuencia="anual"),
+    ),
+}
+
+
+def calcular(df: pd.DataFrame, transformaciones: list[str]) -> pd.DataFrame:
+    """
+    Calcula los indicadores derivados de todas las series del DataFrame.
+
+    :param df: DataFrame con las columnas del dataset.
+    :param transformaciones: Nombres de las transformaciones (ver `TRANSFORMACIONES`).
+
+    :return: DataFrame con las columnas del dataset y solo los indicadores derivados.
+    :raises ValueError: Si una transformación no existe.
+    """
+
+    faltantes = [t for t in transformaciones if t not in TRANSFORMACIONES]
+
+    if faltantes:
+        raise ValueError(f"Transformaciones no existen: {', '.join(faltantes)}")
+
+    if df.empty or not transformaciones:
+        return pd.DataFrame(columns=_COLUMNAS)
+
+    df = _get_periodos(df[_COLUMNAS])
+
+    derivados = []
+
+    for transformacion in transformaciones:
+        nombre, funcion = TRANSFORMACIONES[transformacion]
+
+        df_derivado = funcion(df)
+
+        # Nombre de cada indicador derivado, calculado una sola vez por indicador
+        indicadores = {
+            indicador: nombre.format(indicador=indicador)
+            for indicador in df_derivado["INDICADOR"].unique()
+        }
+
+        derivados.append(
+            df_derivado.assign(INDICADOR=df_derivado["INDICADOR"].map(indicadores))
+        )
+
+    df = pd.concat(derivados, ignore_index=True)
+
+    return df.astype({"ANIO": int, "MES": int, "VALOR": float})[_COLUMNAS]
@@ -0,0 +1,143 @@
+"""
+Modulo con las peticiones HTTP compartidas por los orígenes.\n
+Registra el tamaño y la latencia de cada petición en las métricas de la ejecución.\n
+Las peticiones de cada origen comparten una sesión con un pool de conexiones,
+de modo que las descargas en paralelo reutilizan las conexiones (y las cookies) del sitio.\n
+La url base de cada origen se puede reemplazar con variables de entorno
+(e.g. para usar el servidor local de `benchmarks.servidor`):\n
+    BCN_BASE_URL=http://127.0.0.1:8000
+    SIBOIF_BASE_URL=http://127.0.0.1:8000
+    CONAMI_BASE_URL=http://127.0.0.1:8000
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+import metricas
+import ritmo
+
+load_dotenv()
+
+# Intentos de una petición cuando el servidor responde 429 o 503
+INTENTOS_SATURACION = 3
+
+# Conexiones que se mantienen abiertas por servidor en la sesión de cada origen
+TAM_POOL = 10
+
+# Url base configurada por origen
+_BASE_URLS = {
+    origen: os.getenv(f"{origen}_BASE_URL") for origen in ("BCN", "SIBOIF", "CONAMI")
+}
+
+# Sesión de cada origen
+_sesiones: dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+class ErrorDescarga(Exception):
+    """
+    Error de una petición cuya respuesta no es satisfactoria.
+    """
+
+
+def _resolver_url(url: str, origen: str) -> str:
+    """
+    Devuelve la url con el esquema y el servidor de la url base configurada para el origen,
+    o la misma url si no se configuró.
+    """
+
+    base_url = _BASE_URLS.get(origen)
+
+    if not base_url:
+        return url
+
+    partes = urlsplit(url)
+    base = urlsplit(base_url)
+
+    return urlunsplit(
+        (
+            base.scheme,
+            base.netloc,
+            base.path.rstrip("/") + partes.path,
+            partes.query,
+            partes.fragment,
+        )
+    )
+
+
+def _get_sesion(origen: str) -> requests.Session:
+    """
+    Devuelve la sesión del origen, creándola con un pool de `TAM_POOL` conexiones.
+    """
+
+    with _lock:
+        sesion = _sesiones.get(origen)
+
+        if sesion is None:
+            sesion = requests.Session()
+            adapter = HTTPAdapter(pool_connections=TAM_POOL, pool_maxsize=TAM_POOL)
+            sesion.mount("http://", adapter)
+            sesion.mount("https://", adapter)
+
+            _sesiones[origen] = sesion
+
+        return sesion
+
+
+def request(method: str, url: str, origen: str, **kwargs) -> requests.Response:
+    """
+    Realiza la petición HTTP especificada y devuelve la respuesta.\n
+    Cada petición espera su turno según el ritmo del origen (ver `ritmo`) y
+    las respuestas 429/503 se vuelven a intentar luego de reducir el ritmo.
+
+    :param method: Método HTTP (GET o POST).
+    :param url: Url de la petición.
+    :param origen: Origen de los datos (e.g. BCN), usado en las métricas.
+    :param kwargs: Parámetros adicionales de `requests.request` (headers, timeout, etc.)
+    """
+
+    url = _resolver_url(url, origen)
+
+    for intento in range(1, INTENTOS_SATURACION + 1):
+        ritmo.esperar(origen)
+
+        with metricas.medir(
+            "descarga", origen=origen, url=url, intento=intento
+        ) as medicion:
+            response = _get_sesion(origen).request(method, url, **kwargs)
+
+            medicion.agregar(status=response.status_code, bytes=len(response.content))
+
+        # El tiempo hasta recibir los encabezados no depende del tamaño del archivo
+        ritmo.registrar(
+            origen,
+            response.status_code,
+            response.elapsed.total_seconds(),
+            ritmo.get_retry_after(response.headers.get("Retry-After")),
+        )
+
+        if response.status_code not in ritmo.ESTADOS_SATURACION:
+            break
+
+        print("Servidor saturado:", origen, response.status_code, "intento", intento)
+
+    return response
+
+
+def get(url: str, origen: str, **kwargs) -> requests.Response:
+    """
+    Realiza una petición GET y devuelve la respuesta.
+    """
+
+    return request("GET", url, origen, **kwargs)
+
+
+def post(url: str, origen: str, **kwargs) -> requests.Response:
+    """
+    Realiza una petición POST y devuelve la respuesta.
+    """
+
+    return request("POST", url, origen, **kwargs)
@@ -0,0 +1,168 @@
+"""
+Modulo para leer archivos de Excel con el motor más rápido disponible.\n
+El formato se detecta por el contenido del archivo (no por la extensión)
+y se usa el primer motor instalado de la lista de cada formato:\n
+- `.xlsx`: `calamine`, `openpyxl` (modo solo lectura).
+- `.xls`: `calamine`, `xlrd` (cargando solo las hojas que se leen).
+
+`calamine` es opcional y es el más rápido para ambos formatos:\n
+    pip install python-calamine
+
+El motor se puede forzar con la variable de entorno:\n
+    EXCEL_MOTOR=openpyxl
+
+Para comparar los motores ver `benchmarks/motores.py`.
+"""
+
+import io
+import os
+from importlib.util import find_spec
+from typing import Optional
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Motores de cada formato en orden de preferencia
+MOTORES = {
+    "xlsx": ("calamine", "openpyxl"),
+    "xls": ("calamine", "xlrd"),
+}
+
+# Paquete del que depende cada motor
+_PAQUETES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "xlrd": "xlrd",
+}
+
+# Firmas de los archivos: OLE2 (.xls) y ZIP (.xlsx)
+_FIRMAS = {
+    b"\xd0\xcf\x11\xe0": "xls",
+    b"PK\x03\x04": "xlsx",
+}
+
+
+class _Descartar:
+    """
+    Salida que descarta los avisos de `xlrd`.
+    """
+
+    def write(self, *_):
+        pass
+
+
+def get_formato(fuente: str | io.BytesIO) -> str:
+    """
+    Devuelve el formato del archivo (xls o xlsx) según su contenido.
+
+    :param fuente: Ruta o contenido en memoria del archivo.
+
+    :raises ValueError: Si el contenido no es un archivo de Excel.
+    """
+
+    if isinstance(fuente, io.BytesIO):
+        firma = fuente.getbuffer()[:4].tobytes()
+    else:
+        with open(fuente, "rb") as file:
+            firma = file.read(4)
+
+    if firma not in _FIRMAS:
+        raise ValueError("El archivo no es un archivo de Excel (.xls o .xlsx)")
+
+    return _FIRMAS[firma]
+
+
+def get_motores(formato: str) -> list[str]:
+    """
+    Devuelve los motores instalados para el formato, en orden de preferencia.
+    """
+
+    return [motor for motor in MOTORES[formato] if find_spec(_PAQUETES[motor])]
+
+
+def get_motor(formato: str, motor: Optional[str] = None) -> str:
+    """
+    Devuelve el motor a usar para el formato: el especificado, el de la variable
+    de entorno `EXCEL_MOTOR` si admite el formato, o el más rápido instalado.
+    """
+
+    if motor:
+        return motor
+
+    motor = os.getenv("EXCEL_MOTOR", "").strip().lower()
+
+    if motor in MOTORES[formato]:
+        return motor
+
+    motores = get_motores(formato)
+
+    if not motores:
+        raise ImportError(
+            f"No hay un motor instalado para leer archivos .{formato}: "
+            + ", ".join(_PAQUETES[motor] for motor in MOTORES[formato])
+        )
+
+    return motores[0]
+
+
+def abrir(fuente: str | io.BytesIO, motor: Optional[str] = None) -> pd.ExcelFile:
+    """
+    Abre el libro de Excel para leer varias hojas sin volver a leer el archivo.\n
+    Con `xlrd` las hojas se cargan solo cuando se leen.
+
+    :param fuente: Ruta o contenido en memoria del archivo.
+    :param motor: Motor a usar (opcional, por defecto el más rápido instalado).
+
+    :return: Libro abierto.
+    :rtype: pd.ExcelFile
+    """
+
+    if isinstance(fuente, io.BytesIO):
+        fuente.seek(0)
+
+    motor = get_motor(get_formato(fuente), motor)
+
+    engine_kwargs = {}
+
+    if motor == "xlrd":
+        # Los avisos de xlrd (e.g. tamaño del archivo no múltiplo de 512) se descartan
+        # https://github.com/pandas-dev/pandas/issues/16620
+        engine_kwargs = {"on_demand": True, "logfile": _Descartar()}
+
+    return pd.ExcelFile(fuente, engine=motor, engine_kwargs=engine_kwargs)
+
+
+def leer(
+    fuente: str | io.BytesIO,
+    sheet_name: int | str = 0,
+    header: Optional[int] = 0,
+    skiprows: Optional[int] = None,
+    usecols=None,
+    nrows: Optional[int] = None,
+    motor: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Lee una hoja del archivo de Excel.\n
+    Con `usecols` y `nrows` solo se convierten las columnas y filas necesarias.
+
+    :param fuente: Ruta o contenido en memoria del archivo.
+    :param sheet_name: Nombre o índice de la hoja.
+    :param header: Fila del encabezado (luego de omitir `skiprows`), o `None` si no tiene.
+    :param skiprows: Filas a omitir al inicio de la hoja.
+    :param usecols: Columnas a leer (ver `pd.read_excel`).
+    :param nrows: Número máximo de filas a leer.
+    :param motor: Motor a usar (opcional, por defecto el más rápido instalado).
+
+    :return: DataFrame con los datos de la hoja.
+    :rtype: pd.DataFrame
+    """
+
+    with abrir(fuente, motor) as xls:
+        return xls.parse(
+            sheet_name=sheet_name,
+            header=header,
+            skiprows=skiprows,
+            usecols=usecols,
+            nrows=nrows,
+        )
@@ -0,0 +1,409 @@
+"""
+Modulo para exportar los datos procesados a archivos columnares particionados,
+para leerlos (e.g. desde notebooks) sin consultar la base de datos.\n
+Los archivos se particionan por origen y año:\n
+    exportacion/
+        indice.json
+        ORIGEN=BCN/ANIO=2024/part-20240601_101500_000001.parquet
+        ORIGEN=SIBOIF/ANIO=2024/part-20240601_101500_000002.parquet
+
+- Parquet si el paquete opcional `pyarrow` está instalado (`pip install pyarrow`),
+  o CSV comprimido (`.csv.gz`) en su defecto. El formato se define al crear el directorio.
+- Cada bloque cargado se agrega como un archivo nuevo en su partición y al finalizar
+  la carga se compactan las particiones modificadas en un solo archivo, conservando
+  el último valor de cada origen, institución, indicador y periodo.
+- `indice.json` registra los archivos, registros, meses e indicadores de cada partición,
+  de modo que `leer` solo abre las particiones necesarias:\n
+    df = exportacion.leer(origenes=["BCN"], anios=range(2020, 2025))
+
+Se activa con la opción `--exportar` de `procesar.py`, junto con la base de datos
+o en su lugar (`--sin-bd`). El directorio se puede configurar con la variable de entorno:\n
+    EXPORTACION_DIR=/datos/indicadores
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Iterable, Optional
+import pandas as pd
+from dotenv import load_dotenv
+import metricas
+
+load_dotenv()
+
+_EXPORTACION_DIR = os.getenv("EXPORTACION_DIR") or os.path.join(
+    os.path.dirname(__file__), "exportacion"
+)
+
+_INDICE_FILE = "indice.json"
+
+# Extensión de los archivos de cada formato
+FORMATOS = {
+    "parquet": ".parquet",
+    "csv": ".csv.gz",
+}
+
+# Columnas del dataset, en orden
+COLUMNAS = ["ORIGEN", "INSTITUCION", "INDICADOR", "ANIO", "MES", "VALOR"]
+
+# Columnas que identifican un valor
+_LLAVE = ["ORIGEN", "INSTITUCION", "INDICADOR", "ANIO", "MES"]
+
+# Tipos de las columnas al leer archivos CSV
+_TIPOS_CSV = {
+    "ORIGEN": str,
+    "INSTITUCION": str,
+    "INDICADOR": str,
+    "ANIO": "int64",
+    "MES": "int64",
+    "VALOR": "float64",
+}
+
+# Estado de la ejecución actual
+_dir_path: str | None = None
+_indice: dict | None = None
+_secuencia = 0
+_lock = threading.Lock()
+
+
+def get_formato() -> str:
+    """
+    Devuelve el formato de los archivos nuevos: parquet si `pyarrow` está instalado o csv.
+    """
+
+    return "parquet" if find_spec("pyarrow") else "csv"
+
+
+def activar(dir_path: Optional[str] = None) -> str:
+    """
+    Activa la exportación de la ejecución actual.
+
+    :param dir_path: Directorio de la exportación (opcional, por defecto `EXPORTACION_DIR`
+    o `src/exportacion`).
+
+    :return: Directorio de la exportación.
+    """
+
+    global _dir_path
+
+    _dir_path = dir_path or _EXPORTACION_DIR
+
+    return _dir_path
+
+
+def activo() -> bool:
+    """
+    Indica si la exportación está activa.
+    """
+
+    return _dir_path is not None
+
+
+def _leer_indice(dir_path: str) -> dict:
+    """
+    Devuelve el índice de particiones del directorio, o un índice nuevo si no existe.
+    """
+
+    file_path = os.path.join(dir_path, _INDICE_FILE)
+
+    if not os.path.exists(file_path):
+        return {"formato": get_formato(), "particiones": {}}
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _guardar_indice():
+    """
+    Guarda el índice de particiones de forma atómica.
+    """
+
+    file_path = os.path.join(_dir_path, _INDICE_FILE)
+
+    with open(file_path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(_indice, file, ensure_ascii=False, indent=2)
+
+    os.replace(file_path + ".tmp", file_path)
+
+
+def _escribir(df: pd.DataFrame, file_path: str):
+    """
+    Escribe el DataFrame en el formato del índice, de forma atómica.
+    """
+
+    temp_path = file_path + ".tmp"
+
+    if _indice["formato"] == "parquet":
+        df.to_parquet(temp_path, engine="pyarrow", index=False)
+    else:
+        df.to_csv(temp_path, index=False, compression="gzip")
+
+    os.replace(temp_path, file_path)
+
+
+def _leer_archivo(file_path: str, formato: str) -> pd.DataFrame:
+    """
+    Lee un archivo de una partición.
+    """
+
+    if formato == "parquet":
+        return pd.read_parquet(file_path, engine="pyarrow")
+
+    return pd.read_csv(file_path, dtype=_TIPOS_CSV, compression="gzip")
+
+
+def _get_file_name() -> str:
+    """
+    Devuelve un nombre de archivo nuevo, ordenado por fecha de creación.
+    """
+
+    global _secuencia
+
+    _secuencia += 1
+
+    return f"part-{datetime.now():%Y%m%d_%H%M%S}_{_secuencia:06d}{FORMATOS[_indice['formato']]}"
+
+
+def _actualizar_particion(clave: str, df: pd.DataFrame, archivos: list[str]):
+    """
+    Registra los archivos y el resumen de la partición en el índice.
+    """
+
+    origen, anio = clave.split("/")
+
+    _indice["particiones"][clave] = {
+        "origen": origen,
+        "anio": int(anio),
+        "ruta": f"ORIGEN={origen}/ANIO={anio}",
+        "archivos": archivos,
+        "registros": int(df.shape[0]),
+        "mes_min": int(df["MES"].min()),
+        "mes_max": int(df["MES"].max()),
+        "indicadores": sorted(df["INDICADOR"].unique().tolist()),
+        "actualizado": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def _agregar_archivo(particion: dict, df: pd.DataFrame, file_name: str):
+    """
+    Agrega un archivo a la partición y amplía su resumen.\n
+    Los registros incluyen los valores repetidos hasta que se compacta la partición.
+    """
+
+    particion["archivos"].append(file_name)
+    particion["registros"] += int(df.shape[0])
+    particion["mes_min"] = min(particion["mes_min"], int(df["MES"].min()))
+    particion["mes_max"] = max(particion["mes_max"], int(df["MES"].max()))
+    particion["indicadores"] = sorted(
+        set(particion["indicadores"]) | set(df["INDICADOR"].unique().tolist())
+    )
+    particion["actualizado"] = datetime.now().isoformat(timespec="seconds")
+
+
+def iniciar_carga() -> bool:
+    """
+    Inicia una exportación cargando el índice de particiones del directorio.
+
+    :return: `True` si el directorio se puede usar con los paquetes instalados.
+    """
+
+    global _indice
+
+    try:
+        os.makedirs(_dir_path, exist_ok=True)
+
+        with _lock:
+            _indice = _leer_indice(_dir_path)
+
+        if _indice["formato"] == "parquet" and not find_spec("pyarrow"):
+            raise ImportError(
+                "El directorio se exportó en formato parquet y pyarrow no está instalado"
+            )
+
+        print("Exportando a:", _dir_path, f"({_indice['formato']})")
+
+        return True
+    except Exception as e:
+        print("Error al iniciar la exportación:", e)
+        return False
+
+
+def cargar(df: pd.DataFrame) -> bool:
+    """
+    Agrega el bloque de datos como un archivo nuevo en cada partición (origen y año).
+
+    :param df: DataFrame con los datos a exportar
+
+    :return: `True` si el bloque se exportó correctamente.
+    """
+
+    if df.empty:
+        return True
+
+    try:
+        with metricas.medir("exportar", registros=df.shape[0]), _lock:
+            df = df[COLUMNAS].astype({"ANIO": "int64", "MES": "int64"})
+
+            for (origen, anio), df_particion in df.groupby(["ORIGEN", "ANIO"]):
+                clave = f"{origen}/{anio}"
+                dir_particion = os.path.join(
+                    _dir_path, f"ORIGEN={origen}", f"ANIO={anio}"
+                )
+                os.makedirs(dir_particion, exist_ok=True)
+
+                file_name = _get_file_name()
+                _escribir(df_particion, os.path.join(dir_particion, file_name))
+
+                particion = _indice["particiones"].get(clave)
+
+                if particion:
+                    _agregar_archivo(particion, df_particion, file_name)
+                else:
+                    _actualizar_particion(clave, df_particion, [file_name])
+
+            _guardar_indice()
+
+        return True
+    except Exception as e:
+        print("Error al exportar datos:", e)
+        return False
+
+
+def _compactar(clave: str):
+    """
+    Une los archivos de la partición en uno solo,
+    conservando el último valor de cada origen, institución, indicador y periodo.
+    """
+
+    particion = _indice["particiones"][clave]
+    dir_particion = os.path.join(_dir_path, particion["ruta"])
+
+    df = pd.concat(
+        [
+            _leer_archivo(os.path.join(dir_particion, file_name), _indice["formato"])
+            for file_name in particion["archivos"]
+        ],
+        ignore_index=True,
+    )
+
+    # Los archivos se agregan en orden, por lo que el último valor es el más reciente
+    df = df.drop_duplicates(_LLAVE, keep="last").sort_values(_LLAVE)
+
+    file_name = _get_file_name()
+    _escribir(df, os.path.join(dir_particion, file_name))
+
+    anteriores = particion["archivos"]
+
+    _actualizar_particion(clave, df, [file_name])
+    _guardar_indice()
+
+    # Los archivos anteriores se eliminan una vez registrado el nuevo
+    for anterior in anteriores:
+        os.remove(os.path.join(dir_particion, anterior))
+
+
+def finalizar_carga() -> bool:
+    """
+    Compacta las particiones con varios archivos: las modificadas en la carga actual
+    y las de una exportación anterior incompleta.
+
+    :return: `True` si las particiones se compactaron correctamente.
+    """
+
+    try:
+        with _lock:
+            claves = [
+                clave
+                for clave, particion in _indice["particiones"].items()
+                if len(particion["archivos"]) > 1
+            ]
+
+            print("Compactando particiones:", len(claves))
+
+            for clave in sorted(claves):
+                with metricas.medir("compactar", particion=clave):
+                    _compactar(clave)
+
+        return True
+    except Exception as e:
+        print("Error al compactar particiones:", e)
+        return False
+
+
+def actualizar(df: pd.DataFrame) -> bool:
+    """
+    Exporta el DataFrame y compacta las particiones modificadas.
+
+    :param df: DataFrame con los datos a exportar
+
+    :return: `True` si la información se exportó correctamente.
+    """
+
+    return iniciar_carga() and cargar(df) and finalizar_carga()
+
+
+def leer(
+    origenes: Optional[Iterable[str]] = None,
+    anios: Optional[Iterable[int]] = None,
+    indicadores: Optional[Iterable[str]] = None,
+    dir_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Lee los datos exportados, abriendo solo las particiones necesarias según el índice.
+
+    :param origenes: Orígenes a leer (opcional, por defecto todos).
+    :param anios: Años a leer (opcional, por defecto todos).
+    :param indicadores: Indicadores a leer (opcional, por defecto todos).
+    :param dir_path: Directorio de la exportación (opcional, por defecto `EXPORTACION_DIR`).
+
+    :return: DataFrame con las columnas del dataset.
+    """
+
+    dir_path = dir_path or _dir_path or _EXPORTACION_DIR
+    indice = _leer_indice(dir_path)
+
+    origenes = set(origenes) if origenes is not None else None
+    anios = set(anios) if anios is not None else None
+    indicadores = set(indicadores) if indicadores is not None else None
+
+    dfs = []
+
+    for particion in indice["particiones"].values():
+        if origenes is not None and particion["origen"] not in origenes:
+            continue
+
+        if anios is not None and particion["anio"] not in anios:
+            continue
+
+        # Omitir las particiones que no tienen los indicadores
+        if indicadores is not None and indicadores.isdisjoint(particion["indicadores"]):
+            continue
+
+        df = pd.concat(
+            [
+                _leer_archivo(
+                    os.path.join(dir_path, particion["ruta"], file_name),
+                    indice["formato"],
+                )
+                for file_name in particion["archivos"]
+            ],
+            ignore_index=True,
+        )
+
+        # Una partición sin compactar puede tener valores repetidos
+        if len(particion["archivos"]) > 1:
+            df = df.drop_duplicates(_LLAVE, keep="last")
+
+        dfs.append(df)
+
+    if not dfs:
+        return pd.DataFrame(columns=COLUMNAS)
+
+    df = pd.concat(dfs, ignore_index=True)
+
+    if indicadores is not None:
+        df = df[df["INDICADOR"].isin(indicadores)].reset_index(drop=True)
+
+    return df
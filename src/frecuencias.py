@@ -0,0 +1,197 @@
+"""
+Modulo para alinear series de distintas frecuencias (mensual, trimestral y anual).\n
+Los periodos se representan con el último mes del periodo (trimestres en los meses
+3, 6, 9 y 12 y años en diciembre), igual que en el dataset. La frecuencia de cada serie
+(meses que cubre cada fila) es la menor distancia entre sus periodos, de modo que los
+periodos faltantes se tratan como faltantes y no como periodos de menor frecuencia.
+Las series que cambian de frecuencia (e.g. datos anuales asignados a diciembre antes de
+`anio_mensual` y mensuales después) se deben separar antes de remuestrear.\n
+`remuestrear` convierte todas las series a la frecuencia especificada en una sola pasada:\n
+- Las filas de menor frecuencia se desagregan (`DESAGREGACIONES`): `repetir` el valor
+  en cada periodo, `dividir` el valor entre los periodos o `interpolar` linealmente
+  desde el periodo anterior.
+- Las filas de mayor frecuencia se agregan (`AGREGACIONES`): `suma`, `promedio`
+  o `ultimo` valor. Solo se devuelven los periodos completos.
+
+Uso:\n
+    df_trimestral = frecuencias.remuestrear(df, "trimestral", agregacion="suma")
+    df_mensual = frecuencias.remuestrear(df, "mensual", desagregacion="interpolar")
+"""
+
+import numpy as np
+import pandas as pd
+
+# Meses de cada frecuencia
+FRECUENCIAS = {
+    "mensual": 1,
+    "trimestral": 3,
+    "anual": 12,
+}
+
+AGREGACIONES = ("suma", "promedio", "ultimo")
+
+DESAGREGACIONES = ("repetir", "dividir", "interpolar")
+
+# Columnas que identifican una serie
+_SERIE = ["ORIGEN", "INSTITUCION", "INDICADOR"]
+
+# Columnas del dataset, en orden
+_COLUMNAS = ["ORIGEN", "INSTITUCION", "INDICADOR", "ANIO", "MES", "VALOR"]
+
+
+def _get_coberturas(df: pd.DataFrame) -> pd.Series:
+    """
+    Devuelve los meses que cubre cada fila (1, 3 o 12): la menor distancia
+    entre los periodos de su serie.
+    """
+
+    pasos = df.assign(_PASO=df.groupby(_SERIE, sort=False)["_PERIODO"].diff())
+    paso = pasos.groupby(_SERIE, sort=False)["_PASO"].transform("min")
+
+    # Las series sin una frecuencia válida (e.g. series de una sola fila)
+    # se toman como mensuales
+    return paso.where(paso.isin(list(FRECUENCIAS.values())), 1).astype(int)
+
+
+def _desagregar(df: pd.DataFrame, meses: int, metodo: str) -> pd.DataFrame:
+    """
+    Divide las filas que cubren más de `meses` meses en periodos de `meses` meses.
+    """
+
+    mayores = df["_COBERTURA"] > meses
+
+    if not mayores.any():
+        return df
+
+    valores_anteriores = df[_SERIE + ["_PERIODO", "VALOR"]]
+    df_menores = df[~mayores]
+    df = df[mayores]
+
+    partes = (df["_COBERTURA"] // meses).to_numpy()
+
+    # Número de cada parte dentro de su fila: 1..partes
+    indices = np.repeat(np.arange(len(df)), partes)
+    numeros = (
+        np.arange(len(indices)) - np.repeat(np.cumsum(partes) - partes, partes) + 1
+    )
+
+    filas = df.iloc[indices].reset_index(drop=True)
+    partes = partes[indices]
+
+    inicio = filas["_PERIODO"] - filas["_COBERTURA"]
+    valores = filas["VALOR"]
+
+    if metodo == "dividir":
+        valores = valores / partes
+    elif metodo == "interpolar":
+        # Valor del periodo anterior de la serie (el mismo valor si no existe)
+        anteriores = (
+            filas[_SERIE + ["_PERIODO"]]
+            .assign(_PERIODO=inicio)
+            .merge(
+                valores_anteriores,
+                on=_SERIE + ["_PERIODO"],
+                how="left",
+            )["VALOR"]
+            .fillna(valores)
+        )
+
+        valores = anteriores + (valores - anteriores) * numeros / partes
+
+    filas = filas.assign(
+        _PERIODO=inicio + numeros * meses, _COBERTURA=meses, VALOR=valores
+    )
+
+    return pd.concat([df_menores, filas], ignore_index=True).sort_values(
+        _SERIE + ["_PERIODO"], ignore_index=True
+    )
+
+
+def _agregar(df: pd.DataFrame, meses: int, metodo: str) -> pd.DataFrame:
+    """
+    Agrega las filas de cada serie en periodos de `meses` meses,
+    conservando solo los periodos completos.
+    """
+
+    df = df.assign(
+        _PERIODO=df["_PERIODO"] // meses * meses + meses - 1,
+        _PONDERADO=df["VALOR"] * df["_COBERTURA"],
+    )
+
+    periodos = df.groupby(_SERIE + ["_PERIODO"], sort=False).agg(
+        SUMA=("VALOR", "sum"),
+        PONDERADO=("_PONDERADO", "sum"),
+        ULTIMO=("VALOR", "last"),
+        COBERTURA=("_COBERTURA", "sum"),
+    )
+
+    # Los periodos completos cubren todos sus meses
+    periodos = periodos[periodos["COBERTURA"] == meses]
+
+    valores = {
+        "suma": periodos["SUMA"],
+        "promedio": periodos["PONDERADO"] / meses,
+        "ultimo": periodos["ULTIMO"],
+    }[metodo]
+
+    return periodos.assign(VALOR=valores).reset_index()
+
+
+def remuestrear(
+    df: pd.DataFrame,
+    frecuencia: str,
+    agregacion: str = "suma",
+    desagregacion: str = "repetir",
+) -> pd.DataFrame:
+    """
+    Convierte todas las series del DataFrame a la frecuencia especificada.
+
+    :param df: DataFrame con las columnas del dataset.
+    :param frecuencia: Frecuencia de destino (ver `FRECUENCIAS`).
+    :param agregacion: Método para agregar las filas de mayor frecuencia (ver `AGREGACIONES`).
+    :param desagregacion: Método para desagregar las filas de menor frecuencia
+    (ver `DESAGREGACIONES`).
+
+    :return: DataFrame con las columnas del dataset, ordenado por serie y periodo.
+    :raises ValueError: Si la frecuencia o los métodos no existen.
+    """
+
+    if frecuencia not in FRECUENCIAS:
+        raise ValueError(
+            f"Frecuencia inválida: {frecuencia} ({', '.join(FRECUENCIAS)})"
+        )
+
+    if agregacion not in AGREGACIONES:
+        raise ValueError(
+            f"Agregación inválida: {agregacion} ({', '.join(AGREGACIONES)})"
+        )
+
+    if desagregacion not in DESAGREGACIONES:
+        raise ValueError(
+            f"Desagregación inválida: {desagregacion} ({', '.join(DESAGREGACIONES)})"
+        )
+
+    if df.empty:
+        return pd.DataFrame(columns=_COLUMNAS)
+
+    meses = FRECUENCIAS[frecuencia]
+
+    df = df[_COLUMNAS].assign(
+        _PERIODO=df["ANIO"].astype(int) * 12 + df["MES"].astype(int) - 1
+    )
+    df = df.sort_values(_SERIE + ["_PERIODO"], ignore_index=True)
+    df["_COBERTURA"] = _get_coberturas(df)
+
+    df = _desagregar(df, meses, desagregacion)
+    df = _agregar(df, meses, agregacion)
+
+    return pd.DataFrame(
+        {
+            "ORIGEN": df["ORIGEN"],
+            "INSTITUCION": df["INSTITUCION"],
+            "INDICADOR": df["INDICADOR"],
+            "ANIO": df["_PERIODO"] // 12,
+            "MES": df["_PERIODO"] % 12 + 1,
+            "VALOR": df["VALOR"].astype(float),
+        }
+    )
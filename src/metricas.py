@@ -0,0 +1,228 @@
+"""
+Modulo de métricas por etapa (descarga, procesamiento, carga y SPs).\n
+Las métricas están desactivadas por defecto y en ese caso `medir` devuelve
+un objeto que no hace nada, para no afectar el tiempo de ejecución.\n
+Uso:\n
+    with metricas.medir("procesar", origen="BCN", nombre="Remesas") as medicion:
+        df = procesar(file_path)
+        medicion.agregar(registros=len(df))
+
+Cada medición se escribe como una línea JSON en el archivo de la ejecución.
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+_METRICAS_DIR = os.path.join(os.path.dirname(__file__), "metricas")
+
+# Estado de la ejecución actual
+_activo = False
+_file = None
+_mediciones: list[dict] = []
+_lock = threading.Lock()
+
+
+class _Medicion:
+    """
+    Medición del tiempo de una etapa, con valores adicionales (registros, bytes, etc.)
+    """
+
+    __slots__ = ("etapa", "datos", "inicio")
+
+    def __init__(self, etapa: str, datos: dict):
+        self.etapa = etapa
+        self.datos = datos
+        self.inicio = 0.0
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        segundos = time.perf_counter() - self.inicio
+
+        self.datos["segundos"] = round(segundos, 6)
+
+        registros = self.datos.get("registros")
+
+        if registros and segundos > 0:
+            self.datos["registros_por_segundo"] = round(registros / segundos, 2)
+
+        if valor is not None:
+            self.datos["error"] = repr(valor)
+
+        _registrar(self.etapa, self.datos)
+
+        return False
+
+    def agregar(self, **valores):
+        """
+        Agrega valores a la medición.
+        """
+
+        self.datos.update(valores)
+
+
+class _MedicionNula:
+    """
+    Medición que no hace nada, usada cuando las métricas están desactivadas.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        return False
+
+    def agregar(self, **valores):
+        """
+        No hace nada.
+        """
+
+
+_MEDICION_NULA = _MedicionNula()
+
+
+def _registrar(etapa: str, datos: dict):
+    """
+    Escribe la medición en el archivo de la ejecución.
+    """
+
+    registro = {"fecha": datetime.now().isoformat(), "etapa": etapa, **datos}
+
+    with _lock:
+        _mediciones.append(registro)
+
+        if _file:
+            _file.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+            _file.flush()
+
+
+def activar(file_path: str | None = None) -> str:
+    """
+    Activa las métricas de la ejecución actual.
+
+    :param file_path: Ruta del archivo JSON lines (opcional, por defecto
+    `metricas/metricas_yyyymmdd_hhmmss.jsonl`).
+
+    :return: Ruta del archivo de métricas.
+    """
+
+    global _activo, _file
+
+    if not file_path:
+        os.makedirs(_METRICAS_DIR, exist_ok=True)
+        file_name = f"metricas_{datetime.now():%Y%m%d_%H%M%S}.jsonl"
+        file_path = os.path.join(_METRICAS_DIR, file_name)
+
+    with _lock:
+        _file = open(file_path, "w", encoding="utf-8")
+        _mediciones.clear()
+        _activo = True
+
+    return file_path
+
+
+def desactivar():
+    """
+    Desactiva las métricas y cierra el archivo de la ejecución.
+    """
+
+    global _activo, _file
+
+    with _lock:
+        _activo = False
+
+        if _file:
+            _file.close()
+            _file = None
+
+
+def medir(etapa: str, **etiquetas):
+    """
+    Devuelve un context manager que mide el tiempo de la etapa especificada.
+
+    :param etapa: Nombre de la etapa (e.g. descarga, procesar, carga, sp).
+    :param etiquetas: Valores que identifican la medición (e.g. origen, url).
+    """
+
+    if not _activo:
+        return _MEDICION_NULA
+
+    return _Medicion(etapa, etiquetas)
+
+
+def resumen() -> list[dict]:
+    """
+    Devuelve el resumen de las mediciones de la ejecución agrupado por etapa.
+    """
+
+    etapas: dict[str, dict] = {}
+
+    with _lock:
+        mediciones = list(_mediciones)
+
+    for medicion in mediciones:
+        # Separar las etapas por origen cuando se especifica
+        nombre = medicion["etapa"]
+
+        if medicion.get("origen"):
+            nombre += f" {medicion['origen']}"
+
+        etapa = etapas.setdefault(
+            nombre,
+            {
+                "etapa": nombre,
+                "cantidad": 0,
+                "segundos": 0.0,
+                "maximo": 0.0,
+                "registros": 0,
+                "bytes": 0,
+                "errores": 0,
+            },
+        )
+
+        etapa["cantidad"] += 1
+        etapa["segundos"] += medicion["segundos"]
+        etapa["maximo"] = max(etapa["maximo"], medicion["segundos"])
+        etapa["registros"] += medicion.get("registros") or 0
+        etapa["bytes"] += medicion.get("bytes") or 0
+        etapa["errores"] += "error" in medicion
+
+    return list(etapas.values())
+
+
+def imprimir_resumen():
+    """
+    Imprime una tabla con el resumen de las mediciones por etapa.
+    """
+
+    columnas = (
+        "etapa",
+        "cantidad",
+        "segundos",
+        "maximo",
+        "registros",
+        "bytes",
+        "errores",
+    )
+
+    print(" ".join(f"{columna:>16}" for columna in columnas))
+
+    for etapa in resumen():
+        valores = []
+
+        for columna in columnas:
+            valor = etapa[columna]
+
+            if isinstance(valor, float):
+                valores.append(f"{valor:>16.3f}")
+            else:
+                valores.append(f"{valor:>16}")
+
+        print(" ".join(valores))
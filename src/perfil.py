@@ -0,0 +1,346 @@
+"""
+Modulo de perfilado por etapa (descarga, procesamiento, carga y SPs) con `cProfile`
+y `tracemalloc`.\n
+El perfilado está desactivado por defecto y en ese caso `perfilar` devuelve
+un objeto que no hace nada.\n
+Uso:\n
+    with perfil.perfilar("procesar", origen="BCN", nombre="Remesas"):
+        df = procesar(file_path)
+
+Cada etapa genera en el directorio de la ejecución un archivo `.prof` (pstats)
+y un archivo `.txt` con los sitios que más memoria asignaron.\n
+Las etapas que se ejecutan al mismo tiempo en otros hilos comparten el heap,
+por lo que las asignaciones de una etapa pueden incluir las de otra.\n
+Desde Python 3.12 solo puede haber un perfilador de CPU activo en el proceso, por lo que
+las etapas no tienen un `.prof` propio: se perfila todo el proceso en `proceso.prof`.
+"""
+
+import os
+import re
+import sys
+import time
+import itertools
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+
+_PERFILES_DIR = os.path.join(os.path.dirname(__file__), "perfiles")
+
+# Cantidad de funciones y sitios de asignación a mostrar por etapa
+TOP = 10
+
+# Antes de Python 3.12 cada hilo tiene su propio perfilador, por lo que las etapas
+# que se ejecutan al mismo tiempo tienen cada una su perfil de CPU
+PERFIL_POR_ETAPA = sys.version_info < (3, 12)
+
+# Estado de la ejecución actual
+_activo = False
+_dir = None
+_perfiles: list[dict] = []
+_numeros = itertools.count(1)
+_lock = threading.Lock()
+
+# Perfilador de todo el proceso (Python 3.12+)
+_profiler_proceso: cProfile.Profile | None = None
+
+
+class _Perfil:
+    """
+    Perfil de CPU y memoria de una etapa.
+    """
+
+    __slots__ = ("etapa", "etiquetas", "profiler", "snapshot", "inicio")
+
+    def __init__(self, etapa: str, etiquetas: dict):
+        self.etapa = etapa
+        self.etiquetas = etiquetas
+        self.profiler = None
+        self.snapshot = None
+        self.inicio = 0.0
+
+    def __enter__(self):
+        self.snapshot = tracemalloc.take_snapshot()
+
+        if PERFIL_POR_ETAPA:
+            self.profiler = cProfile.Profile()
+
+            try:
+                self.profiler.enable()
+            except ValueError as e:
+                print(
+                    "Se omite el perfil de CPU de",
+                    _get_nombre(self.etapa, self.etiquetas),
+                    ":",
+                    e,
+                )
+                self.profiler = None
+
+        self.inicio = time.perf_counter()
+
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        segundos = time.perf_counter() - self.inicio
+
+        if self.profiler:
+            self.profiler.disable()
+
+        asignaciones = _get_asignaciones(self.snapshot, tracemalloc.take_snapshot())
+
+        _registrar(self.etapa, self.etiquetas, segundos, self.profiler, asignaciones)
+
+        return False
+
+
+class _PerfilNulo:
+    """
+    Perfil que no hace nada, usado cuando el perfilado está desactivado.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        return False
+
+
+_PERFIL_NULO = _PerfilNulo()
+
+
+def _get_asignaciones(
+    inicial: tracemalloc.Snapshot, final: tracemalloc.Snapshot
+) -> list[tuple[str, float]]:
+    """
+    Devuelve los sitios (archivo:línea) con más memoria asignada entre dos snapshots, en KB.
+    """
+
+    filtros = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+
+    diferencias = final.filter_traces(filtros).compare_to(
+        inicial.filter_traces(filtros), "lineno"
+    )
+
+    return [
+        (
+            f"{diferencia.traceback[0].filename}:{diferencia.traceback[0].lineno}",
+            round(diferencia.size_diff / 1024, 1),
+        )
+        for diferencia in diferencias[:TOP]
+        if diferencia.size_diff > 0
+    ]
+
+
+def _get_nombre(etapa: str, etiquetas: dict) -> str:
+    """
+    Devuelve el nombre de la etapa con sus etiquetas (e.g. "procesar BCN Remesas").
+    """
+
+    return " ".join([etapa, *(str(valor) for valor in etiquetas.values() if valor)])
+
+
+def _registrar(
+    etapa: str,
+    etiquetas: dict,
+    segundos: float,
+    profiler: cProfile.Profile | None,
+    asignaciones: list[tuple[str, float]],
+):
+    """
+    Guarda el perfil y las asignaciones de la etapa en el directorio de la ejecución.
+    """
+
+    nombre = _get_nombre(etapa, etiquetas)
+
+    numero = next(_numeros)
+
+    # Nombre de archivo sin caracteres especiales
+    file_name = f"{numero:04d}_" + re.sub(r"\W+", "_", nombre).strip("_")
+
+    prof_path = None
+
+    if profiler:
+        prof_path = os.path.join(_dir, f"{file_name}.prof")
+        profiler.dump_stats(prof_path)
+
+    with open(os.path.join(_dir, f"{file_name}.txt"), "w", encoding="utf-8") as file:
+        file.write(f"{nombre}\nsegundos: {segundos:.6f}\n\n")
+
+        for sitio, kb in asignaciones:
+            file.write(f"{kb:>12.1f} KB  {sitio}\n")
+
+    # Agrupar por etapa y origen, igual que el resumen de métricas
+    grupo = etapa
+
+    if etiquetas.get("origen"):
+        grupo += f" {etiquetas['origen']}"
+
+    with _lock:
+        _perfiles.append(
+            {
+                "grupo": grupo,
+                "nombre": nombre,
+                "segundos": segundos,
+                "prof": prof_path,
+                "asignaciones": asignaciones,
+            }
+        )
+
+
+def activar(dir_path: str | None = None) -> str:
+    """
+    Activa el perfilado de la ejecución actual.
+
+    :param dir_path: Directorio de los perfiles (opcional, por defecto
+    `perfiles/perfil_yyyymmdd_hhmmss`).
+
+    :return: Directorio de los perfiles.
+    """
+
+    global _activo, _dir, _numeros, _profiler_proceso
+
+    if not dir_path:
+        dir_path = os.path.join(_PERFILES_DIR, f"perfil_{datetime.now():%Y%m%d_%H%M%S}")
+
+    os.makedirs(dir_path, exist_ok=True)
+
+    with _lock:
+        _dir = dir_path
+        _perfiles.clear()
+        _numeros = itertools.count(1)
+        _activo = True
+
+    tracemalloc.start()
+
+    if not PERFIL_POR_ETAPA:
+        _profiler_proceso = cProfile.Profile()
+
+        try:
+            _profiler_proceso.enable()
+        except ValueError as e:
+            print("Se omite el perfil de CPU del proceso:", e)
+            _profiler_proceso = None
+
+    return dir_path
+
+
+def desactivar():
+    """
+    Desactiva el perfilado y guarda el perfil de CPU del proceso si existe.
+    """
+
+    global _activo, _profiler_proceso
+
+    with _lock:
+        _activo = False
+
+    tracemalloc.stop()
+
+    if _profiler_proceso:
+        _profiler_proceso.disable()
+        _profiler_proceso.dump_stats(os.path.join(_dir, "proceso.prof"))
+        _profiler_proceso = None
+
+
+def _imprimir_funciones(stats: pstats.Stats):
+    """
+    Imprime las funciones con mayor tiempo propio.
+    """
+
+    funciones = sorted(
+        stats.stats.items(),  # type: ignore
+        key=lambda item: item[1][2],
+        reverse=True,
+    )
+
+    print(f"  {'propio':>10} {'acumulado':>10} {'llamadas':>10}  función")
+
+    for (archivo, linea, funcion), (
+        _,
+        llamadas,
+        propio,
+        acumulado,
+        _,
+    ) in funciones[:TOP]:
+        print(
+            f"  {propio:>10.3f} {acumulado:>10.3f} {llamadas:>10}  "
+            f"{funcion} ({os.path.basename(archivo)}:{linea})"
+        )
+
+
+def perfilar(etapa: str, **etiquetas):
+    """
+    Devuelve un context manager que perfila la etapa especificada.
+
+    :param etapa: Nombre de la etapa (e.g. descarga, procesar, carga, sp).
+    :param etiquetas: Valores que identifican la etapa (e.g. origen, nombre).
+    """
+
+    if not _activo:
+        return _PERFIL_NULO
+
+    return _Perfil(etapa, etiquetas)
+
+
+def imprimir_resumen():
+    """
+    Imprime las etapas ordenadas por tiempo total, con las funciones de mayor tiempo propio
+    y los sitios con más memoria asignada de cada una.
+    """
+
+    with _lock:
+        perfiles = list(_perfiles)
+
+    if _profiler_proceso:
+        _profiler_proceso.disable()
+
+        print("proceso: funciones de todas las etapas (un solo perfil de CPU)")
+        _imprimir_funciones(pstats.Stats(_profiler_proceso))
+        print()
+
+    grupos: dict[str, list[dict]] = {}
+
+    for perfil in perfiles:
+        grupos.setdefault(perfil["grupo"], []).append(perfil)
+
+    ranking = sorted(
+        grupos.items(),
+        key=lambda item: sum(perfil["segundos"] for perfil in item[1]),
+        reverse=True,
+    )
+
+    for grupo, items in ranking:
+        segundos = sum(perfil["segundos"] for perfil in items)
+
+        print(f"{grupo}: {segundos:.3f} s en {len(items)} ejecuciones")
+
+        # Más lenta de la etapa
+        lenta = max(items, key=lambda perfil: perfil["segundos"])
+        print(f"  más lenta: {lenta['nombre']} ({lenta['segundos']:.3f} s)")
+
+        archivos = [perfil["prof"] for perfil in items if perfil["prof"]]
+
+        if archivos:
+            _imprimir_funciones(pstats.Stats(*archivos))
+
+        asignaciones: dict[str, float] = {}
+
+        for perfil in items:
+            for sitio, kb in perfil["asignaciones"]:
+                asignaciones[sitio] = asignaciones.get(sitio, 0) + kb
+
+        if asignaciones:
+            print(f"  {'KB':>10}  sitio de asignación")
+
+            for sitio, kb in sorted(
+                asignaciones.items(), key=lambda item: item[1], reverse=True
+            )[:TOP]:
+                print(f"  {kb:>10.1f}  {sitio}")
+
+        print()
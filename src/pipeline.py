@@ -0,0 +1,400 @@
+"""
+Modulo con el ejecutor por etapas del procesamiento.\n
+Cada origen devuelve una lista de tareas (reporte o periodo) con la forma:\n
+    {
+        "origen": "BCN",
+        "nombre": "Remesas Mensuales",
+        "descargar": función sin parámetros que devuelve el recurso descargado,
+        "procesar": función que recibe el recurso y devuelve un DataFrame,
+    }
+
+Las etapas (descarga, procesamiento y carga) se conectan con colas de tamaño limitado,
+de modo que los orígenes se descargan al mismo tiempo y una etapa lenta
+detiene a las anteriores (backpressure) en lugar de acumular datos en memoria.\n
+Cada tarea es un trabajo con estado, intentos y error. Un error en una tarea
+no detiene las demás: las tareas fallidas se vuelven a ejecutar en rondas de reintento
+con una espera creciente, y las que se completan se cargan igualmente.
+"""
+
+import time
+import queue
+import threading
+from functools import partial
+from typing import Callable
+import pandas as pd
+import checkpoint
+import metricas
+import perfil
+from reintentos import TRABAJO_PLAN
+
+# Cantidad de hilos de cada etapa.
+# La descarga se configura por origen para respetar los límites de cada sitio.
+WORKERS = {
+    "BCN": 1,
+    "SIBOIF": 2,
+    "CONAMI": 2,
+    "procesar": 2,
+    "cargar": 1,
+}
+
+# Cantidad máxima de elementos en espera entre etapas
+TAM_COLA = 4
+
+# Rondas de reintento de las tareas fallidas
+REINTENTOS = 2
+
+# Segundos de espera antes de la primera ronda de reintento (se duplica en cada ronda)
+ESPERA_REINTENTO = 5.0
+
+# Marca de fin de cola
+_FIN = None
+
+
+def _descargar_recurso(tarea: dict):
+    """
+    Descarga el recurso de la tarea.
+    """
+
+    with perfil.perfilar("descarga", origen=tarea["origen"], nombre=tarea["nombre"]):
+        return tarea["descargar"]()
+
+
+def _procesar_recurso(tarea: dict, recurso) -> pd.DataFrame:
+    """
+    Procesa el recurso descargado de la tarea, registrando el tiempo y los registros obtenidos.
+    """
+
+    with metricas.medir(
+        "procesar", origen=tarea["origen"], nombre=tarea["nombre"]
+    ) as medicion, perfil.perfilar(
+        "procesar", origen=tarea["origen"], nombre=tarea["nombre"]
+    ):
+        df = tarea["procesar"](recurso)
+
+        medicion.agregar(registros=df.shape[0])
+
+    return df
+
+
+class _Resultado:
+    """
+    Estado compartido de una ejecución por etapas.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.registros = 0
+        self.periodos: list[pd.DataFrame] = []
+
+        # Trabajos por origen y nombre de la tarea
+        self.trabajos: dict[tuple[str, str], dict] = {}
+
+        # Tareas y planes fallidos de la ronda actual
+        self.tareas_fallidas: dict[str, list[dict]] = {}
+        self.planes_fallidos: set[str] = set()
+
+    def iniciar(self, origen: str, nombre: str):
+        """
+        Registra un nuevo intento del trabajo.
+        """
+
+        with self.lock:
+            trabajo = self.trabajos.setdefault(
+                (origen, nombre),
+                {
+                    "origen": origen,
+                    "nombre": nombre,
+                    "estado": "pendiente",
+                    "intentos": 0,
+                    "error": None,
+                },
+            )
+
+            trabajo["estado"] = "en proceso"
+            trabajo["intentos"] += 1
+
+    def completado(self, origen: str, nombre: str) -> bool:
+        """
+        Devuelve `True` si el trabajo ya se completó en una ronda anterior.
+        """
+
+        with self.lock:
+            trabajo = self.trabajos.get((origen, nombre))
+
+            return trabajo is not None and trabajo["estado"] == "ok"
+
+    def completar(self, origen: str, nombre: str):
+        """
+        Registra el trabajo como completado.
+        """
+
+        with self.lock:
+            trabajo = self.trabajos[(origen, nombre)]
+            trabajo["estado"] = "ok"
+            trabajo["error"] = None
+
+    def error(self, origen: str, nombre: str, e: Exception, tarea: dict | None = None):
+        """
+        Registra el error de una tarea o del plan de un origen para reintentarlo.
+        """
+
+        print("Error en", origen, nombre, ":", e)
+
+        with self.lock:
+            trabajo = self.trabajos[(origen, nombre)]
+            trabajo["estado"] = "error"
+            trabajo["error"] = str(e) or repr(e)
+
+            if tarea is None:
+                self.planes_fallidos.add(origen)
+            else:
+                self.tareas_fallidas.setdefault(origen, []).append(tarea)
+
+    def get_planes_reintento(
+        self, planes: dict[str, Callable[[], list[dict]]]
+    ) -> dict[str, Callable[[], list[dict]]]:
+        """
+        Devuelve los planes con las tareas fallidas de la ronda, o el plan completo
+        del origen si falló la planificación, y reinicia las tareas fallidas.
+        """
+
+        with self.lock:
+            reintento = {
+                origen: partial(list, tareas)
+                for origen, tareas in self.tareas_fallidas.items()
+            }
+
+            for origen in self.planes_fallidos:
+                reintento[origen] = planes[origen]
+
+            self.tareas_fallidas = {}
+            self.planes_fallidos = set()
+
+        return reintento
+
+
+def _ejecutar_ronda(
+    planes: dict[str, Callable[[], list[dict]]],
+    cargar: Callable[[pd.DataFrame, tuple[str, str]], bool],
+    workers: dict,
+    tam_cola: int,
+    resultado: _Resultado,
+):
+    """
+    Ejecuta las tareas de los planes por etapas, registrando el estado de cada trabajo.
+    """
+
+    colas_descarga = {origen: queue.Queue(tam_cola) for origen in planes}
+    cola_procesar = queue.Queue(tam_cola)
+    cola_cargar = queue.Queue(tam_cola)
+
+    def planificar(origen: str):
+        resultado.iniciar(origen, TRABAJO_PLAN)
+
+        try:
+            for tarea in planes[origen]():
+                # Al reintentar el plan de un origen se omiten las tareas completadas
+                if resultado.completado(tarea["origen"], tarea["nombre"]):
+                    continue
+
+                colas_descarga[origen].put(tarea)
+
+            resultado.completar(origen, TRABAJO_PLAN)
+        except Exception as e:
+            resultado.error(origen, TRABAJO_PLAN, e)
+
+    def descargar(origen: str):
+        while (tarea := colas_descarga[origen].get()) is not _FIN:
+            resultado.iniciar(tarea["origen"], tarea["nombre"])
+
+            try:
+                # Los bloques de una ejecución anterior pasan directo a la carga
+                df = checkpoint.obtener(tarea["origen"], tarea["nombre"])
+
+                if df is not None:
+                    print("Recuperado:", tarea["origen"], tarea["nombre"])
+                    cola_cargar.put((tarea, df))
+                    continue
+
+                print("Descargando:", tarea["origen"], tarea["nombre"])
+
+                recurso = _descargar_recurso(tarea)
+
+                if recurso is None:
+                    # Sin datos para la tarea
+                    resultado.completar(tarea["origen"], tarea["nombre"])
+                else:
+                    cola_procesar.put((tarea, recurso))
+            except Exception as e:
+                resultado.error(tarea["origen"], tarea["nombre"], e, tarea)
+
+    def procesar():
+        while (item := cola_procesar.get()) is not _FIN:
+            tarea, recurso = item
+
+            try:
+                df = _procesar_recurso(tarea, recurso)
+
+                checkpoint.guardar(tarea["origen"], tarea["nombre"], df)
+
+                cola_cargar.put((tarea, df))
+            except Exception as e:
+                resultado.error(tarea["origen"], tarea["nombre"], e, tarea)
+
+    def cargar_bloques():
+        while (item := cola_cargar.get()) is not _FIN:
+            tarea, df = item
+
+            try:
+                if not df.empty:
+                    if not cargar(df, (tarea["origen"], tarea["nombre"])):
+                        raise RuntimeError("No se pudo cargar el bloque")
+
+                    with resultado.lock:
+                        resultado.registros += df.shape[0]
+                        resultado.periodos.append(
+                            df[["ORIGEN", "INDICADOR", "ANIO", "MES"]].drop_duplicates()
+                        )
+
+                resultado.completar(tarea["origen"], tarea["nombre"])
+            except Exception as e:
+                resultado.error(tarea["origen"], tarea["nombre"], e, tarea)
+
+    def iniciar(target, cantidad: int, *args) -> list[threading.Thread]:
+        hilos = [
+            threading.Thread(target=target, args=args, daemon=True)
+            for _ in range(cantidad)
+        ]
+
+        for hilo in hilos:
+            hilo.start()
+
+        return hilos
+
+    hilos_plan = {origen: iniciar(planificar, 1, origen) for origen in planes}
+    hilos_descarga = {
+        origen: iniciar(descargar, workers.get(origen, 1), origen) for origen in planes
+    }
+    hilos_procesar = iniciar(procesar, workers["procesar"])
+    hilos_cargar = iniciar(cargar_bloques, workers["cargar"])
+
+    # Cerrar cada etapa cuando la anterior termina
+    for origen in planes:
+        for hilo in hilos_plan[origen]:
+            hilo.join()
+
+        for _ in hilos_descarga[origen]:
+            colas_descarga[origen].put(_FIN)
+
+    for hilos in hilos_descarga.values():
+        for hilo in hilos:
+            hilo.join()
+
+    for _ in hilos_procesar:
+        cola_procesar.put(_FIN)
+
+    for hilo in hilos_procesar:
+        hilo.join()
+
+    for _ in hilos_cargar:
+        cola_cargar.put(_FIN)
+
+    for hilo in hilos_cargar:
+        hilo.join()
+
+
+def ejecutar(
+    planes: dict[str, Callable[[], list[dict]]],
+    cargar: Callable[[pd.DataFrame, tuple[str, str]], bool],
+    workers: dict | None = None,
+    tam_cola: int = TAM_COLA,
+    reintentos: int = REINTENTOS,
+) -> dict:
+    """
+    Ejecuta las tareas de cada origen por etapas (descarga, procesamiento y carga)
+    en hilos separados, conectados por colas de tamaño limitado.\n
+    Las tareas fallidas se vuelven a ejecutar en rondas de reintento, esperando
+    `ESPERA_REINTENTO` segundos antes de la primera y el doble en cada ronda siguiente.
+
+    :param planes: Diccionario con el origen como key y como value la función
+    que devuelve la lista de tareas del origen.
+    :param cargar: Función que carga un DataFrame procesado y devuelve `True` si tuvo éxito.
+    Recibe también el origen y nombre de la tarea, que se repiten al reintentarla.
+    :param workers: Cantidad de hilos por etapa (ver `WORKERS`).
+    :param tam_cola: Cantidad máxima de elementos en espera entre etapas.
+    :param reintentos: Cantidad de rondas de reintento de las tareas fallidas.
+
+    :return: Diccionario con los registros cargados ("registros"), los periodos cargados
+    por origen e indicador ("periodos"), el estado de cada tarea ("trabajos")
+    y las tareas que fallaron en todos los intentos ("errores").
+    """
+
+    workers = {**WORKERS, **(workers or {})}
+    resultado = _Resultado()
+
+    for ronda in range(reintentos + 1):
+        if ronda:
+            espera = ESPERA_REINTENTO * 2 ** (ronda - 1)
+            print(
+                f"Reintentando tareas con error de {', '.join(planes)} en {espera:g} segundos"
+            )
+            time.sleep(espera)
+
+        _ejecutar_ronda(planes, cargar, workers, tam_cola, resultado)
+
+        planes = resultado.get_planes_reintento(planes)
+
+        if not planes:
+            break
+
+    trabajos = list(resultado.trabajos.values())
+
+    return {
+        "registros": resultado.registros,
+        "periodos": (
+            pd.concat(resultado.periodos, ignore_index=True)
+            if resultado.periodos
+            else pd.DataFrame(columns=["ORIGEN", "INDICADOR", "ANIO", "MES"])
+        ),
+        "trabajos": trabajos,
+        "errores": [
+            (trabajo["origen"], trabajo["nombre"], trabajo["error"])
+            for trabajo in trabajos
+            if trabajo["estado"] == "error"
+        ],
+    }
+
+
+def obtener(origen: str, plan: Callable[[], list[dict]]) -> pd.DataFrame:
+    """
+    Ejecuta las tareas del plan con `ejecutar` y devuelve un solo DataFrame
+    con los bloques procesados, sin cargarlos en la base de datos.
+
+    :param origen: Nombre del origen (ver `WORKERS`).
+    :param plan: Función que devuelve la lista de tareas del origen.
+
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si alguna tarea falló en todos los intentos.
+    """
+
+    bloques = []
+
+    def cargar(df: pd.DataFrame, tarea: tuple[str, str]) -> bool:
+        bloques.append(df)
+        return True
+
+    resultado = ejecutar({origen: plan}, cargar)
+
+    if resultado["errores"]:
+        raise RuntimeError(
+            f"{origen}: No se pudieron obtener "
+            + ", ".join(
+                f"{nombre} ({error})" for _, nombre, error in resultado["errores"]
+            )
+        )
+
+    if not bloques:
+        return pd.DataFrame()
+
+    return pd.concat(bloques, ignore_index=True)
@@ -7,87 +7,400 @@ Modulo para procesamiento de indicadores nacionales.\n
         py procesar.py ultimo
     - Periodo especifico (yyyymm)
         py procesar.py 202403
+    - Rango y lista de periodos (en una sola ejecución)
+        py procesar.py 202301-202406
+        py procesar.py 202301,202306,202312
+    - Reanudar la última ejecución de todos los periodos
+        py procesar.py todos --resume
+    - Periodos posteriores al último cargado, más una ventana de revisión de 6 meses
+        py procesar.py incremental --ventana 6
+    - Reintentar solo las tareas que fallaron en la última ejecución
+        py procesar.py reintentar
+    - Guardar métricas por etapa (JSON lines) e imprimir un resumen al final
+        py procesar.py ultimo --metricas --resumen
+    - Perfilar cada etapa (cProfile y tracemalloc) e imprimir las funciones más costosas
+        py procesar.py ultimo --perfil
+    - Guardar una copia de los archivos descargados (se procesan en memoria)
+        py procesar.py ultimo --guardar-archivos
+    - Cargar en una base de datos SQLite embebida en lugar de SQL Server (o `DB_BACKEND=sqlite`)
+        py procesar.py ultimo --bd sqlite
+    - Exportar también a archivos columnares particionados (o solo exportar con `--sin-bd`)
+        py procesar.py todos --exportar
+        py procesar.py todos --exportar /datos/indicadores --sin-bd
 """
 
-import sys
-import pandas as pd
+import argparse
+from functools import partial
 import bcn
 import siboif
 import conami
+import archivos
 import bd
+import checkpoint
+import exportacion
+import metricas
+import perfil
+import pipeline
+import reintentos
+import ritmo
+import watermark
+from utils import add_months
 
+# Meses hacia atrás del watermark que se vuelven a descargar para obtener revisiones
+_VENTANA_REVISION = 6
 
-def _get_functions(periodo):
+
+def _procesar_incremental(recurso, procesar, origen: str, ventana: int):
+    """
+    Procesa el recurso descargado y conserva solo los periodos nuevos
+    o en revisión de cada indicador.
+    """
+
+    return watermark.filtrar(procesar(recurso), origen, ventana)
+
+
+def _get_tareas_incremental(origen: str, modulo, ventana: int):
+    """
+    Devuelve las tareas para obtener los datos del origen posteriores a su watermark,
+    incluyendo la ventana de revisión.
+    Si el origen no tiene watermark se procesan todos los periodos.
+
+    :param origen: Nombre del origen (e.g. BCN).
+    :param modulo: Módulo del origen (bcn, siboif o conami).
+    :param ventana: Cantidad de meses de revisión.
+    """
+
+    desde = watermark.get_desde(origen, ventana)
+
+    if not desde:
+        print(f"{origen}: No existe watermark, procesando todos los periodos")
+        tareas = modulo.get_tareas_all_periodos()
+    else:
+        print(f"{origen}: Procesando desde:", *desde)
+        tareas = modulo.get_tareas_rango_periodos(*desde)
+
+    for tarea in tareas:
+        tarea["procesar"] = partial(
+            _procesar_incremental,
+            procesar=tarea["procesar"],
+            origen=origen,
+            ventana=ventana,
+        )
+
+    return tareas
+
+
+def _get_planes(periodo, periodos, ventana=_VENTANA_REVISION):
     """
-    Devuelve las funciones apropiadas basado en el periodo especificado.
+    Devuelve la función que genera las tareas de cada origen basado en el periodo especificado.
     """
 
+    modulos = {"BCN": bcn, "SIBOIF": siboif, "CONAMI": conami}
+
+    if periodo == "incremental":
+        return {
+            origen: partial(_get_tareas_incremental, origen, modulo, ventana)
+            for origen, modulo in modulos.items()
+        }
+
     if periodo == "todos":
-        return bcn.get_all_periodos, siboif.get_all_periodos, conami.get_all_periodos
+        return {
+            origen: modulo.get_tareas_all_periodos for origen, modulo in modulos.items()
+        }
 
     if periodo == "ultimo":
-        return bcn.get_last_periodo, siboif.get_last_periodo, conami.get_last_periodo
+        return {
+            origen: modulo.get_tareas_last_periodo for origen, modulo in modulos.items()
+        }
+
+    return {
+        origen: partial(modulo.get_tareas_periodos, periodos)
+        for origen, modulo in modulos.items()
+    }
+
+
+def _filtrar_tareas(plan, origen: str, nombres: set[str]) -> list[dict]:
+    """
+    Devuelve solo las tareas del plan con los nombres especificados.
+    """
+
+    tareas = [tarea for tarea in plan() if tarea["nombre"] in nombres]
+
+    faltantes = nombres - {tarea["nombre"] for tarea in tareas}
+
+    if faltantes:
+        print(f"{origen}: No se encontraron las tareas:", ", ".join(sorted(faltantes)))
+
+    return tareas
+
+
+def _get_planes_reintento(planes: dict, trabajos: list[dict]) -> dict:
+    """
+    Devuelve los planes con solo las tareas fallidas de cada origen.
+    Si falló la planificación de un origen se devuelve su plan completo.
+    """
+
+    nombres: dict[str, set[str]] = {}
+
+    for trabajo in trabajos:
+        nombres.setdefault(trabajo["origen"], set()).add(trabajo["nombre"])
+
+    return {
+        origen: (
+            plan
+            if reintentos.TRABAJO_PLAN in nombres[origen]
+            else partial(_filtrar_tareas, plan, origen, nombres[origen])
+        )
+        for origen, plan in planes.items()
+        if origen in nombres
+    }
+
+
+def _get_workers(planes: dict) -> dict:
+    """
+    Devuelve la cantidad de hilos de descarga de los orígenes a procesar
+    según sus reportes seleccionados.
+
+    :raises ValueError: Si se especifica un reporte que no existe.
+    """
+
+    modulos = {"SIBOIF": siboif, "CONAMI": conami}
+
+    return {
+        origen: modulo.get_workers()
+        for origen, modulo in modulos.items()
+        if origen in planes
+    }
+
+
+def _iniciar_carga(destinos: list) -> bool:
+    """
+    Inicia la carga en todos los destinos.
+    """
+
+    return all(destino.iniciar_carga() for destino in destinos)
+
+
+def _cargar(destinos: list, cargados: dict, df, tarea: tuple[str, str]) -> bool:
+    """
+    Carga el bloque en todos los destinos.
+
+    Al reintentar la tarea se omiten los destinos que ya cargaron su bloque,
+    para no insertar los mismos registros de nuevo.
+
+    :param cargados: Destinos que cargaron el bloque de cada tarea (origen, nombre).
+    """
+
+    completados = cargados.setdefault(tarea, set())
+
+    # Se carga en todos los destinos aunque falle alguno
+    for destino in destinos:
+        if destino.__name__ not in completados and destino.cargar(df):
+            completados.add(destino.__name__)
+
+    return len(completados) == len(destinos)
+
+
+def _finalizar_carga(destinos: list) -> bool:
+    """
+    Finaliza la carga en todos los destinos.
+    """
+
+    return all([destino.finalizar_carga() for destino in destinos])
+
+
+def _parse_periodo(texto: str) -> tuple[int, int]:
+    """
+    Devuelve el año y mes de un periodo en formato yyyymm.
+    """
+
+    if len(texto) != 6 or not texto.isdigit():
+        raise ValueError("Periodo inválido")
+
+    year, month = int(texto[:4]), int(texto[-2:])
 
-    return bcn.get_periodo, siboif.get_periodo, conami.get_periodo
+    if not (1 <= month <= 12):
+        raise ValueError("Mes inválido")
 
+    return year, month
 
-def _process_data(periodo, origen):
+
+def _parse_periodos(periodo: str) -> list[tuple[int, int]]:
+    """
+    Devuelve la lista ordenada de periodos (año, mes) especificados.\n
+    Acepta un periodo (yyyymm), un rango (yyyymm-yyyymm)
+    o una lista separada por comas de periodos y rangos.
+    """
+
+    periodos = set()
+
+    for parte in periodo.split(","):
+        inicio, _, fin = parte.strip().partition("-")
+
+        year, month = _parse_periodo(inicio)
+
+        if not fin:
+            periodos.add((year, month))
+            continue
+
+        year_fin, month_fin = _parse_periodo(fin)
+
+        if (year_fin, month_fin) < (year, month):
+            raise ValueError("Rango inválido")
+
+        # Agregar todos los meses del rango
+        while (year, month) <= (year_fin, month_fin):
+            periodos.add((year, month))
+            year, month = add_months(year, month, 1)
+
+    return sorted(periodos)
+
+
+def _process_data(
+    periodo, origen, reanudar=False, ventana=_VENTANA_REVISION, destinos=None
+):
     """
     Procesa la información basado en el periodo y origen especificado.
+
+    :param reanudar: Reanudar la ejecución anterior de todos los periodos,
+    descargando solo los bloques faltantes.
+    :param ventana: Meses de revisión del modo incremental.
+    :param destinos: Módulos donde se cargan los datos (por defecto la base de datos).
     """
+    destinos = destinos or [bd]
     origenes = (None, "BCN", "SIBOIF", "CONAMI")
     message = None
-    year, month = None, None
-    especifico = False
-    df_bcn = df_siboif = df_conami = pd.DataFrame()
+    periodos = []
+    trabajos = None
+
+    if periodo == "reintentar":
+        pendiente = reintentos.obtener()
+
+        if not pendiente:
+            print("No hay tareas para reintentar.")
+            return
+
+        # Repetir la ejecución anterior solo con las tareas fallidas
+        periodo, origen, ventana = (
+            pendiente["periodo"],
+            pendiente["origen"],
+            pendiente["ventana"],
+        )
+        trabajos = pendiente["trabajos"]
+        reanudar = periodo == "todos"
+
+        print(
+            f"Reintentando {len(trabajos)} tareas de la ejecución del",
+            pendiente["fecha"],
+        )
 
     if periodo == "todos":
         message = "Procesando todos los periodos"
     elif periodo == "ultimo":
         message = "Procesando el último periodo"
+    elif periodo == "incremental":
+        message = f"Procesando periodos nuevos (ventana de revisión: {ventana} meses)"
     else:
         try:
-            year, month = int(periodo[:4]), int(periodo[-2:])
-
-            if not (1 <= month <= 12):
-                raise ValueError("Mes inválido")
+            periodos = _parse_periodos(periodo)
         except ValueError:
             print("Se especificó un periodo inválido.")
             return
 
-        message = f"Procesando periodo: {year} - {month}"
-        especifico = True
+        if len(periodos) == 1:
+            message = "Procesando periodo: {} - {}".format(*periodos[0])
+        else:
+            message = "Procesando {} periodos: {} - {} a {} - {}".format(
+                len(periodos), *periodos[0], *periodos[-1]
+            )
 
     if origen not in origenes:
         print("Se especificó un origen inválido.")
         return
 
-    print(message)
+    if reanudar and periodo != "todos":
+        print("Solo se puede reanudar el procesamiento de todos los periodos.")
+        return
 
-    procesar_bcn, procesar_siboif, procesar_conami = _get_functions(periodo)
+    print(message)
 
-    if origen in (origenes[0], origenes[1]):
-        print("-" * 50)
-        print(f"Procesando {origenes[1]}...")
-        df_bcn = procesar_bcn(year, month) if especifico else procesar_bcn()
+    # Guardar el avance de cada bloque para poder reanudar si la ejecución falla
+    if periodo == "todos":
+        checkpoint.iniciar(reanudar)
 
-    if origen in (origenes[0], origenes[2]):
-        print("-" * 50)
-        print(f"Procesando {origenes[2]}...")
-        df_siboif = procesar_siboif(year, month) if especifico else procesar_siboif()
+    # Solo los orígenes especificados
+    planes = {
+        nombre: plan
+        for nombre, plan in _get_planes(periodo, periodos, ventana).items()
+        if origen in (None, nombre)
+    }
 
-    if origen in (origenes[0], origenes[3]):
-        print("-" * 50)
-        print(f"Procesando {origenes[3]}...")
-        df_conami = procesar_conami(year, month) if especifico else procesar_conami()
+    if trabajos is not None:
+        planes = _get_planes_reintento(planes, trabajos)
 
-    # Combine DataFrames
-    df = pd.concat([df_bcn, df_siboif, df_conami], ignore_index=True)
+    # Los reportes de la SIBOIF y la CONAMI se descargan al mismo tiempo,
+    # con el ritmo compartido de cada origen.
+    # Se validan los reportes seleccionados antes de iniciar la carga
+    try:
+        workers = _get_workers(planes)
+    except ValueError as e:
+        print(e)
+        return
 
-    # Update database
     print("-" * 50)
     print("Procesando base de datos...")
-    bd.actualizar(df)
+
+    if not _iniciar_carga(destinos):
+        return
+
+    # Los orígenes se descargan, procesan y cargan al mismo tiempo
+    print("-" * 50)
+    print(f"Procesando {', '.join(planes)}...")
+
+    resultado = pipeline.ejecutar(
+        planes, partial(_cargar, destinos, {}), workers=workers
+    )
+
+    print("-" * 50)
+    print("Registros cargados:", resultado["registros"])
+
+    # Las tareas completadas se cargan aunque otras fallen
+    if resultado["errores"]:
+        print("Tareas con error:", len(resultado["errores"]))
+
+        for origen_error, nombre, error in resultado["errores"]:
+            print(f"  {origen_error} {nombre}: {error}")
+
+    if resultado["registros"]:
+        print("Actualizando DW...")
+
+        # Si el DW no se actualiza se conservan las tareas a reintentar de la ejecución anterior
+        if not _finalizar_carga(destinos):
+            return
+
+        # Registrar el último periodo cargado de cada indicador, excepto en los orígenes
+        # con tareas fallidas: su watermark no avanza hasta cargar los periodos faltantes
+        origenes_error = {origen_error for origen_error, _, _ in resultado["errores"]}
+        periodos_cargados = resultado["periodos"]
+
+        if origenes_error:
+            print("No se actualiza el watermark de:", ", ".join(sorted(origenes_error)))
+
+        watermark.actualizar(
+            periodos_cargados[~periodos_cargados["ORIGEN"].isin(origenes_error)]
+        )
+
+        # Los bloques guardados ya no son necesarios una vez cargados en la base de datos
+        if periodo == "todos" and not resultado["errores"]:
+            checkpoint.limpiar()
+    else:
+        print("No se insertaron registros en la base de datos.")
+
+    # Guardar las tareas fallidas para reintentarlas en la siguiente ejecución
+    reintentos.guardar(periodo, origen, ventana, resultado["trabajos"])
+
+    if resultado["errores"]:
+        print("Para reintentar las tareas con error: py procesar.py reintentar")
 
     print("Fin!")
 
@@ -97,16 +410,132 @@ def main():
     Main
     """
 
-    periodo = "ultimo"
-    origen = None
+    parser = argparse.ArgumentParser(
+        description="Procesamiento de indicadores nacionales."
+    )
+    parser.add_argument(
+        "periodo",
+        nargs="?",
+        default="ultimo",
+        help='"ultimo", "todos", "incremental", "reintentar", "yyyymm", "yyyymm-yyyymm" o una lista separada por comas',
+    )
+    parser.add_argument(
+        "origen", nargs="?", default=None, help='"BCN", "SIBOIF" o "CONAMI"'
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reanudar la última ejecución de todos los periodos",
+    )
+
+    parser.add_argument(
+        "--ventana",
+        type=int,
+        default=_VENTANA_REVISION,
+        help="Meses de revisión del modo incremental",
+    )
+
+    parser.add_argument(
+        "--metricas",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="ARCHIVO",
+        help="Guardar métricas por etapa en un archivo JSON lines",
+    )
+    parser.add_argument(
+        "--resumen",
+        action="store_true",
+        help="Imprimir un resumen de las métricas al final (activa --metricas)",
+    )
+    parser.add_argument(
+        "--perfil",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIRECTORIO",
+        help="Perfilar cada etapa y guardar los archivos pstats y de asignaciones de memoria",
+    )
+    parser.add_argument(
+        "--guardar-archivos",
+        action="store_true",
+        help="Guardar en disco una copia de los archivos descargados (en segundo plano)",
+    )
+    parser.add_argument(
+        "--bd",
+        choices=list(bd.BACKENDS),
+        default=None,
+        help="Backend de la base de datos (por defecto DB_BACKEND o sqlserver)",
+    )
+    parser.add_argument(
+        "--exportar",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIRECTORIO",
+        help="Exportar los datos a archivos parquet o CSV particionados por origen y año",
+    )
+    parser.add_argument(
+        "--sin-bd",
+        action="store_true",
+        help="No cargar en la base de datos (requiere --exportar)",
+    )
+
+    args = parser.parse_args()
+
+    if args.sin_bd and args.exportar is None:
+        print("--sin-bd requiere --exportar.")
+        return
+
+    destinos = [] if args.sin_bd else [bd]
+
+    if args.exportar is not None:
+        exportacion.activar(args.exportar or None)
+        destinos.append(exportacion)
+
+    # Validar el backend antes de descargar datos
+    try:
+        if args.bd:
+            bd.usar(args.bd)
+        elif not args.sin_bd:
+            bd.get_backend()
+    except (ValueError, ImportError) as e:
+        print("Error en el backend de la base de datos:", e)
+        return
+
+    if args.metricas is not None or args.resumen:
+        file_path = metricas.activar(args.metricas)
+        print("Métricas:", file_path)
+
+    if args.guardar_archivos:
+        archivos.activar()
+
+    if args.perfil is not None:
+        dir_path = perfil.activar(args.perfil)
+        print("Perfiles:", dir_path)
+
+    try:
+        with metricas.medir("ejecucion", periodo=args.periodo, origen=args.origen):
+            _process_data(
+                args.periodo, args.origen, args.resume, args.ventana, destinos
+            )
+    finally:
+        if args.resumen:
+            print("-" * 50)
+            metricas.imprimir_resumen()
+
+        if args.perfil is not None:
+            print("-" * 50)
+            perfil.imprimir_resumen()
+            perfil.desactivar()
 
-    if len(sys.argv) > 1:
-        periodo = sys.argv[1]
+        metricas.desactivar()
 
-    if len(sys.argv) > 2:
-        origen = sys.argv[2]
+        # Iniciar la siguiente ejecución con el último ritmo de cada origen
+        ritmo.guardar()
 
-    _process_data(periodo, origen)
+        # Terminar de escribir los archivos descargados
+        archivos.esperar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+Modulo para guardar las tareas (reporte o periodo) que fallaron en la última ejecución.\n
+Las tareas fallidas se guardan en `reintentos.json` junto con los parámetros
+de la ejecución, de modo que la siguiente ejecución pueda procesar solo esas tareas
+sin repetir las que se cargaron correctamente:\n
+    py procesar.py reintentar
+
+Ejemplo:\n
+    {
+        "fecha": "2024-07-01T08:00:00",
+        "periodo": "todos",
+        "origen": null,
+        "ventana": 6,
+        "trabajos": [
+            { "origen": "BCN", "nombre": "Remesas Mensuales", "estado": "error",
+              "intentos": 3, "error": "..." }
+        ]
+    }
+"""
+
+import os
+import json
+from datetime import datetime
+from typing import Optional
+
+_REINTENTOS_FILE = os.path.join(os.path.dirname(__file__), "reintentos.json")
+
+# Nombre del trabajo que representa la planificación completa de un origen
+TRABAJO_PLAN = "plan"
+
+
+def obtener() -> Optional[dict]:
+    """
+    Devuelve la ejecución con tareas fallidas guardada, o `None` si no existe.
+    """
+
+    if not os.path.exists(_REINTENTOS_FILE):
+        return None
+
+    try:
+        with open(_REINTENTOS_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print("No se pudo leer las tareas a reintentar:", e)
+        return None
+
+
+def guardar(periodo: str, origen: Optional[str], ventana: int, trabajos: list[dict]):
+    """
+    Guarda las tareas fallidas de la ejecución. Si no hay tareas fallidas
+    se elimina el archivo de la ejecución anterior.
+
+    :param periodo: Periodo de la ejecución (e.g. todos, ultimo, 202403).
+    :param origen: Origen de la ejecución (opcional).
+    :param ventana: Meses de revisión del modo incremental.
+    :param trabajos: Lista de trabajos de la ejecución (ver `pipeline.ejecutar`).
+    """
+
+    fallidos = [trabajo for trabajo in trabajos if trabajo["estado"] == "error"]
+
+    if not fallidos:
+        limpiar()
+        return
+
+    datos = {
+        "fecha": datetime.now().isoformat(),
+        "periodo": periodo,
+        "origen": origen,
+        "ventana": ventana,
+        "trabajos": fallidos,
+    }
+
+    temp_path = _REINTENTOS_FILE + ".tmp"
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(datos, file, ensure_ascii=False, indent=2)
+
+    os.replace(temp_path, _REINTENTOS_FILE)
+
+
+def limpiar():
+    """
+    Elimina las tareas fallidas guardadas.
+    """
+
+    if os.path.exists(_REINTENTOS_FILE):
+        os.remove(_REINTENTOS_FILE)
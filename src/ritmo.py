@@ -0,0 +1,217 @@
+"""
+Modulo para controlar el ritmo de las peticiones a cada origen (AIMD).\n
+Cada origen tiene una tasa de peticiones por segundo que:\n
+- Aumenta de forma aditiva con cada respuesta correcta.
+- Se reduce a la mitad con cada respuesta 429 o 503, esperando el `Retry-After` si se envía.
+- Se reduce cuando la latencia supera varias veces la latencia media del origen.
+
+La tasa y la latencia media se guardan en `ritmo.json` para iniciar la siguiente
+ejecución con el último ritmo seguro:\n
+    {
+        "BCN": { "tasa": 0.8, "latencia": 0.35 },
+        "SIBOIF": { "tasa": 3.2, "latencia": 1.1 }
+    }
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+_RITMO_FILE = os.path.join(os.path.dirname(__file__), "ritmo.json")
+
+# Tasa inicial (peticiones por segundo) de cada origen cuando no hay un ritmo guardado
+TASAS_INICIALES = {
+    "BCN": 0.2,
+    "SIBOIF": 2.0,
+    "CONAMI": 2.0,
+}
+
+# Tasa máxima de cada origen. El sitio del BCN bloquea las peticiones frecuentes
+# sin responder 429/503, por lo que no se supera una petición cada 3 segundos
+TASAS_MAXIMAS = {
+    "BCN": 1 / 3,
+}
+
+TASA_MINIMA = 0.05
+TASA_MAXIMA = 10.0
+
+# Aumento de la tasa por cada respuesta correcta
+INCREMENTO = 0.1
+
+# Factor de reducción ante una respuesta 429/503 y ante un pico de latencia
+REDUCCION = 0.5
+REDUCCION_LATENCIA = 0.75
+
+# Una latencia mayor a este múltiplo de la latencia media se considera un pico
+FACTOR_PICO = 3.0
+
+# Espera máxima de un `Retry-After` en segundos
+ESPERA_MAXIMA = 300
+
+# Estados HTTP que indican que el servidor está saturado
+ESTADOS_SATURACION = (429, 503)
+
+
+class _Ritmo:
+    """
+    Ritmo de las peticiones de un origen.
+    """
+
+    def __init__(
+        self, tasa: float, latencia: float | None = None, maxima: float = TASA_MAXIMA
+    ):
+        self.tasa = min(tasa, maxima)
+        self.maxima = maxima
+        self.latencia = latencia
+        self.siguiente = 0.0
+        self.lock = threading.Lock()
+
+    def esperar(self):
+        """
+        Espera el turno de la siguiente petición según la tasa actual.
+        """
+
+        with self.lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self.siguiente)
+            self.siguiente = turno + 1 / self.tasa
+
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+    def registrar(self, status: int, latencia: float, retry_after: float | None):
+        """
+        Ajusta la tasa según la respuesta del servidor.
+        """
+
+        with self.lock:
+            if status in ESTADOS_SATURACION:
+                self.tasa = max(TASA_MINIMA, self.tasa * REDUCCION)
+
+                if retry_after:
+                    self.siguiente = max(self.siguiente, time.monotonic() + retry_after)
+
+                return
+
+            if self.latencia and latencia > self.latencia * FACTOR_PICO:
+                self.tasa = max(TASA_MINIMA, self.tasa * REDUCCION_LATENCIA)
+            elif status < 500:
+                self.tasa = min(self.maxima, self.tasa + INCREMENTO)
+
+            # Latencia media móvil
+            if self.latencia is None:
+                self.latencia = latencia
+            else:
+                self.latencia = self.latencia * 0.8 + latencia * 0.2
+
+
+_ritmos: dict[str, _Ritmo] = {}
+_lock = threading.Lock()
+
+
+def _cargar() -> dict:
+    """
+    Lee los ritmos guardados.
+    """
+
+    if not os.path.exists(_RITMO_FILE):
+        return {}
+
+    try:
+        with open(_RITMO_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print("No se pudo leer el ritmo de las peticiones:", e)
+        return {}
+
+
+def _get_ritmo(origen: str) -> _Ritmo:
+    """
+    Devuelve el ritmo del origen, iniciándolo con el ritmo guardado si existe
+    (sin superar la tasa máxima del origen).
+    """
+
+    with _lock:
+        if origen not in _ritmos:
+            guardado = _cargar().get(origen, {})
+
+            _ritmos[origen] = _Ritmo(
+                guardado.get("tasa", TASAS_INICIALES.get(origen, 1.0)),
+                guardado.get("latencia"),
+                TASAS_MAXIMAS.get(origen, TASA_MAXIMA),
+            )
+
+        return _ritmos[origen]
+
+
+def get_retry_after(valor: str | None) -> float | None:
+    """
+    Devuelve los segundos de espera del encabezado `Retry-After`
+    (en segundos o como fecha HTTP), o `None` si no se envía o no es válido.
+    """
+
+    if not valor:
+        return None
+
+    try:
+        segundos = float(valor)
+    except ValueError:
+        try:
+            fecha = parsedate_to_datetime(valor)
+        except (TypeError, ValueError):
+            return None
+
+        segundos = (fecha - datetime.now(timezone.utc)).total_seconds()
+
+    return min(max(segundos, 0.0), ESPERA_MAXIMA)
+
+
+def esperar(origen: str):
+    """
+    Espera el turno de la siguiente petición al origen especificado.
+    """
+
+    _get_ritmo(origen).esperar()
+
+
+def registrar(
+    origen: str, status: int, latencia: float, retry_after: float | None = None
+):
+    """
+    Ajusta el ritmo del origen según la respuesta del servidor.
+
+    :param origen: Origen de los datos (e.g. BCN).
+    :param status: Estado HTTP de la respuesta.
+    :param latencia: Segundos hasta recibir los encabezados de la respuesta.
+    :param retry_after: Segundos de espera solicitados por el servidor (opcional).
+    """
+
+    _get_ritmo(origen).registrar(status, latencia, retry_after)
+
+
+def guardar():
+    """
+    Guarda el ritmo actual de cada origen para la siguiente ejecución.
+    """
+
+    with _lock:
+        if not _ritmos:
+            return
+
+        ritmos = _cargar()
+
+        for origen, ritmo in _ritmos.items():
+            ritmos[origen] = {
+                "tasa": round(ritmo.tasa, 4),
+                "latencia": round(ritmo.latencia, 4) if ritmo.latencia else None,
+            }
+
+        temp_path = _RITMO_FILE + ".tmp"
+
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(ritmos, file, ensure_ascii=False, indent=2)
+
+        os.replace(temp_path, _RITMO_FILE)
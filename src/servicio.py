@@ -0,0 +1,359 @@
+"""
+Servicio HTTP local de solo lectura para consultar los indicadores del DW
+(ver `consultas`), sin dependencias adicionales.\n
+- `GET /series?indicador=ACTIVO&institucion=...&origen=...&desde=202001&hasta=202412`:
+  serie mensual del indicador, una columna por institución.
+- `GET /ultimo?indicador=ACTIVO&indicador=PASIVO&institucion=...&origen=...`:
+  último valor de cada indicador e institución.
+
+Las respuestas son JSON, o CSV con `formato=csv` (o `Accept: text/csv`).\n
+Cada respuesta tiene un ETag fuerte derivado de la última carga del DW y de la consulta,
+y se guarda en una caché en memoria. Si el cliente envía `If-None-Match` con el ETag vigente
+se responde 304 sin consultar la base de datos (la última carga se revisa como máximo
+cada `CONSULTAS_INTERVALO` segundos).\n
+Uso (desde el directorio `src`):\n
+    py servicio.py --puerto 8080
+    py servicio.py --puerto 8080 --bd sqlite
+
+La caché de respuestas se configura con la variable de entorno:\n
+    SERVICIO_CACHE=256
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+from dotenv import load_dotenv
+import bd
+import consultas
+
+load_dotenv()
+
+# Cantidad de respuestas guardadas en la caché
+_TAM_CACHE = int(os.getenv("SERVICIO_CACHE") or 256)
+
+# Tipo de contenido de cada formato
+_FORMATOS = {
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Parámetros aceptados por cada ruta
+_PARAMETROS = {
+    "/series": {"indicador", "institucion", "origen", "desde", "hasta", "formato"},
+    "/ultimo": {"indicador", "institucion", "origen", "formato"},
+}
+
+# Respuestas guardadas: llave de la consulta -> (lote, contenido)
+_cache: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+
+
+def _parse_periodo(texto: str) -> tuple[int, int]:
+    """
+    Devuelve el año y mes de un periodo en formato yyyymm.
+
+    :raises ValueError: Si el periodo es inválido.
+    """
+
+    if len(texto) != 6 or not texto.isdigit() or not 1 <= int(texto[-2:]) <= 12:
+        raise ValueError(f"Periodo inválido: {texto}")
+
+    return int(texto[:4]), int(texto[-2:])
+
+
+def _get_valor(parametros: dict, nombre: str) -> str | None:
+    """
+    Devuelve el único valor del parámetro.
+
+    :raises ValueError: Si el parámetro se especificó más de una vez.
+    """
+
+    valores = parametros.get(nombre)
+
+    if not valores:
+        return None
+
+    if len(valores) > 1:
+        raise ValueError(f"El parámetro {nombre} solo acepta un valor")
+
+    return valores[0]
+
+
+def _series(parametros: dict, formato: str) -> bytes:
+    """
+    Devuelve la serie mensual del indicador en el formato especificado.
+    """
+
+    indicador = _get_valor(parametros, "indicador")
+
+    if not indicador:
+        raise ValueError("Se debe especificar el indicador")
+
+    desde = _get_valor(parametros, "desde")
+    hasta = _get_valor(parametros, "hasta")
+
+    df = consultas.get_series(
+        indicador,
+        institucion=_get_valor(parametros, "institucion"),
+        desde=_parse_periodo(desde) if desde else None,
+        hasta=_parse_periodo(hasta) if hasta else None,
+        origen=_get_valor(parametros, "origen"),
+    )
+
+    if formato == "csv":
+        return df.to_csv(index_label="PERIODO").encode()
+
+    # Los periodos sin valor se devuelven como null
+    valores = df.astype(object).where(df.notna(), None)
+
+    return json.dumps(
+        {
+            "indicador": indicador,
+            "periodos": [str(periodo) for periodo in df.index],
+            "series": {
+                institucion: valores[institucion].tolist()
+                for institucion in valores.columns
+            },
+        },
+        ensure_ascii=False,
+    ).encode()
+
+
+def _ultimo(parametros: dict, formato: str) -> bytes:
+    """
+    Devuelve el último valor de cada indicador e institución en el formato especificado.
+    """
+
+    if not parametros.get("indicador"):
+        raise ValueError("Se debe especificar el indicador")
+
+    df = consultas.get_panel(
+        indicadores=parametros["indicador"],
+        instituciones=parametros.get("institucion"),
+        origenes=parametros.get("origen"),
+    )
+
+    # Los valores están ordenados por periodo dentro de cada serie
+    df = df.groupby(["ORIGEN", "INSTITUCION", "INDICADOR"], sort=False).tail(1)
+
+    if formato == "csv":
+        return df.to_csv(index=False).encode()
+
+    return json.dumps(
+        df.astype({"ANIO": int, "MES": int, "VALOR": float}).to_dict("records"),
+        ensure_ascii=False,
+    ).encode()
+
+
+_RUTAS = {
+    "/series": _series,
+    "/ultimo": _ultimo,
+}
+
+
+def _get_etag(lote, clave: tuple) -> str:
+    """
+    Devuelve el ETag de la consulta para la carga especificada.
+    """
+
+    digest = hashlib.sha1(repr(clave).encode()).hexdigest()[:16]
+
+    return f'"{lote}-{digest}"'
+
+
+def _get_contenido(clave: tuple, lote) -> bytes:
+    """
+    Devuelve el contenido de la consulta desde la caché o la base de datos.
+    """
+
+    with _lock:
+        respuesta = _cache.get(clave)
+
+        if respuesta and respuesta[0] == lote:
+            _cache.move_to_end(clave)
+            return respuesta[1]
+
+    ruta, parametros, formato = clave
+    content = _RUTAS[ruta](parse_qs(parametros), formato)
+
+    with _lock:
+        _cache[clave] = (lote, content)
+        _cache.move_to_end(clave)
+
+        if len(_cache) > _TAM_CACHE:
+            _cache.popitem(last=False)
+
+    return content
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Atiende las consultas de series y últimos valores.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # Las peticiones HEAD solo reciben los encabezados
+    _enviar_contenido = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        # No imprimir cada petición (los clientes consultan con frecuencia)
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._atender()
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        self._atender(contenido=False)
+
+    def _atender(self, contenido: bool = True):
+        self._enviar_contenido = contenido
+
+        partes = urlsplit(self.path)
+        ruta = partes.path.rstrip("/")
+
+        if ruta not in _RUTAS:
+            self._responder_error(404, "Ruta no encontrada")
+            return
+
+        parametros = parse_qs(partes.query)
+
+        desconocidos = set(parametros) - _PARAMETROS[ruta]
+
+        if desconocidos:
+            self._responder_error(
+                400, f"Parámetros inválidos: {', '.join(sorted(desconocidos))}"
+            )
+            return
+
+        formato = _get_formato(parametros, self.headers.get("Accept", ""))
+
+        if formato not in _FORMATOS:
+            self._responder_error(400, f"Formato inválido ({', '.join(_FORMATOS)})")
+            return
+
+        # El formato forma parte de la llave pero no de los parámetros de la consulta
+        parametros.pop("formato", None)
+
+        # Parámetros ordenados para que la misma consulta tenga la misma llave
+        clave = (ruta, urlencode(sorted(parametros.items()), doseq=True), formato)
+
+        try:
+            lote = consultas.get_lote_vigente()
+            etag = _get_etag(lote, clave)
+            # El formato se negocia con Accept, por lo que las cachés deben separar por él
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+
+            # El ETag depende solo de la carga y la consulta: no se consulta la base de datos
+            if etag in _parse_etags(self.headers.get("If-None-Match", "")):
+                self._responder(304, b"", headers=headers)
+                return
+
+            content = _get_contenido(clave, lote)
+        except ValueError as e:
+            self._responder_error(400, str(e))
+            return
+        except Exception as e:
+            self._responder_error(500, f"Error al consultar la base de datos: {e}")
+            return
+
+        self._responder(200, content, _FORMATOS[formato], headers)
+
+    def _responder(
+        self,
+        status: int,
+        content: bytes,
+        content_type: str | None = None,
+        headers: dict | None = None,
+    ):
+        self.send_response(status)
+
+        if content_type:
+            self.send_header("Content-Type", content_type)
+
+        # Las respuestas 304 no tienen contenido
+        if status != 304:
+            self.send_header("Content-Length", str(len(content)))
+
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+
+        self.end_headers()
+
+        if self._enviar_contenido:
+            self.wfile.write(content)
+
+    def _responder_error(self, status: int, mensaje: str):
+        content = json.dumps({"error": mensaje}, ensure_ascii=False).encode()
+        self._responder(status, content, _FORMATOS["json"])
+
+
+def _get_formato(parametros: dict, accept: str) -> str:
+    """
+    Devuelve el formato del parámetro `formato` o del encabezado `Accept` (por defecto json).
+    """
+
+    formatos = parametros.get("formato")
+
+    if formatos:
+        return formatos[-1].lower()
+
+    return "csv" if "text/csv" in accept else "json"
+
+
+def _parse_etags(if_none_match: str) -> set[str]:
+    """
+    Devuelve los ETags del encabezado `If-None-Match`.
+    """
+
+    return {etag.strip() for etag in if_none_match.split(",") if etag.strip()}
+
+
+def main():
+    """
+    Función principal del servicio.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Servicio HTTP de consulta de indicadores."
+    )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección del servicio.")
+    parser.add_argument("--puerto", type=int, default=8080, help="Puerto del servicio.")
+    parser.add_argument(
+        "--bd",
+        choices=list(bd.BACKENDS),
+        default=None,
+        help="Backend de la base de datos (por defecto DB_BACKEND o sqlserver)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if args.bd:
+            bd.usar(args.bd)
+        else:
+            bd.get_backend()
+    except (ValueError, ImportError) as e:
+        print("Error en el backend de la base de datos:", e)
+        return
+
+    server = ThreadingHTTPServer((args.host, args.puerto), Handler)
+
+    print(f"Servicio en http://{args.host}:{args.puerto} (Ctrl+C para detener)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,16 @@
 Modulo para obtener datos de la **SIBOIF**.
 """
 
-from siboif.main import get_periodo, get_all_periodos, get_last_periodo
+from siboif.main import (
+    get_periodo,
+    get_all_periodos,
+    get_last_periodo,
+    get_rango_periodos,
+    get_periodos,
+    get_tareas_all_periodos,
+    get_tareas_last_periodo,
+    get_tareas_rango_periodos,
+    get_tareas_periodos,
+    get_tareas_matriz,
+    get_workers,
+)
@@ -1,67 +1,116 @@
 """
-Modulo para obtener datos de la **SIBOIF**.
+Modulo para obtener datos de la **SIBOIF**.\n
+Cada combinación de reporte (intendencia y tipo de reporte, ver `siboif.reportes`)
+y rango de periodos es una tarea independiente, de modo que las consultas de todos
+los reportes se descargan al mismo tiempo en el ejecutor por etapas (ver `pipeline`).
 """
 
 import os
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import partial
+from operator import itemgetter
 from typing import Optional
-import requests
+import numpy as np
 import pandas as pd
-from utils import get_date_str
+import descarga
+import pipeline
+from siboif.reportes import reportes_list, get_reportes
+from utils import get_date_str, get_period_ranges
 
 # Añó mínimo con información disponible en el servicio web de la SIBOIF
 _INITIAL_YEAR = 2017
 
+# Hilos de descarga por reporte, para que agregar reportes no multiplique la duración.
+# El total de peticiones se mantiene limitado por el ritmo de la SIBOIF (ver `ritmo`).
+_WORKERS_REPORTE = 2
 
-def _fetch_data(year: int, month: int):
+
+def _fetch_data(
+    year: int,
+    month: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+    reporte: Optional[dict] = None,
+):
     """
     Devuelve un JSON con la información del servicio web de la SIBOIF.
+    Si se especifica el periodo final, se consulta el rango de periodos en una sola petición.
 
     :param year: Año del periodo.
     :param month: Mes del periodo.
+    :param year_fin: Año del periodo final (opcional).
+    :param month_fin: Mes del periodo final (opcional).
+    :param reporte: Especificación del reporte (opcional, por defecto el primero de la lista).
+
+    :return: Arreglo JSON con los datos (vacío si no hay datos).
+    :rtype: JSON
 
-    :return: Arreglo JSON con los datos o `None` si no hay datos.
-    :rtype: JSON | None
+    :raises ErrorDescarga: Si la respuesta no es satisfactoria.
     """
 
     fecha_ini = fecha_fin = get_date_str(year, month)
 
+    if year_fin and month_fin:
+        fecha_fin = get_date_str(year_fin, month_fin)
+
     base_url = "https://www.siboif.gob.ni/rest/estadisticas"
     headers = {"User-Agent": "Python bot 1.0"}
 
     current_dir = os.path.dirname(__file__)
     cert_path = os.path.join(current_dir, "cert/siboif_chain.crt")
 
-    intendencia = "Bancos"
-    tipo_reporte = "Estado de Situación Financiera (ESF)"
+    reporte = reporte or reportes_list[0]
+    intendencia = reporte["intendencia"]
+    tipo_reporte = reporte["tipo_reporte"]
 
     url = rf"{base_url}?intendencia={intendencia}&fecha[min]={fecha_ini}&fecha[max]={fecha_fin}&tipo_reporte={tipo_reporte}"
 
     # Deshabilitar warnings de SSL
     # urllib3.disable_warnings()
 
-    response = requests.get(url, headers=headers, timeout=60, verify=cert_path)
+    response = descarga.get(
+        url, "SIBOIF", headers=headers, timeout=60, verify=cert_path
+    )
     # response = requests.get(url, headers=headers, verify="siboif.crt")
 
     # Restaurar warnings
     # warnings.resetwarnings()
 
-    # Si la respuesta no es satisfactoria devolver vacío
+    # Si la respuesta no es satisfactoria generar error, para no confundirlo con un periodo sin datos
     if response.status_code != 200:
-        print("Error al consultar servicio web SIBOIF:", response.status_code)
-        return None
+        raise descarga.ErrorDescarga(
+            f"Error al consultar servicio web SIBOIF: {response.status_code}"
+        )
 
     # Devolver datos
     return response.json()
 
 
-def _process_data(data, institucion: Optional[str] = None):
+def _codificar(valores: list) -> tuple[np.ndarray, pd.Series]:
+    """
+    Codifica los valores y los convierte a mayúsculas una sola vez por valor distinto,
+    en lugar de una vez por registro.
+
+    :return: Código de cada valor (-1 si es nulo) y valores distintos en mayúsculas.
+    """
+
+    codigos, unicos = pd.factorize(np.array(valores, dtype=object))
+
+    return codigos, pd.Series(unicos, dtype=object).str.upper()
+
+
+def _process_data(
+    data, institucion: Optional[str] = None, reporte: Optional[dict] = None
+):
     """
-    Procesa los datos y devuelve el DataFrame filtrado opcionalmente por institución.
+    Procesa los datos y devuelve el DataFrame filtrado opcionalmente por institución.\n
+    Los registros se filtran antes de crear el DataFrame, de modo que la memoria y el tiempo
+    dependen de los registros que se conservan y no de todos los que devuelve el servicio.
 
     :param data: Arreglo JSON.
     :param institucion: Institución a filtrar (opcional).
+    :param reporte: Especificación del reporte (opcional, por defecto el primero de la lista).
 
     :return: pandas DataFrame.
     """
@@ -71,18 +120,22 @@ def _process_data(data, institucion: Optional[str] = None):
         Enum para los nombres de columnas del DataFrame.
         """
 
-        # Nombre de columnas para trabajar con el df original
+        # Nombre de los campos de los registros originales
         FECHA = "fecha"
+        INSTITUCION_ORIGEN = "institucion"
         VARIABLE = "variable_1"
-        VALOR = "valor_1"
+        VALOR_ORIGEN = "valor_1"
         # Nombre de columnas para el df resultado
         ORIGEN = "ORIGEN"
         INSTITUCION = "INSTITUCION"
+        INDICADOR = "INDICADOR"
         ANIO = "ANIO"
         MES = "MES"
+        VALOR = "VALOR"
 
-    instituciones_a_omitir = ["SFB", "SF", "SFN"]
-    variables_a_devolver = ["ACTIVO", "PASIVO", "PATRIMONIO"]
+    reporte = reporte or reportes_list[0]
+    instituciones_a_omitir = reporte["instituciones_a_omitir"]
+    variables_a_devolver = reporte["variables"]
 
     # Se define un DataFrame vacío para devolverlo en caso de que el servicio no devuelva datos
     # y también para usar sus columnas de plantilla para el DataFrame final.
@@ -90,87 +143,98 @@ def _process_data(data, institucion: Optional[str] = None):
         columns=[
             Columna.ORIGEN.value,
             Columna.INSTITUCION.value,
-            "INDICADOR",
+            Columna.INDICADOR.value,
             Columna.ANIO.value,
             Columna.MES.value,
-            "VALOR",
+            Columna.VALOR.value,
         ]
     )
 
     if not data:
         return df_empty
 
-    df_data = pd.DataFrame(data)
-
-    # Renombrar columna 'institucion'
-    df_data.rename(columns={"institucion": Columna.INSTITUCION.value}, inplace=True)
-
-    # Filtro por defecto para quitar las instituciones para valores totalizados
-    filtro_institucion = (
-        ~df_data[Columna.INSTITUCION.value]
-        .str.strip()
-        .str.upper()
-        .isin(instituciones_a_omitir)
+    # Convertir institución y variable a mayúsculas
+    # Esto para generar consistencia en los datos
+    instituciones, instituciones_unicas = _codificar(
+        list(map(itemgetter(Columna.INSTITUCION_ORIGEN.value), data))
     )
-
-    # Filtro de variables a obtener
-    filtro_variables = (
-        df_data[Columna.VARIABLE.value]
-        .str.strip()
-        .str.upper()
-        .isin(variables_a_devolver)
+    variables, variables_unicas = _codificar(
+        list(map(itemgetter(Columna.VARIABLE.value), data))
     )
 
+    # Filtro por defecto para quitar las instituciones para valores totalizados
+    filtro_institucion = ~instituciones_unicas.str.strip().isin(instituciones_a_omitir)
+
     # Filtrar la institución si se especifica
     if institucion:
-        filtro_institucion = filtro_institucion & (
-            df_data[Columna.INSTITUCION.value].str.strip().str.upper()
-            == institucion.strip().upper()
+        filtro_institucion &= (
+            instituciones_unicas.str.strip() == institucion.strip().upper()
         )
 
-    # Aplicar filtros
-    df_data = df_data[filtro_institucion & filtro_variables]
+    # Filtro de variables a obtener (todas si no se especifican)
+    if variables_a_devolver is None:
+        filtro_variables = variables_unicas.notna()
+    else:
+        filtro_variables = variables_unicas.str.strip().isin(variables_a_devolver)
+
+    # Los filtros se evalúan por valor distinto y se aplican a los registros por su código
+    # (los valores nulos, con código -1, se descartan)
+    filtro = (
+        np.append(filtro_institucion.to_numpy(), False)[instituciones]
+        & np.append(filtro_variables.to_numpy(), False)[variables]
+    )
 
-    # Convertir institución y variable a mayúsculas
-    # Esto para generar consistencia en los datos
-    df_data[Columna.INSTITUCION.value] = df_data[Columna.INSTITUCION.value].str.upper()
-    df_data[Columna.VARIABLE.value] = df_data[Columna.VARIABLE.value].str.upper()
+    indices = np.flatnonzero(filtro)
 
-    # Convertir columna 'fecha' en datetime
-    df_data[Columna.FECHA.value] = pd.to_datetime(df_data[Columna.FECHA.value])
+    if not indices.size:
+        return df_empty
 
-    # Convertir la columna valor a float
-    df_data[Columna.VALOR.value] = (
-        df_data[Columna.VALOR.value].str.replace(",", "").astype(float)
-    )
+    registros = [data[indice] for indice in indices.tolist()]
+    instituciones = instituciones[indices]
+    variables = variables[indices]
 
-    # Agregar columnas requeridas
-    df_data[Columna.ORIGEN.value] = "SIBOIF"
-    df_data[Columna.ANIO.value] = df_data[Columna.FECHA.value].dt.year
-    df_data[Columna.MES.value] = df_data[Columna.FECHA.value].dt.month
+    # Convertir las fechas distintas y asignar su año y mes a cada registro
+    fechas, fechas_unicas = pd.factorize(
+        np.array(list(map(itemgetter(Columna.FECHA.value), registros)), dtype=object)
+    )
+    fechas_unicas = pd.to_datetime(fechas_unicas)
 
-    # Seleccionar columnas a devolver
-    df_data = df_data[
-        [
-            Columna.ORIGEN.value,
-            Columna.INSTITUCION.value,
-            Columna.VARIABLE.value,
-            Columna.ANIO.value,
-            Columna.MES.value,
-            Columna.VALOR.value,
-        ]
-    ]
+    # Convertir los valores a float en bloque, quitando el separador de miles
+    valores = (
+        pd.Series(
+            list(map(itemgetter(Columna.VALOR_ORIGEN.value), registros)),
+            dtype=object,
+        )
+        .str.replace(",", "", regex=False)
+        .astype(float)
+    )
 
-    # Resetear indices
-    df_data = df_data.reset_index(drop=True)
+    # Nombre del indicador de cada variable distinta
+    indicadores = variables_unicas.map(
+        lambda variable: reporte["indicador"].format(variable=variable),
+        na_action="ignore",
+    )
 
-    # Renombrar columnas de acuerdo a plantilla
-    df_data.columns = df_empty.columns
+    df_data = pd.DataFrame(
+        {
+            Columna.ORIGEN.value: "SIBOIF",
+            Columna.INSTITUCION.value: instituciones_unicas.to_numpy()[instituciones],
+            Columna.INDICADOR.value: indicadores.to_numpy()[variables],
+            Columna.ANIO.value: fechas_unicas.year.to_numpy()[fechas],
+            Columna.MES.value: fechas_unicas.month.to_numpy()[fechas],
+            Columna.VALOR.value: valores.to_numpy(),
+        }
+    )
 
     return df_data
 
 
-def get_periodo(year: int, month: int, institucion: Optional[str] = None):
+def get_periodo(
+    year: int,
+    month: int,
+    institucion: Optional[str] = None,
+    reporte: Optional[dict] = None,
+):
     """
     Devuelve un DataFrame con los datos de la SIBOIF para el periodo especificado,
     filtrado opcionalmente por institución.
@@ -178,69 +242,231 @@ def get_periodo(year: int, month: int, institucion: Optional[str] = None):
     :param year: Año del periodo.
     :param month: Mes del periodo (1-12).
     :param institucion: Nombre de la institución (opcional).
+    :param reporte: Especificación del reporte (opcional, por defecto el primero de la lista).
 
     :return: pandas DataFrame.
     """
 
     # Obtener los datos
-    data = _fetch_data(year, month)
+    data = _fetch_data(year, month, reporte=reporte)
 
     # Procesar los datos
-    df = _process_data(data, institucion)
+    df = _process_data(data, institucion, reporte)
 
     return df
 
 
+def _fetch_last_data(reporte: Optional[dict] = None):
+    """
+    Devuelve un JSON con la información del último periodo disponible del reporte,
+    consultando desde la fecha actual hacía atrás.
+    """
+
+    date = datetime.now().date()
+
+    # Consultar desde la fecha actual hacía atrás hasta encontrar datos del último periodo disponible
+    # teniendo como limite el año mínimo de información disponible
+    while date.year >= _INITIAL_YEAR:
+        # Restar días de la fecha para obtener el mes anterior
+        date = date - timedelta(days=date.day)
+
+        data = _fetch_data(date.year, date.month, reporte=reporte)
+
+        # Si se encontró datos, salir del ciclo
+        if data:
+            print("Último periodo:", date.year, date.month)
+            return data
+
+    return None
+
+
+def _get_tarea(
+    reporte: dict, year: int, month: int, year_fin: int, month_fin: int
+) -> dict:
+    """
+    Devuelve la tarea para consultar el rango de periodos especificado del reporte
+    en una sola petición.
+    """
+
+    nombre = f"{reporte['name']} {year}{month:02d}"
+
+    if (year_fin, month_fin) != (year, month):
+        nombre += f"-{year_fin}{month_fin:02d}"
+
+    return {
+        "origen": "SIBOIF",
+        "nombre": nombre,
+        "descargar": partial(
+            _fetch_data, year, month, year_fin, month_fin, reporte=reporte
+        ),
+        "procesar": partial(_process_data, reporte=reporte),
+    }
+
+
+def get_tareas_matriz(
+    rangos: list[tuple[tuple[int, int], tuple[int, int]]],
+    reportes: Optional[list[dict]] = None,
+):
+    """
+    Devuelve una tarea por cada combinación de reporte y rango de periodos.\n
+    Las tareas se intercalan por rango, de modo que los hilos de descarga consultan
+    todos los reportes al mismo tiempo y agregar reportes no multiplica la duración.
+
+    :param rangos: Lista de rangos de periodos ((año, mes) inicial, (año, mes) final).
+    :param reportes: Especificaciones de los reportes (opcional, ver `siboif.reportes.get_reportes`).
+    """
+
+    if reportes is None:
+        reportes = get_reportes()
+
+    return [
+        _get_tarea(reporte, year, month, year_fin, month_fin)
+        for (year, month), (year_fin, month_fin) in rangos
+        for reporte in reportes
+    ]
+
+
+def get_workers() -> int:
+    """
+    Devuelve la cantidad de hilos de descarga según los reportes a procesar.
+
+    :raises ValueError: Si se especifica un reporte que no existe.
+    """
+
+    return _WORKERS_REPORTE * len(get_reportes())
+
+
+def get_tareas_all_periodos():
+    """
+    Devuelve las tareas para obtener los datos de la SIBOIF de todos los periodos disponibles.
+    """
+
+    return get_tareas_rango_periodos(_INITIAL_YEAR, 1)
+
+
+def get_tareas_last_periodo():
+    """
+    Devuelve las tareas para obtener los datos de la SIBOIF del último periodo disponible
+    de cada reporte.
+    """
+
+    return [
+        {
+            "origen": "SIBOIF",
+            "nombre": f"{reporte['name']} ultimo",
+            "descargar": partial(_fetch_last_data, reporte),
+            "procesar": partial(_process_data, reporte=reporte),
+        }
+        for reporte in get_reportes()
+    ]
+
+
+def get_tareas_rango_periodos(
+    year_ini: int,
+    month_ini: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+):
+    """
+    Devuelve las tareas para obtener los datos de la SIBOIF del rango de periodos especificado,
+    una consulta por rango de fechas para cada año y reporte.
+
+    :param year_ini: Año del periodo inicial.
+    :param month_ini: Mes del periodo inicial (1-12).
+    :param year_fin: Año del periodo final (opcional, por defecto el mes actual).
+    :param month_fin: Mes del periodo final (opcional).
+    """
+
+    if not (year_fin and month_fin):
+        date = datetime.now().date()
+        year_fin, month_fin = date.year, date.month
+
+    # No hay información antes del año mínimo
+    if year_ini < _INITIAL_YEAR:
+        year_ini, month_ini = _INITIAL_YEAR, 1
+
+    rangos = []
+
+    for year in range(year_ini, year_fin + 1):
+        desde = month_ini if year == year_ini else 1
+        hasta = month_fin if year == year_fin else 12
+
+        rangos.append(((year, desde), (year, hasta)))
+
+    return get_tareas_matriz(rangos)
+
+
+def get_tareas_periodos(periodos: list[tuple[int, int]]):
+    """
+    Devuelve las tareas para obtener los datos de la SIBOIF de los periodos especificados.\n
+    Los meses consecutivos de un mismo año se consultan en una sola petición por rango
+    para cada reporte.
+
+    :param periodos: Lista de periodos (año, mes).
+    """
+
+    return get_tareas_matriz(get_period_ranges(periodos))
+
+
 def get_all_periodos():
     """
     Devuelve un DataFrame con los datos de la SIBOIF de todos los periodos disponibles.
 
     :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
     """
 
-    current_year = datetime.now().year
+    return pipeline.obtener("SIBOIF", get_tareas_all_periodos)
 
-    df = pd.DataFrame()
 
-    # Ciclo para recorrer todos los años y sus meses hasta el año actual
-    for year in range(_INITIAL_YEAR, current_year + 1):
-        for month in range(1, 13):
-            print("Procesando periodo:", year, month)
-            df_data = get_periodo(year, month)
+def get_last_periodo():
+    """
+    Devuelve un DataFrame con los datos de la SIBOIF del último periodo disponible.
 
-            # Si el DataFrame está vacío quiere decir que ya llegó al último periodo disponible
-            if df_data.empty:
-                print("No existe información de:", year, month)
-                break
+    :return: pandas DataFrame
 
-            # Concatenar los DataFrames
-            df = pd.concat([df, df_data], ignore_index=True)
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
 
-    return df
+    return pipeline.obtener("SIBOIF", get_tareas_last_periodo)
 
 
-def get_last_periodo():
+def get_rango_periodos(
+    year_ini: int,
+    month_ini: int,
+    year_fin: Optional[int] = None,
+    month_fin: Optional[int] = None,
+):
     """
-    Devuelve un DataFrame con los datos de la SIBOIF del último periodo disponible.
+    Devuelve un DataFrame con los datos de la SIBOIF para el rango de periodos especificado.\n
+    Se hace una consulta por rango de fechas para cada año, en lugar de una por mes.
+
+    :param year_ini: Año del periodo inicial.
+    :param month_ini: Mes del periodo inicial (1-12).
+    :param year_fin: Año del periodo final (opcional, por defecto el mes actual).
+    :param month_fin: Mes del periodo final (opcional).
 
     :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
     """
 
-    df = pd.DataFrame()
+    plan = partial(get_tareas_rango_periodos, year_ini, month_ini, year_fin, month_fin)
 
-    date = datetime.now().date()
+    return pipeline.obtener("SIBOIF", plan)
 
-    # Procesar desde la fecha actual hacía atrás hasta encontrar datos del último periodo disponible
-    # teniendo como limite el año mínimo de información disponible
-    while date.year >= _INITIAL_YEAR:
-        # Restar días de la fecha para obtener el mes anterior
-        date = date - timedelta(days=date.day)
 
-        df = get_periodo(date.year, date.month)
+def get_periodos(periodos: list[tuple[int, int]]):
+    """
+    Devuelve un DataFrame con los datos de la SIBOIF para los periodos especificados.\n
+    Los meses consecutivos de un mismo año se consultan en una sola petición por rango.
 
-        # Si se encontró datos, salir del ciclo
-        if not df.empty:
-            print("Último periodo:", date.year, date.month)
-            break
+    :param periodos: Lista de periodos (año, mes).
 
-    return df
+    :return: pandas DataFrame
+
+    :raises RuntimeError: Si algún reporte falló en todos los intentos.
+    """
+
+    return pipeline.obtener("SIBOIF", partial(get_tareas_periodos, periodos))
@@ -0,0 +1,63 @@
+"""
+Modulo con la lista de reportes de la SIBOIF a procesar.\n
+Todos los reportes se consultan en el mismo servicio web (`/rest/estadisticas`),
+filtrando por intendencia y tipo de reporte:\n
+- `name`: nombre corto del reporte, usado en el nombre de las tareas.
+- `intendencia`: sector supervisado (e.g. Bancos).
+- `tipo_reporte`: nombre del reporte en el servicio web.
+- `variables`: variables a cargar (`None` para todas).
+- `instituciones_a_omitir`: instituciones con valores totalizados del sector.
+- `indicador`: nombre del indicador, donde `{variable}` se reemplaza por cada variable.
+  Los reportes nuevos deben incluir el sector (e.g. "Seguros - {variable}")
+  para no mezclar sus indicadores con los de otros reportes.
+
+Para agregar un sector o reporte basta con agregar su especificación a la lista:
+sus consultas se descargan al mismo tiempo que las de los demás reportes,
+respetando el ritmo de peticiones de la SIBOIF (ver `ritmo`).\n
+Los reportes a procesar se pueden limitar con la variable de entorno:\n
+    SIBOIF_REPORTES=Bancos ESF
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Lista de reportes a procesar
+reportes_list = [
+    {
+        "name": "Bancos ESF",
+        "intendencia": "Bancos",
+        "tipo_reporte": "Estado de Situación Financiera (ESF)",
+        "variables": ["ACTIVO", "PASIVO", "PATRIMONIO"],
+        "instituciones_a_omitir": ["SFB", "SF", "SFN"],
+        "indicador": "{variable}",
+    },
+]
+
+
+def get_reportes() -> list[dict]:
+    """
+    Devuelve los reportes a procesar: los de la variable de entorno `SIBOIF_REPORTES`
+    (nombres separados por comas) o todos los de la lista.
+
+    :raises ValueError: Si se especifica un reporte que no existe.
+    """
+
+    nombres = [
+        nombre.strip()
+        for nombre in os.getenv("SIBOIF_REPORTES", "").split(",")
+        if nombre.strip()
+    ]
+
+    if not nombres:
+        return reportes_list
+
+    reportes = {reporte["name"]: reporte for reporte in reportes_list}
+
+    faltantes = [nombre for nombre in nombres if nombre not in reportes]
+
+    if faltantes:
+        raise ValueError(f"Reportes de la SIBOIF no existen: {', '.join(faltantes)}")
+
+    return [reportes[nombre] for nombre in nombres]
@@ -3,6 +3,10 @@ Modulo de funciones utilitarias.
 """
 
 import calendar
+from functools import lru_cache
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
 
 # from datetime import datetime
 
@@ -21,8 +25,41 @@ meses_dict = {
     "Diciembre": 12,
 }
 
+meses_abreviados_dict = {
+    "Ene": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Abr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Ago": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dic": 12,
+}
+
 trimestres_dict = {"I": 3, "II": 6, "III": 9, "IV": 12}
 
+# Número de mes de los nombres completos y abreviados, en minúsculas
+_MESES_MINUSCULAS = {
+    nombre.lower(): mes
+    for nombre, mes in {**meses_dict, **meses_abreviados_dict}.items()
+} | {"setiembre": 9, "set": 9}
+
+# Etiquetas de periodo:
+# - Trimestre romano con año opcional: "I", "I Trim", "I Trim 24", "III Trim 2019"
+# - Mes completo o abreviado con año opcional: "Enero", "Ene", "Ene.", "Enero - 2018"
+# - Año: "2019", "2019.0", "2019 p/"
+_EXPRESION_PERIODO = (
+    r"^\s*(?:"
+    r"(?P<trimestre>IV|I{1,3})(?:\s+Trim\w*\.?)?(?:\s+(?P<anio_trimestre>\d{4}|\d{2}))?"
+    r"|(?P<mes>[^\W\d_]+)\.?(?:\s*[-/]?\s*(?P<anio_mes>\d{4}))?"
+    r"|(?P<anio>(?:19|20)\d{2})(?:\.0)?"
+    r")\s*(?:\*|p/|\(p\)|\d/)?\s*$"
+)
+
 
 def last_day_of_month(year: int, month: int):
     """
@@ -40,10 +77,129 @@ def get_date_str(year: int, month: int):
     """
     day = last_day_of_month(year, month)
 
-    day = "0" + str(day)
-    month = "0" + str(month)
+    return f"{year}-{month:02d}-{day:02d}"
+
+
+def add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    """
+    Función de utilidad que devuelve el año y mes resultante de sumar
+    (o restar si es negativo) la cantidad de meses especificada.
+    """
+    total = year * 12 + (month - 1) + months
+
+    return total // 12, total % 12 + 1
+
+
+def get_period_ranges(
+    periodos: list[tuple[int, int]],
+) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """
+    Función de utilidad que agrupa los periodos (año, mes) especificados en rangos
+    de meses consecutivos dentro de un mismo año.\n
+    Ejemplo:\n
+        [(2023, 1), (2023, 2), (2023, 5)] -> [((2023, 1), (2023, 2)), ((2023, 5), (2023, 5))]
+    """
+    rangos = []
+
+    for year, month in sorted(set(periodos)):
+        if rangos:
+            inicio, fin = rangos[-1]
+
+            # Extender el rango si el periodo es el mes siguiente del mismo año
+            if fin == (year, month - 1):
+                rangos[-1] = (inicio, (year, month))
+                continue
+
+        rangos.append(((year, month), (year, month)))
+
+    return rangos
+
+
+# Cantidad máxima de etiquetas distintas cuya conversión se guarda en la caché.
+# Los encabezados se repiten entre archivos; las columnas y hojas completas no se guardan
+_MAX_ETIQUETAS_CACHE = 64
+
+
+def _convertir_periodos(
+    etiquetas: tuple, formato: Optional[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convierte las etiquetas de periodo distintas en año y mes (ver `parse_periodos`).
+    """
+
+    partes = (
+        pd.Series(etiquetas, dtype=object).astype(str).str.extract(_EXPRESION_PERIODO)
+    )
+
+    meses_trimestre = partes["trimestre"].map(trimestres_dict)
+    meses_nombre = partes["mes"].str.lower().map(_MESES_MINUSCULAS)
+
+    if formato == "mes":
+        meses_trimestre = pd.Series(np.nan, index=partes.index)
+    elif formato == "trimestre":
+        meses_nombre = pd.Series(np.nan, index=partes.index)
+
+    meses = meses_trimestre.fillna(meses_nombre)
+
+    anios = (
+        pd.to_numeric(partes["anio_trimestre"])
+        .fillna(pd.to_numeric(partes["anio_mes"]))
+        .fillna(pd.to_numeric(partes["anio"]))
+    )
+
+    # Años de dos dígitos (e.g. "I Trim 24")
+    anios = anios.mask(anios < 100, anios + np.where(anios < 50, 2000, 1900))
+
+    # Las etiquetas con texto que no es un periodo (e.g. "Total 2019") no tienen año
+    anios = anios.mask(meses.isna() & partes["anio"].isna())
+
+    anios = anios.to_numpy(dtype=float)
+    meses = meses.to_numpy(dtype=float)
+
+    # Los resultados se comparten en la caché, por lo que no se pueden modificar
+    anios.setflags(write=False)
+    meses.setflags(write=False)
+
+    return anios, meses
+
+
+_convertir_periodos_cache = lru_cache(maxsize=256)(_convertir_periodos)
+
+
+def parse_periodos(
+    etiquetas: Iterable, formato: Optional[str] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Función de utilidad que convierte etiquetas de periodo en arreglos de año y mes
+    en una sola pasada vectorizada.\n
+    Cada etiqueta distinta se convierte una sola vez, y los encabezados repetidos
+    (e.g. los mismos meses en cada hoja) se toman de una caché.\n
+    Ejemplo:\n
+        ["I Trim 24", "III Trim 2019", "Enero", "Ene", "IV", "2019", "Total"]
+        -> años [2024, 2019, NaN, NaN, NaN, 2019, NaN], meses [3, 9, 1, 1, 12, NaN, NaN]
+
+    :param etiquetas: Etiquetas a convertir (e.g. columnas o una fila del archivo).
+    :param formato: `mes` o `trimestre` para aceptar solo etiquetas de ese tipo (opcional).
+
+    :return: Arreglos de año y mes (NaN si la etiqueta no lo contiene).
+    """
+
+    if not hasattr(etiquetas, "__len__"):
+        etiquetas = list(etiquetas)
+
+    # Las etiquetas vacías (código -1) quedan fuera de las etiquetas distintas
+    codigos, unicas = pd.factorize(pd.Series(etiquetas, dtype=object))
+
+    if len(unicas) <= _MAX_ETIQUETAS_CACHE:
+        anios, meses = _convertir_periodos_cache(tuple(unicas), formato)
+    else:
+        anios, meses = _convertir_periodos(tuple(unicas), formato)
+
+    # Las etiquetas vacías quedan sin año ni mes
+    anios = np.append(anios, np.nan)[codigos]
+    meses = np.append(meses, np.nan)[codigos]
 
-    return f"{year}-{month[-2:]}-{day[-2:]}"
+    return anios, meses
 
 
 # def get_date_range_up_today(start_year: int) -> list[str]:
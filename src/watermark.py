@@ -0,0 +1,147 @@
+"""
+Modulo para registrar el último periodo cargado por origen e indicador (watermark).\n
+Se usa en el modo incremental para descargar solo los periodos posteriores
+al último cargado, más una ventana de revisión hacia atrás.\n
+Los watermarks se guardan en `watermarks.json`:\n
+    {
+        "BCN": { "Remesas mensuales": 202406, ... },
+        "SIBOIF": { "ACTIVO": 202405, ... }
+    }
+"""
+
+import os
+import json
+import pandas as pd
+from utils import add_months
+
+_WATERMARK_FILE = os.path.join(os.path.dirname(__file__), "watermarks.json")
+
+# Meses de atraso respecto al indicador más reciente del origen a partir de los cuales
+# un indicador se considera descontinuado y no define el inicio de la descarga
+RETRASO_MAXIMO = 24
+
+
+def _cargar() -> dict:
+    """
+    Lee los watermarks guardados.
+    """
+
+    if not os.path.exists(_WATERMARK_FILE):
+        return {}
+
+    try:
+        with open(_WATERMARK_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        print("No se pudo leer los watermarks:", e)
+        return {}
+
+
+def obtener(origen: str) -> dict[str, int]:
+    """
+    Devuelve el último periodo cargado (yyyymm) de cada indicador del origen especificado.
+
+    :param origen: Origen de los datos (e.g. BCN).
+
+    :return: Diccionario con el indicador como key y el periodo como value.
+    """
+
+    return _cargar().get(origen, {})
+
+
+def get_desde(origen: str, ventana: int) -> tuple[int, int] | None:
+    """
+    Devuelve el periodo (año, mes) desde el cual se debe descargar el origen especificado
+    (inclusive), o `None` si no tiene watermarks y se deben descargar todos los periodos.\n
+    Los indicadores con más de `RETRASO_MAXIMO` meses de atraso respecto al más reciente
+    no se toman en cuenta, para que un indicador descontinuado no fije el inicio.
+
+    :param origen: Origen de los datos (e.g. BCN).
+    :param ventana: Cantidad de meses hacia atrás a descargar para obtener revisiones.
+    """
+
+    marcas = obtener(origen)
+
+    if not marcas:
+        return None
+
+    meses = {
+        indicador: periodo // 100 * 12 + periodo % 100 - 1
+        for indicador, periodo in marcas.items()
+    }
+    limite = max(meses.values()) - RETRASO_MAXIMO
+
+    descontinuados = sorted(
+        indicador for indicador, mes in meses.items() if mes < limite
+    )
+
+    if descontinuados:
+        print(
+            f"{origen}: Se omiten {len(descontinuados)} indicadores sin datos recientes:",
+            ", ".join(descontinuados[:5]) + ("..." if len(descontinuados) > 5 else ""),
+        )
+
+    # El indicador vigente más atrasado define el inicio de la descarga
+    mes = min(mes for mes in meses.values() if mes >= limite)
+
+    return add_months(mes // 12, mes % 12 + 1, -ventana)
+
+
+def filtrar(df: pd.DataFrame, origen: str, ventana: int) -> pd.DataFrame:
+    """
+    Devuelve solo las filas desde el watermark de cada indicador menos la ventana
+    de revisión (inclusive, igual que `get_desde`).
+    Los indicadores sin watermark se devuelven completos.
+
+    :param df: DataFrame con las columnas INDICADOR, ANIO y MES.
+    :param origen: Origen de los datos (e.g. BCN).
+    :param ventana: Cantidad de meses hacia atrás a conservar para obtener revisiones.
+    """
+
+    marcas = obtener(origen)
+
+    if not marcas or df.empty:
+        return df
+
+    # Restar la ventana de revisión a cada watermark
+    desde = {}
+    for indicador, periodo in marcas.items():
+        year, month = add_months(periodo // 100, periodo % 100, -ventana)
+        desde[indicador] = year * 100 + month
+
+    periodos = df["ANIO"].astype(int) * 100 + df["MES"].astype(int)
+    limites = df["INDICADOR"].map(desde).fillna(0)
+
+    df = df[periodos >= limites]
+
+    return df.reset_index(drop=True)
+
+
+def actualizar(df: pd.DataFrame):
+    """
+    Actualiza los watermarks con el máximo periodo de cada origen e indicador del DataFrame.
+    Se debe llamar luego de cargar los datos en la base de datos.
+
+    :param df: DataFrame con las columnas ORIGEN, INDICADOR, ANIO y MES.
+    """
+
+    if df.empty:
+        return
+
+    marcas = _cargar()
+
+    periodos = df["ANIO"].astype(int) * 100 + df["MES"].astype(int)
+    maximos = periodos.groupby([df["ORIGEN"], df["INDICADOR"]]).max()
+
+    for (origen, indicador), periodo in maximos.items():
+        marcas_origen = marcas.setdefault(origen, {})
+
+        # Una recarga de periodos anteriores no retrocede el watermark
+        marcas_origen[indicador] = max(int(periodo), marcas_origen.get(indicador, 0))
+
+    temp_path = _WATERMARK_FILE + ".tmp"
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(marcas, file, ensure_ascii=False, indent=2)
+
+    os.replace(temp_path, _WATERMARK_FILE)